@@ -0,0 +1,389 @@
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import threading
+import subprocess
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core import build_driver, chrome_usage
+from fixture_server import FixtureState, VARIANTS, start_fixture
+from session_store import login_with_store
+
+
+# End-to-end benchmark against fixture_server.py (never the live site): runs
+# resilient_bot.bot_session, probe_flow.main and open_item_scanner.scan_and_probe
+# repeatedly on a fixed fixture configuration and reports, per run and as p50/p90:
+#   detection (server flip → bot sees '신청'), click-to-form, fill, submit-to-result,
+#   flip→result, WebDriver commands (total, by command, by stage), Chrome CPU s / peak RSS.
+# Results go to logs/bench_e2e_<label>_<epoch>.json with the git commit, so two commits
+# can be compared:
+#   python3 bench_e2e.py --runs 5 --label before
+#   python3 bench_e2e.py --runs 5 --label after --compare logs/bench_e2e_before_<epoch>.json
+TARGETS = ("bot", "probe", "scanner")
+
+# Stages whose start marks "the form is there" / "submission sent"
+FILL_STAGES = ("plan_fill_and_submit", "heuristic_fill_form")
+
+
+class Instrumented:
+    """Drop-in for core.build_driver: the drivers it builds count every WebDriver command
+    (WebElement commands go through driver.execute too) and sample Chrome CPU/RSS until quit()."""
+
+    def __init__(self, build: Callable = build_driver, sample_s: float = 0.25):
+        self.build = build
+        self.sample_s = sample_s
+        self.commands: List[Tuple[int, str]] = []
+        self.peak_rss_mb = 0.0
+        self.cpu_s = 0.0
+        self.drivers = 0
+
+    def __call__(self, *args: Any, **kwargs: Any):
+        driver = self.build(*args, **kwargs)
+        self.drivers += 1
+        orig_execute, orig_quit = driver.execute, driver.quit
+        stop = threading.Event()
+        last: Dict[str, float] = {}
+
+        def counted(command, params=None):
+            self.commands.append((time.monotonic_ns(), command))
+            return orig_execute(command, params)
+
+        def sample() -> None:
+            while not stop.is_set():
+                u = chrome_usage(driver)
+                if u:
+                    last.update(u)
+                    self.peak_rss_mb = max(self.peak_rss_mb, u["rss_mb"])
+                stop.wait(self.sample_s)
+
+        def quit():
+            stop.set()
+            # CPU is cumulative per process, so read it once more before Chrome exits
+            u = chrome_usage(driver) or last
+            self.cpu_s += u.get("cpu_s", 0.0)
+            return orig_quit()
+
+        driver.execute = counted
+        driver.quit = quit
+        threading.Thread(target=sample, name="bench-sampler", daemon=True).start()
+        return driver
+
+    def by_command(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for _, c in self.commands:
+            out[c] = out.get(c, 0) + 1
+        return dict(sorted(out.items(), key=lambda kv: -kv[1]))
+
+    def chrome(self) -> Dict[str, float]:
+        return {"cpu_s": round(self.cpu_s, 2), "peak_rss_mb": round(self.peak_rss_mb, 1), "drivers": self.drivers}
+
+
+def _patched(module, **values: Any):
+    """Set module globals, returning a function that restores them."""
+    old = {k: getattr(module, k) for k in values}
+    for k, v in values.items():
+        setattr(module, k, v)
+    return lambda: [setattr(module, k, v) for k, v in old.items()]
+
+
+def _stage_commands(inst: Instrumented, spans, flip_ms: Optional[float]) -> Dict[str, int]:
+    """Attribute each command to the post-flip span it ran in ("watch" before the flip)."""
+    out: Dict[str, int] = {}
+    for ns, _ in inst.commands:
+        rel = (ns - spans.t0_ns) / 1e6
+        if flip_ms is None or rel < flip_ms:
+            name = "watch"
+        else:
+            at = rel - flip_ms
+            name = next((s["name"] for s in spans.spans if s["at_ms"] <= at <= s["at_ms"] + s["dur_ms"]), "other")
+        out[name] = out.get(name, 0) + 1
+    return out
+
+
+def bot_metrics(spans, open_at: float, server: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    marks = spans.marks
+    flip = marks.get("flip")
+    # Wall time of the span clock's origin, to compare with the fixture's flip
+    wall_t0 = time.time() - (time.monotonic_ns() - spans.t0_ns) / 1e9
+
+    def first(names):
+        return next((s for s in spans.spans if s["name"] in names), None)
+
+    click, fill = first(("safe_click",)), first(FILL_STAGES)
+    submit = first(("submit_current_form",))
+    if submit is not None:
+        submit_at = submit["at_ms"]
+    elif fill is not None and fill["name"] == "plan_fill_and_submit":
+        submit_at = fill["at_ms"] + fill["dur_ms"]
+    else:
+        submit_at = None
+    result = marks["result"] - flip if flip is not None and "result" in marks else None
+    fill_ms = sum(s["dur_ms"] for s in spans.spans if s["name"] in FILL_STAGES + ("agree_all",)) if fill else None
+    apps = server.get("applications") or []
+
+    def r(v):
+        return round(v, 1) if v is not None else None
+
+    return {
+        "detection_ms": r((wall_t0 + flip / 1000 - open_at) * 1000) if flip is not None else None,
+        "detect_to_click_ms": r(click["at_ms"]) if click else None,
+        "click_to_form_ms": r(fill["at_ms"] - click["at_ms"]) if click and fill else None,
+        "fill_ms": r(fill_ms),
+        "submit_to_result_ms": r(result - submit_at) if result is not None and submit_at is not None else None,
+        "flip_to_result_ms": r(spans.e2e_ms()),
+        # Fixture side: flip → application recorded
+        "server_apply_ms": r(apps[0]["after_open_s"] * 1000) if apps and apps[0].get("after_open_s") is not None else None,
+    }
+
+
+def run_bot(state: FixtureState, base: str, args, cookie_path: str) -> Dict[str, Any]:
+    import resilient_bot as rb
+    from latency import RunSpans
+    from navigation import NavTimings
+
+    # START_AT has second resolution, so flip on a whole second
+    open_at = math.ceil(time.time() + args.open_in)
+    state.reset()
+    state.open_at = open_at
+    inst = Instrumented()
+    spans = RunSpans()
+    restore = _patched(
+        rb,
+        BASE_URL=base,
+        LOGIN_URL=f"{base}/member/login.asp",
+        TARGET_URL=f"{base}/parent/Appchild_view.asp?sn={args.sn}",
+        COOKIE_PATH=cookie_path,
+        START_AT=datetime.fromtimestamp(open_at).isoformat(timespec="seconds"),
+        LATENCY=spans,
+        NAV_TIMINGS=NavTimings(),
+        SUBMISSION_PLAN=None,
+        PLAN_PATH=args.plan or "",
+        FORM_CACHE=args.form_cache,
+        PAGE_LOAD_STRATEGY=args.page_load,
+        build_driver=inst,
+    )
+    error = None
+    t0 = time.perf_counter()
+    try:
+        rb.bot_session(headless=True, watch_mode=args.watch_mode, pool=None, lean=args.profile == "lean")
+    except Exception as e:
+        error = repr(e)
+    finally:
+        restore()
+    wall_ms = (time.perf_counter() - t0) * 1000
+    server = state.stats()
+    return {
+        "ok": bool(server["applications"]) and error is None,
+        "error": error,
+        "wall_ms": round(wall_ms, 1),
+        **bot_metrics(spans, open_at, server),
+        "commands": len(inst.commands),
+        "commands_by_stage": _stage_commands(inst, spans, spans.marks.get("flip")),
+        "commands_by_name": inst.by_command(),
+        "chrome": inst.chrome(),
+        "stages": spans.stages(),
+        "server": {k: server[k] for k in ("requests", "status", "rate_limited", "logins")},
+    }
+
+
+def run_probe(state: FixtureState, base: str, args, cookie_path: str) -> Dict[str, Any]:
+    import probe_flow as pf
+
+    state.reset()
+    state.set_open_in(args.probe_open_in)
+    inst = Instrumented()
+    restore = _patched(
+        pf,
+        BASE=base,
+        LOGIN_URL=f"{base}/member/login.asp",
+        TARGET_URL=f"{base}/parent/Appchild_view.asp?sn={args.sn}",
+        build_driver=inst,
+        login_with_store=partial(login_with_store, path=cookie_path),
+    )
+    error = None
+    t0 = time.perf_counter()
+    try:
+        pf.main()
+    except Exception as e:
+        error = repr(e)
+    finally:
+        restore()
+    wall_ms = (time.perf_counter() - t0) * 1000
+    server = state.stats()
+    reached = any(p.lower().endswith("_regist.asp") for p in server["requests"])
+    return {
+        "ok": reached and error is None,
+        "error": error,
+        "wall_ms": round(wall_ms, 1),
+        "reached_form": reached,
+        "commands": len(inst.commands),
+        "commands_by_name": inst.by_command(),
+        "chrome": inst.chrome(),
+        "server": {k: server[k] for k in ("requests", "status", "rate_limited", "logins")},
+    }
+
+
+def run_scanner(state: FixtureState, base: str, args, cookie_path: str) -> Dict[str, Any]:
+    import open_item_scanner as ois
+
+    state.reset()
+    state.set_open_in(0)
+    inst = Instrumented()
+    restore = _patched(
+        ois,
+        BASE=base,
+        LOGIN_URL=f"{base}/member/login.asp",
+        LISTING_URLS=[u.replace(ois.BASE, base, 1) for u in ois.LISTING_URLS],
+    )
+    error = None
+    summary: Dict[str, Any] = {}
+    t0 = time.perf_counter()
+    driver = inst()
+    try:
+        login_with_store(
+            driver, lambda: ois.ensure_login(driver, ois.USERNAME, ois.PASSWORD, login_url=ois.LOGIN_URL),
+            base, path=cookie_path,
+        )
+        summary = ois.scan_and_probe(driver)
+    except Exception as e:
+        error = repr(e)
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        restore()
+    wall_ms = (time.perf_counter() - t0) * 1000
+    server = state.stats()
+    return {
+        "ok": bool(summary.get("found")) and error is None,
+        "error": error,
+        "wall_ms": round(wall_ms, 1),
+        "found": bool(summary.get("found")),
+        "tried_detail_count": summary.get("tried_detail_count"),
+        "commands": len(inst.commands),
+        "commands_by_name": inst.by_command(),
+        "chrome": inst.chrome(),
+        "server": {k: server[k] for k in ("requests", "status", "rate_limited", "logins")},
+    }
+
+
+RUNNERS = {"bot": run_bot, "probe": run_probe, "scanner": run_scanner}
+
+
+def aggregate(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """p50/p90/max of every numeric metric over the runs."""
+    keys: Dict[str, List[float]] = {}
+    for r in runs:
+        flat = dict(r)
+        flat.update({f"chrome_{k}": v for k, v in (r.get("chrome") or {}).items()})
+        flat.update({f"stage_commands_{k}": v for k, v in (r.get("commands_by_stage") or {}).items()})
+        for k, v in flat.items():
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                keys.setdefault(k, []).append(float(v))
+    out: Dict[str, Any] = {"runs": len(runs), "ok": sum(1 for r in runs if r.get("ok"))}
+    for k, v in keys.items():
+        v.sort()
+        out[k] = {
+            "p50": round(v[len(v) // 2], 1),
+            "p90": round(v[min(len(v) - 1, int(len(v) * 0.9))], 1),
+            "max": round(v[-1], 1),
+        }
+    return out
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    lines = []
+    for target, agg in new.get("summary", {}).items():
+        base = (old.get("summary") or {}).get(target) or {}
+        for k, v in agg.items():
+            if not isinstance(v, dict) or k not in base:
+                continue
+            a, b = base[k]["p50"], v["p50"]
+            pct = f" ({(b - a) / a * 100:+.0f}%)" if a else ""
+            lines.append(f"[compare] {target}.{k}: p50 {a} -> {b}{pct}")
+    return lines
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        r = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10)
+        return r.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per target")
+    parser.add_argument("--target", action="append", choices=TARGETS, default=None, help="Default: all")
+    parser.add_argument("--label", default="", help="Tag stored with the results (e.g. before/after)")
+    parser.add_argument("--compare", default=None, help="Earlier bench_e2e JSON to diff p50s against")
+    # Fixture
+    parser.add_argument("--sn", type=int, default=108)
+    parser.add_argument("--variant", choices=VARIANTS, default="plain")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--fail-429", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--open-in", type=float, default=8.0, help="Bot runs: flip this long after session start")
+    parser.add_argument("--probe-open-in", type=float, default=2.0, help="Probe runs: flip this long after start")
+    # Bot configuration under test
+    parser.add_argument("--watch-mode", choices=["http", "browser"], default="http")
+    parser.add_argument("--page-load", choices=["none", "eager", "normal"], default="none")
+    parser.add_argument("--profile", choices=["lean", "full"], default="lean")
+    parser.add_argument("--plan", default=None, help="Submission plan for the bot (default: none, heuristics)")
+    parser.add_argument("--form-cache", action="store_true", help="Let the bot reuse cached fill plans")
+    args = parser.parse_args()
+
+    state = FixtureState(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, fail_429=args.fail_429,
+                         seed=args.seed, variant=args.variant)
+    server, state, base = start_fixture(state=state)
+    cookie_path = os.path.join(".session", "cookies_bench_e2e.json")
+    print(f"[bench] Fixture at {base} (variant={args.variant}, latency={args.latency_ms}ms)")
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    try:
+        for target in args.target or TARGETS:
+            for i in range(max(1, args.runs)):
+                r = RUNNERS[target](state, base, args, cookie_path)
+                results.setdefault(target, []).append(r)
+                extra = ""
+                if target == "bot":
+                    extra = (f" detect={r['detection_ms']}ms click→form={r['click_to_form_ms']}ms "
+                             f"fill={r['fill_ms']}ms submit→result={r['submit_to_result_ms']}ms")
+                print(
+                    f"[bench] {target} #{i + 1}: {'ok' if r['ok'] else 'FAILED'} {r['wall_ms']:.0f}ms{extra} "
+                    f"cmds={r['commands']} cpu={r['chrome']['cpu_s']}s rss={r['chrome']['peak_rss_mb']}MB"
+                    + (f" ({r['error']})" if r["error"] else "")
+                )
+    finally:
+        server.shutdown()
+
+    out = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        "commit": _git_commit(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("compare", "target")},
+        "summary": {t: aggregate(rs) for t, rs in results.items()},
+        "runs": results,
+    }
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            for line in compare(json.load(f), out):
+                print(line)
+    os.makedirs("logs", exist_ok=True)
+    out_file = f"logs/bench_e2e_{args.label + '_' if args.label else ''}{int(time.time())}.json"
+    with open(out_file, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+    print(f"[bench] Wrote {out_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
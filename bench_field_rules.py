@@ -0,0 +1,150 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List
+
+from field_rules import classify_field, control_kind
+from html_forms import forms_from_file
+
+
+# Classify every control of every saved form and time it. Accuracy is agreement with
+# the keyword if-chain plan_form_fills used before FIELD_RULES (legacy_roles below, kept
+# verbatim as the reference), compared on what the filler acts on: the value role of a
+# text field, consent for a checkbox, and consent/gender/required for a radio.
+#   python3 bench_field_rules.py
+DEFAULT_GLOBS = ["logs/preflight_*.html", "logs/open_scan_*.html"]
+RADIO_ROLES = ("consent", "gender_male", "gender_female", "required_choice")
+
+
+def field_key(form: Dict[str, Any], field: Dict[str, Any]) -> str:
+    ident = field["name"] or field["id"] or f"#{field['index']}"
+    return f"{form['name'] or form['index']}:{ident}:{field['index']}"
+
+
+def legacy_roles(field: Dict[str, Any]) -> List[str]:
+    """Roles the pre-FIELD_RULES if-chain in plan_form_fills acted on for this control."""
+    tag = field["tag"]
+    itype = field["type"]
+    name = field["name"].lower()
+    pid = field["id"].lower()
+    placeholder = field["placeholder"].lower()
+    label = field["label"].lower()
+    if itype in ("hidden",) or tag == "select":
+        return []
+    if itype == "checkbox":
+        text_blob = " ".join([name, pid, placeholder, label])
+        if any(k in text_blob for k in ["agree", "동의", "약관", "개인정보", "동의함", "chkall", "checkall", "all"]):
+            return ["consent"]
+        return []
+    if itype == "radio":
+        text_blob = (name + pid + label).lower()
+        out = []
+        if "agree" in text_blob:
+            out.append("consent")
+        if any(k in text_blob for k in ["남", "남자", "male", "m"]):
+            out.append("gender_male")
+        if any(k in text_blob for k in ["여", "여자", "female", "f"]):
+            out.append("gender_female")
+        if any(k in text_blob for k in ["필수", "required", "성별", "남", "여"]):
+            out.append("required_choice")
+        return out
+    if itype in ("text", "tel", "email", "textarea", "") or tag == "textarea":
+        text_blob = " ".join([name, pid, placeholder, label])
+        if any(k in text_blob for k in ["자녀", "아동", "아이"]) and any(k in text_blob for k in ["이름", "성명", "name"]):
+            return ["child_name"]
+        elif any(k in text_blob for k in ["보호자", "신청자", "이름", "성명"]) and "자녀" not in text_blob:
+            return ["parent_name"]
+        elif any(k in text_blob for k in ["나이", "개월", "연령", "age"]):
+            return ["child_age"]
+        elif any(k in text_blob for k in ["휴대", "연락처", "전화", "핸드폰", "tel", "phone"]):
+            return ["phone"]
+        elif any(k in text_blob for k in ["email", "이메일"]):
+            return ["email"]
+        elif any(k in text_blob for k in ["주소", "address"]):
+            return ["address"]
+    return []
+
+
+def rule_roles(field: Dict[str, Any]) -> List[str]:
+    """The same decision taken from classify_field, as plan_form_fills does now."""
+    roles = [role for role, _ in classify_field(field)]
+    kind = control_kind(field)
+    if kind == "checkbox":
+        return ["consent"] if "consent" in roles else []
+    if kind == "radio":
+        return [r for r in RADIO_ROLES if r in roles]
+    return roles[:1]
+
+
+def classify_form(form: Dict[str, Any]) -> Dict[str, List[str]]:
+    return {field_key(form, f): rule_roles(f) for f in form["fields"]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--glob", action="append", default=None, help="HTML files to scan (repeatable)")
+    parser.add_argument("--repeat", type=int, default=200, help="Classification repetitions per form")
+    args = parser.parse_args()
+
+    paths: List[str] = []
+    for g in args.glob or DEFAULT_GLOBS:
+        paths.extend(sorted(glob.glob(g)))
+    if not paths:
+        print("[bench] No HTML files found")
+        return 1
+
+    repeat = max(1, args.repeat)
+    per_form: List[Dict[str, Any]] = []
+    total = correct = 0
+    for path in paths:
+        for form in forms_from_file(path):
+            roles = classify_form(form)
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                for f in form["fields"]:
+                    classify_field(f)
+            per_form_us = (time.perf_counter() - t0) / repeat * 1e6
+            key = f"{os.path.basename(path)}#{form['name'] or form['index']}"
+            row: Dict[str, Any] = {
+                "form": key,
+                "fields": len(form["fields"]),
+                "classify_us": round(per_form_us, 2),
+                "roles": {k: v for k, v in roles.items() if v},
+            }
+            expected = {field_key(form, f): legacy_roles(f) for f in form["fields"]}
+            misses = {k: {"expected": expected[k], "actual": v} for k, v in roles.items() if expected[k] != v}
+            total += len(roles)
+            correct += len(roles) - len(misses)
+            row["mismatches"] = misses
+            per_form.append(row)
+
+    times = sorted(r["classify_us"] for r in per_form)
+    summary: Dict[str, Any] = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "files": len(paths),
+        "forms": len(per_form),
+        "fields": sum(r["fields"] for r in per_form),
+        "classify_us_median": times[len(times) // 2] if times else None,
+        "classify_us_max": times[-1] if times else None,
+        "accuracy": round(correct / total, 4) if total else None,
+        "compared_fields": total,
+        "per_form": per_form,
+    }
+    os.makedirs("logs", exist_ok=True)
+    out_file = f"logs/bench_field_rules_{int(time.time())}.json"
+    with open(out_file, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    print(
+        f"[bench] forms={summary['forms']} fields={summary['fields']} "
+        f"median={summary['classify_us_median']}us max={summary['classify_us_max']}us "
+        f"accuracy={summary['accuracy']} -> {out_file}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from typing import Any, Dict
+
+from scheduler import Scheduler, FakeClock, SystemClock, NS
+
+
+# Replays the phase-2 timer layout of resilient_bot (5s±1 poll, 0.2s tick,
+# one-shot open deadline, end-of-window timeout) and reports scheduling jitter.
+#   python3 bench_scheduler.py                      # fake clock, 10-minute window, instant
+#   python3 bench_scheduler.py --real --window 20   # real clock for 20s
+def run_once(clock, window_s: float, open_at_s: float, spin_s: float) -> Dict[str, Any]:
+    sched = Scheduler(clock=clock, spin_s=spin_s)
+    t0 = sched.now_ns()
+    sched.every("poll", 5.0, lambda: None, jitter_s=1.0, first_in_s=0)
+    sched.every("tick", 0.2, lambda: None)
+    sched.at("open", t0 + int(open_at_s * NS), lambda: None)
+    sched.at("end", t0 + int(window_s * NS), lambda: sched.stop("timeout"))
+    w0 = time.perf_counter()
+    sched.run()
+    return {
+        "wall_s": round(time.perf_counter() - w0, 3),
+        "fires": len(sched.fires),
+        "stats": sched.stats(),
+        "spins": getattr(clock, "spins", None),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--real", action="store_true", help="Use the real monotonic clock")
+    parser.add_argument("--window", type=float, default=600.0, help="Simulated watch window (s)")
+    parser.add_argument("--open-at", type=float, default=None, help="Open deadline offset (s), default mid-window")
+    parser.add_argument("--oversleep-ms", type=float, default=1.0, help="Fake clock mean OS oversleep")
+    parser.add_argument("--spin-ms", type=float, action="append", default=None, help="Spin thresholds to compare")
+    args = parser.parse_args()
+
+    open_at = args.open_at if args.open_at is not None else args.window / 2
+    spins = args.spin_ms or [0.0, 2.0, 5.0]
+    results = []
+    for spin_ms in spins:
+        clock = SystemClock() if args.real else FakeClock(oversleep_s=args.oversleep_ms / 1000.0)
+        r = run_once(clock, args.window, open_at, spin_ms / 1000.0)
+        r["spin_ms"] = spin_ms
+        results.append(r)
+        st = r["stats"]
+        print(
+            f"[bench] spin={spin_ms}ms open late={st['open']['max_ms']}ms "
+            f"tick p95={st['tick']['p95_ms']}ms poll p95={st['poll']['p95_ms']}ms fires={r['fires']}"
+        )
+
+    out = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "clock": "real" if args.real else "fake",
+        "window_s": args.window,
+        "oversleep_ms": None if args.real else args.oversleep_ms,
+        "results": results,
+    }
+    os.makedirs("logs", exist_ok=True)
+    out_file = f"logs/bench_scheduler_{int(time.time())}.json"
+    with open(out_file, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+    print(f"[bench] Wrote {out_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from core import build_driver, first_visible, selenium
+
+
+# Compares the old find_elements/is_displayed lookups with the one-call selector batch
+# on the saved HTML in logs/ (file:// in headless Chrome), counting WebDriver commands.
+#   python3 bench_selectors.py
+#   python3 bench_selectors.py --glob 'logs/open_scan_*.html' --repeat 20
+def lookup_sets() -> Dict[str, Dict[str, Any]]:
+    # Imported here so the XPath lists stay defined next to the code that uses them
+    from resilient_bot import APPLY_XPATHS
+    from probe_flow import APPLY_CONTROL_XPATHS
+    from open_item_scanner import CAPTURE_XPATHS
+    return {
+        "find_apply_element": {"xpaths": APPLY_XPATHS, "climb": 5, "attrs": False},
+        "find_apply_control": {"xpaths": APPLY_CONTROL_XPATHS, "climb": 0, "attrs": False},
+        # The scanner also reads outerHTML/href/onclick of the match
+        "try_capture_from_current": {"xpaths": CAPTURE_XPATHS, "climb": 0, "attrs": True},
+    }
+
+
+def _legacy_hit(e, attrs: bool) -> Dict[str, Any]:
+    if not attrs:
+        return {"el": e}
+    return {"el": e, "outer_html": e.get_attribute("outerHTML"),
+            "href": e.get_attribute("href"), "onclick": e.get_attribute("onclick")}
+
+
+def legacy_lookup(driver, xpaths: List[str], climb: int, attrs: bool):
+    """The pre-batch loop: find_elements per XPath, is_displayed per element, ancestor walk."""
+    By = selenium().By
+    for xp in xpaths:
+        try:
+            for e in driver.find_elements(By.XPATH, xp):
+                if not e.is_displayed():
+                    continue
+                if not climb or e.tag_name.lower() in ("a", "button"):
+                    return _legacy_hit(e, attrs)
+                anc = e
+                for _ in range(climb):
+                    anc = anc.find_element(By.XPATH, "..")
+                    if anc.tag_name.lower() in ("a", "button"):
+                        return _legacy_hit(anc, attrs)
+        except Exception:
+            continue
+    return None
+
+
+def batch_lookup(driver, xpaths: List[str], climb: int, attrs: bool):
+    return first_visible(driver, xpaths, climb=climb)
+
+
+def count_commands(driver) -> Dict[str, int]:
+    """Wrap driver.execute (WebElement commands go through it too) with a counter."""
+    counter = {"n": 0}
+    orig = driver.execute
+
+    def counted(command, params=None):
+        counter["n"] += 1
+        return orig(command, params)
+
+    driver.execute = counted
+    return counter
+
+
+def measure(driver, counter: Dict[str, int], fn: Callable, spec: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    walls: List[float] = []
+    trips = 0
+    hit = None
+    for _ in range(repeat):
+        n0 = counter["n"]
+        t0 = time.perf_counter()
+        hit = fn(driver, spec["xpaths"], spec["climb"], spec["attrs"])
+        walls.append((time.perf_counter() - t0) * 1000)
+        trips = counter["n"] - n0
+    walls.sort()
+    # Outside the timed loop: what matched, to check both methods agree
+    html = None
+    if hit:
+        html = hit.get("outer_html") or hit["el"].get_attribute("outerHTML")
+    return {
+        "round_trips": trips,
+        "p50_ms": round(walls[len(walls) // 2], 2),
+        "max_ms": round(walls[-1], 2),
+        "found": bool(hit),
+        "outer_html": html,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--glob", default="logs/*.html", help="Saved pages to load")
+    parser.add_argument("--repeat", type=int, default=10, help="Lookups per page and method")
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(args.glob))
+    if not files:
+        print(f"[bench] No files match {args.glob}")
+        return 1
+    sets = lookup_sets()
+    driver = build_driver(headless=True, perf_logs=False)
+    counter = count_commands(driver)
+    pages: List[Dict[str, Any]] = []
+    try:
+        for path in files:
+            driver.get("file://" + os.path.abspath(path))
+            page: Dict[str, Any] = {"file": path, "lookups": {}}
+            for name, spec in sets.items():
+                old = measure(driver, counter, legacy_lookup, spec, args.repeat)
+                new = measure(driver, counter, batch_lookup, spec, args.repeat)
+                page["lookups"][name] = {
+                    "legacy": old,
+                    "batch": new,
+                    "same_match": old["outer_html"] == new["outer_html"],
+                }
+                print(
+                    f"[bench] {os.path.basename(path)} {name}: round-trips {old['round_trips']} -> {new['round_trips']}, "
+                    f"p50 {old['p50_ms']}ms -> {new['p50_ms']}ms{'' if old['outer_html'] == new['outer_html'] else ' (MISMATCH)'}"
+                )
+            pages.append(page)
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    totals: Dict[str, Dict[str, float]] = {}
+    for name in sets:
+        rows = [p["lookups"][name] for p in pages]
+        totals[name] = {
+            "legacy_round_trips": sum(r["legacy"]["round_trips"] for r in rows),
+            "batch_round_trips": sum(r["batch"]["round_trips"] for r in rows),
+            "legacy_p50_ms_sum": round(sum(r["legacy"]["p50_ms"] for r in rows), 2),
+            "batch_p50_ms_sum": round(sum(r["batch"]["p50_ms"] for r in rows), 2),
+            "mismatches": sum(1 for r in rows if not r["same_match"]),
+        }
+        print(f"[bench] {name}: {totals[name]}")
+
+    out = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "totals": totals,
+        "pages": pages,
+    }
+    os.makedirs("logs", exist_ok=True)
+    out_file = f"logs/bench_selectors_{int(time.time())}.json"
+    with open(out_file, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+    print(f"[bench] Wrote {out_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
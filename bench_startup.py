@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+# Cold-start cost per entry point: a fresh interpreter imports the module (without
+# running main) and reports the import time and whether Selenium got loaded.
+# With --driver it also times what a run actually waits for: import, core.build_driver()
+# and the first get, once with Selenium loaded lazily by build_driver (as the entry
+# points do now) and once with it imported up front (as they did before core.py).
+#   python3 bench_startup.py --label before   (on the old commit)
+#   python3 bench_startup.py --label after
+#   python3 bench_startup.py --driver --url http://127.0.0.1:8765/   (needs Chrome)
+ENTRY_POINTS = ["resilient_bot", "probe_flow", "open_item_scanner", "preflight_mapper"]
+DRIVER_MODES = {"lazy": "", "eager": "import selenium.webdriver, selenium.webdriver.support.ui; "}
+
+PROBE = (
+    "import sys, time; t = time.perf_counter(); import {mod}; "
+    "print(time.perf_counter() - t, int('selenium' in sys.modules), len(sys.modules))"
+)
+DRIVER_PROBE = (
+    "import sys, time, json; t0 = time.perf_counter(); {pre}import {mod}; t1 = time.perf_counter(); "
+    "from core import build_driver; d = build_driver(headless=True, perf_logs=False); t2 = time.perf_counter(); "
+    "d.get({url!r}); t3 = time.perf_counter(); d.quit(); "
+    "print(json.dumps([t1 - t0, t2 - t1, t3 - t2, t3 - t0]))"
+)
+
+
+def _median(v: List[float]):
+    v = sorted(v)
+    return v[len(v) // 2] if v else None
+
+
+def measure(mod: str, repeat: int) -> Dict[str, Any]:
+    times: List[float] = []
+    selenium_loaded = None
+    modules = None
+    error = None
+    for _ in range(repeat):
+        r = subprocess.run([sys.executable, "-c", PROBE.format(mod=mod)], capture_output=True, text=True)
+        if r.returncode != 0:
+            lines = (r.stderr or "").strip().splitlines()
+            error = lines[-1] if lines else "failed"
+            break
+        imp, sel, nmods = r.stdout.split()
+        times.append(round(float(imp) * 1000, 1))
+        selenium_loaded = bool(int(sel))
+        modules = int(nmods)
+    times.sort()
+    return {
+        "module": mod,
+        "import_ms_median": times[len(times) // 2] if times else None,
+        "import_ms_min": times[0] if times else None,
+        "selenium_loaded": selenium_loaded,
+        "modules_loaded": modules,
+        "error": error,
+    }
+
+
+def measure_driver(mod: str, mode: str, url: str, repeat: int) -> Dict[str, Any]:
+    """Interpreter start to first get done: import, build_driver() and get(url), per run in ms."""
+    runs: List[List[float]] = []
+    error = None
+    for _ in range(repeat):
+        code = DRIVER_PROBE.format(pre=DRIVER_MODES[mode], mod=mod, url=url)
+        r = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if r.returncode != 0:
+            lines = (r.stderr or "").strip().splitlines()
+            error = lines[-1] if lines else "failed"
+            break
+        runs.append([round(x * 1000, 1) for x in json.loads(r.stdout.strip().splitlines()[-1])])
+    cols = list(zip(*runs)) if runs else [(), (), (), ()]
+    return {
+        "module": mod,
+        "mode": mode,
+        "import_ms_median": _median(list(cols[0])),
+        "build_driver_ms_median": _median(list(cols[1])),
+        "first_get_ms_median": _median(list(cols[2])),
+        "total_ms_median": _median(list(cols[3])),
+        "total_ms_min": min(cols[3]) if runs else None,
+        "error": error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--label", default="", help="Tag stored with the results (e.g. before/after)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--module", action="append", default=None, help="Entry point module(s) to measure")
+    parser.add_argument("--driver", action="store_true",
+                        help="Also time build_driver() + first get, lazy vs eager Selenium import (starts Chrome)")
+    parser.add_argument("--url", default="about:blank", help="URL for the first get with --driver")
+    args = parser.parse_args()
+
+    results = [measure(m, max(1, args.repeat)) for m in (args.module or ENTRY_POINTS)]
+    for r in results:
+        if r["error"]:
+            print(f"[startup] {r['module']}: error: {r['error']}")
+        else:
+            print(
+                f"[startup] {r['module']}: import {r['import_ms_median']}ms (min {r['import_ms_min']}ms) "
+                f"selenium={'yes' if r['selenium_loaded'] else 'no'} modules={r['modules_loaded']}"
+            )
+    driver_results = []
+    if args.driver:
+        for m in (args.module or ENTRY_POINTS):
+            for mode in DRIVER_MODES:
+                r = measure_driver(m, mode, args.url, max(1, args.repeat))
+                driver_results.append(r)
+                if r["error"]:
+                    print(f"[startup] {m} driver ({mode}): error: {r['error']}")
+                else:
+                    print(
+                        f"[startup] {m} driver ({mode}): total {r['total_ms_median']}ms (min {r['total_ms_min']}ms) = "
+                        f"import {r['import_ms_median']}ms + build_driver {r['build_driver_ms_median']}ms "
+                        f"+ first get {r['first_get_ms_median']}ms"
+                    )
+    out = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        "python": sys.version.split()[0],
+        "results": results,
+        "driver": {"url": args.url, "results": driver_results} if args.driver else None,
+    }
+    os.makedirs("logs", exist_ok=True)
+    out_file = f"logs/bench_startup_{args.label + '_' if args.label else ''}{int(time.time())}.json"
+    with open(out_file, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+    print(f"[startup] Wrote {out_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def parse_http_date(value: Optional[str]) -> Optional[float]:
+    """HTTP Date header -> epoch seconds (None if missing/unparseable)."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except Exception:
+        return None
+
+
+class ClockSync:
+    """Estimate the offset between the local clock and the site's clock from HTTP Date headers.
+
+    A Date header says the server clock read [D, D+1) at some instant between sending the
+    request (t0) and receiving the headers (t1), so each sample bounds the offset to
+    (D - t1, D + 1 - t0). Intersecting these windows across samples narrows the estimate
+    well below the header's one-second resolution. If the windows stop overlapping (clock
+    step, proxy cache) we fall back to the median of per-sample RTT midpoint estimates.
+    offset = server_time - local_time
+    """
+
+    def __init__(self, max_samples: int = 32):
+        self.max_samples = max_samples
+        self.samples: List[Tuple[float, float, float]] = []  # (server_date, t_send, t_recv)
+
+    def add_sample(self, date_header: Optional[str], t_send: float, t_recv: float) -> bool:
+        d = parse_http_date(date_header)
+        if d is None or t_recv < t_send:
+            return False
+        self.samples.append((d, t_send, t_recv))
+        if len(self.samples) > self.max_samples:
+            self.samples.pop(0)
+        return True
+
+    def sample(self, sess, url: str, count: int = 5, spacing: float = 0.37, timeout: float = 5) -> int:
+        """Take `count` header-only samples. A non-integer spacing sweeps the phase of the
+        server's second boundary so the windows intersect tightly."""
+        ok = 0
+        for i in range(count):
+            if i:
+                time.sleep(spacing)
+            try:
+                t0 = time.time()
+                r = sess.get(url, timeout=timeout, stream=True, allow_redirects=False)
+                t1 = time.time()
+                date = r.headers.get("Date")
+                r.close()
+                ok += int(self.add_sample(date, t0, t1))
+            except Exception:
+                continue
+        return ok
+
+    def rtt(self) -> Optional[float]:
+        if not self.samples:
+            return None
+        rtts = sorted(t1 - t0 for _, t0, t1 in self.samples)
+        return rtts[len(rtts) // 2]
+
+    def estimate(self) -> Dict[str, Any]:
+        """{"offset", "uncertainty", "rtt", "samples", "method"}; offset/uncertainty in seconds."""
+        if not self.samples:
+            return {"offset": 0.0, "uncertainty": None, "rtt": None, "samples": 0, "method": "none"}
+        lo = max(d - t1 for d, _, t1 in self.samples)
+        hi = min(d + 1.0 - t0 for d, t0, _ in self.samples)
+        if lo <= hi:
+            offset, unc, method = (lo + hi) / 2, (hi - lo) / 2, "intersect"
+        else:
+            mids = sorted(d + 0.5 - (t0 + t1) / 2 for d, t0, t1 in self.samples)
+            offset = mids[len(mids) // 2]
+            unc = 0.5 + max(t1 - t0 for _, t0, t1 in self.samples) / 2
+            method = "midpoint"
+        return {"offset": offset, "uncertainty": unc, "rtt": self.rtt(), "samples": len(self.samples), "method": method}
+
+    def offset(self) -> float:
+        return self.estimate()["offset"]
+
+    def server_now(self) -> float:
+        return time.time() + self.offset()
+
+    def local_datetime(self, server_dt: datetime) -> datetime:
+        """Naive local datetime at which the site's clock will read server_dt."""
+        return datetime.fromtimestamp(server_dt.timestamp() - self.offset())
+
+    def monotonic_deadline(self, server_dt: datetime, lead: float = 0.0) -> float:
+        """time.monotonic() value at which the site's clock reads server_dt, minus `lead`
+        seconds (e.g. half the RTT so a request sent then arrives on time)."""
+        return time.monotonic() + (server_dt.timestamp() - self.server_now()) - lead
+
+    def describe(self) -> str:
+        e = self.estimate()
+        if not e["samples"]:
+            return "no samples"
+        unc = f"±{e['uncertainty'] * 1000:.0f}ms" if e["uncertainty"] is not None else "±?"
+        return f"offset={e['offset'] * 1000:+.0f}ms {unc} rtt={(e['rtt'] or 0) * 1000:.0f}ms n={e['samples']} ({e['method']})"
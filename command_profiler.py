@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# WebDriver command profiler. Every driver and WebElement command goes through
+# driver.execute(command, params), so wrapping that one method sees them all
+# (findElements, getElementAttribute, isElementDisplayed, getElementTagName,
+# executeScript, ...). Each call is attributed to the nearest calling function in this
+# project (selenium frames skipped) with its duration and request/response JSON size.
+#   WEBDRIVER_PROFILE=1 python3 probe_flow.py
+#   python3 resilient_bot.py --webdriver-profile
+# core.build_driver attaches the process-wide profiler when enabled, and the summary
+# is written to logs/webdriver_profile_<epoch>.json at exit.
+ENV_VAR = "WEBDRIVER_PROFILE"
+
+_SKIP_PARTS = (os.sep + "selenium" + os.sep, os.sep + "urllib3" + os.sep)
+# Other execute() wrappers layered on top (bench_e2e's counter) are not callers either
+_SKIP_MODULES = ("bench_e2e",)
+
+
+def _size(obj: Any) -> int:
+    try:
+        return len(json.dumps(obj, default=str, ensure_ascii=False))
+    except Exception:
+        return 0
+
+
+def _caller(depth: int = 2) -> str:
+    """module.function of the first frame outside selenium and the execute() wrappers."""
+    f = sys._getframe(depth)
+    here = __file__
+    while f is not None:
+        path = f.f_code.co_filename
+        mod = os.path.splitext(os.path.basename(path))[0]
+        if path != here and mod not in _SKIP_MODULES and not any(p in path for p in _SKIP_PARTS):
+            return f"{mod}.{f.f_code.co_name}"
+        f = f.f_back
+    return "?"
+
+
+class CommandProfiler:
+    def __init__(self, trace_limit: int = 0):
+        # (caller, command) -> [count, total_ms, max_ms, bytes_out, bytes_in]
+        self.stats: Dict[Tuple[str, str], List[float]] = {}
+        self.trace: List[Dict[str, Any]] = []
+        self.trace_limit = trace_limit
+        self.drivers = 0
+        self.path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._t0 = time.monotonic()
+
+    def attach(self, driver):
+        """Wrap driver.execute in place; returns the driver."""
+        orig = driver.execute
+
+        def execute(command, params=None):
+            caller = _caller()
+            t = time.perf_counter()
+            ok = True
+            resp = None
+            try:
+                resp = orig(command, params)
+                return resp
+            except Exception:
+                ok = False
+                raise
+            finally:
+                self.record(caller, command, (time.perf_counter() - t) * 1000,
+                            _size(params) if params else 0,
+                            _size(resp.get("value")) if isinstance(resp, dict) else 0, ok)
+
+        driver.execute = execute
+        self.drivers += 1
+        return driver
+
+    def record(self, caller: str, command: str, ms: float, bytes_out: int, bytes_in: int, ok: bool = True) -> None:
+        with self._lock:
+            s = self.stats.setdefault((caller, command), [0, 0.0, 0.0, 0, 0])
+            s[0] += 1
+            s[1] += ms
+            s[2] = max(s[2], ms)
+            s[3] += bytes_out
+            s[4] += bytes_in
+            if len(self.trace) < self.trace_limit:
+                self.trace.append({
+                    "t_s": round(time.monotonic() - self._t0, 4), "caller": caller, "command": command,
+                    "ms": round(ms, 3), "out": bytes_out, "in": bytes_in, "ok": ok,
+                })
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per calling function: totals and a per-command breakdown, slowest function first."""
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            items = list(self.stats.items())
+        for (caller, command), (n, total, mx, b_out, b_in) in items:
+            fn = out.setdefault(caller, {"commands": 0, "total_ms": 0.0, "bytes_out": 0, "bytes_in": 0, "by_command": {}})
+            fn["commands"] += n
+            fn["total_ms"] += total
+            fn["bytes_out"] += b_out
+            fn["bytes_in"] += b_in
+            fn["by_command"][command] = {
+                "count": n, "total_ms": round(total, 1), "avg_ms": round(total / n, 2), "max_ms": round(mx, 1),
+                "bytes_out": b_out, "bytes_in": b_in,
+            }
+        for fn in out.values():
+            fn["total_ms"] = round(fn["total_ms"], 1)
+            fn["by_command"] = dict(sorted(fn["by_command"].items(), key=lambda kv: -kv[1]["total_ms"]))
+        return dict(sorted(out.items(), key=lambda kv: -kv[1]["total_ms"]))
+
+    def describe(self, top: int = 10) -> List[str]:
+        lines = []
+        for caller, fn in list(self.summary().items())[:top]:
+            cmds = ", ".join(f"{c} x{v['count']}" for c, v in list(fn["by_command"].items())[:4])
+            lines.append(f"{caller}: {fn['commands']} cmds {fn['total_ms']:.0f}ms ({cmds})")
+        return lines
+
+    def write(self, directory: str = "logs", prefix: str = "webdriver_profile") -> Optional[str]:
+        if not self.stats:
+            return None
+        summary = self.summary()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{prefix}_{int(time.time())}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "drivers": self.drivers,
+                    "commands": sum(fn["commands"] for fn in summary.values()),
+                    "total_ms": round(sum(fn["total_ms"] for fn in summary.values()), 1),
+                    "functions": summary,
+                    "trace": self.trace,
+                }, f, ensure_ascii=False, indent=2)
+            self.path = path
+            return path
+        except Exception:
+            return None
+
+
+_PROFILER: Optional[CommandProfiler] = None
+
+
+def enable(trace_limit: int = 0) -> CommandProfiler:
+    """Turn on the process-wide profiler (idempotent); the summary is written at exit."""
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = CommandProfiler(trace_limit=trace_limit)
+        atexit.register(_write_at_exit)
+    return _PROFILER
+
+
+def active() -> Optional[CommandProfiler]:
+    """The process-wide profiler, enabling it first when WEBDRIVER_PROFILE is set
+    (a number > 1 also keeps that many raw trace records)."""
+    if _PROFILER is None and os.environ.get(ENV_VAR, "") not in ("", "0"):
+        try:
+            limit = int(os.environ[ENV_VAR])
+        except ValueError:
+            limit = 0
+        enable(trace_limit=limit if limit > 1 else 0)
+    return _PROFILER
+
+
+def _write_at_exit() -> None:
+    # Entry points that write the summary themselves (resilient_bot) leave nothing to do
+    if _PROFILER is None or _PROFILER.path:
+        return
+    path = _PROFILER.write()
+    if path:
+        for line in _PROFILER.describe():
+            print(f"[webdriver] {line}")
+        print(f"[webdriver] Wrote {path}")
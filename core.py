@@ -0,0 +1,365 @@
+import os
+import shutil
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import command_profiler
+
+
+# Shared driver/login/form helpers for every entry point. Selenium is imported on
+# first use, so HTTP-only tools (preflight_mapper with a valid saved session) never load it.
+SITE_BASE = "https://www.sahascc.or.kr"
+LOGIN_URL = f"{SITE_BASE}/member/login.asp"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
+)
+
+_SEL: Optional[SimpleNamespace] = None
+
+
+def selenium() -> SimpleNamespace:
+    """Lazily import the Selenium pieces we use (webdriver, Options, Service, By, WebDriverWait, EC)."""
+    global _SEL
+    if _SEL is None:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        _SEL = SimpleNamespace(webdriver=webdriver, Options=Options, Service=Service, By=By,
+                               WebDriverWait=WebDriverWait, EC=EC)
+    return _SEL
+
+
+def build_driver(headless: bool = True, perf_logs: bool = True, lean: bool = False, page_load_strategy: str = "normal"):
+    s = selenium()
+    opts = s.Options()
+    # "eager"/"none" return from get/refresh early; pair with navigation.wait_ready predicates
+    opts.page_load_strategy = page_load_strategy
+    if lean:
+        opts.add_experimental_option("prefs", LEAN_CONTENT_PREFS)
+    # Headless new is more stable with Chrome >= 109
+    if headless:
+        opts.add_argument("--headless=new")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--disable-blink-features=AutomationControlled")
+    opts.add_argument("--window-size=1400,900")
+    # Startup trimming: no first-run UI, extensions, sync or component updates
+    for arg in (
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-extensions",
+        "--disable-sync",
+        "--disable-component-update",
+        "--disable-background-networking",
+        "--disable-default-apps",
+    ):
+        opts.add_argument(arg)
+    opts.add_argument(f"user-agent={USER_AGENT}")
+    # Enable performance + browser logs (HAR-like capture)
+    if perf_logs:
+        try:
+            opts.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+        except Exception:
+            pass
+
+    # Prefer chromedriver from PATH or common locations
+    chromedriver_path = shutil.which("chromedriver") or "/usr/bin/chromedriver"
+    # Also allow bundled drivers in workspace venv
+    workspace_candidates = [
+        os.path.join(os.getcwd(), "venv", "chromedriver-Linux64"),
+        os.path.join(os.getcwd(), "venv", "chromedriver"),
+    ]
+    driver = None
+    for p in [chromedriver_path] + workspace_candidates:
+        try:
+            if p and os.path.exists(p):
+                driver = s.webdriver.Chrome(service=s.Service(p), options=opts)
+                break
+        except Exception:
+            continue
+    # Fallback: try default discovery
+    if driver is None:
+        driver = s.webdriver.Chrome(options=opts)
+    # WEBDRIVER_PROFILE=1 / --webdriver-profile: count every command per calling function
+    profiler = command_profiler.active()
+    if profiler is not None:
+        profiler.attach(driver)
+    return driver
+
+
+def wait_alert_and_accept(driver, timeout=5) -> Optional[str]:
+    s = selenium()
+    try:
+        s.WebDriverWait(driver, timeout).until(s.EC.alert_is_present())
+        alert = driver.switch_to.alert
+        txt = alert.text
+        alert.accept()
+        return txt
+    except Exception:
+        return None
+
+
+def ensure_login(
+    driver,
+    username: str,
+    password: str,
+    login_url: str = LOGIN_URL,
+    timeout=20,
+    log: Optional[Callable[[str], None]] = None,
+) -> None:
+    if not username or not password:
+        raise RuntimeError("USERNAME/PASSWORD not set in script")
+    s = selenium()
+    driver.get(login_url)
+    s.WebDriverWait(driver, timeout).until(s.EC.presence_of_element_located((s.By.NAME, "userid")))
+    driver.find_element(s.By.NAME, "userid").clear()
+    driver.find_element(s.By.NAME, "userid").send_keys(username)
+    driver.find_element(s.By.NAME, "Pass").clear()
+    driver.find_element(s.By.NAME, "Pass").send_keys(password)
+
+    # There appear to be two submit inputs; click the second when present
+    submit_buttons = driver.find_elements(s.By.XPATH, "//input[@type='submit']")
+    (submit_buttons[1] if len(submit_buttons) >= 2 else submit_buttons[0]).click()
+
+    msg = wait_alert_and_accept(driver, timeout=5)  # handle potential confirm/alert
+    if msg and log:
+        log(f"[login] alert: {msg}")
+    s.WebDriverWait(driver, timeout).until(s.EC.url_changes(login_url))
+    if log:
+        log("[login] OK")
+
+
+def enumerate_forms(driver) -> List[Dict[str, Any]]:
+    By = selenium().By
+    out: List[Dict[str, Any]] = []
+    forms = driver.find_elements(By.TAG_NAME, "form")
+    for idx, form in enumerate(forms):
+        fm: Dict[str, Any] = {
+            "index": idx,
+            "action": form.get_attribute("action"),
+            "method": form.get_attribute("method"),
+            "inputs": [],
+            "buttons": [],
+        }
+        inputs = form.find_elements(By.XPATH, ".//input | .//select | .//textarea")
+        for inp in inputs:
+            fm["inputs"].append({
+                "tag": inp.tag_name,
+                "type": inp.get_attribute("type"),
+                "name": inp.get_attribute("name"),
+                "id": inp.get_attribute("id"),
+                "placeholder": inp.get_attribute("placeholder"),
+                "required": bool(inp.get_attribute("required")),
+            })
+        buttons = form.find_elements(By.XPATH, ".//button | .//input[@type='submit'] | .//input[@type='button']")
+        for b in buttons:
+            fm["buttons"].append({
+                "tag": b.tag_name,
+                "type": b.get_attribute("type"),
+                "name": b.get_attribute("name"),
+                "text": b.text or b.get_attribute("value"),
+            })
+        out.append(fm)
+    return out
+
+
+def dump_performance_logs(driver, label_prefix: str = "perf") -> Optional[str]:
+    """One-shot drain of the Network.* performance entries (see perf_capture.PerfCapture
+    for incremental capture during a run)."""
+    from perf_capture import PerfCapture
+    cap = PerfCapture(prefix=label_prefix)
+    if not cap.drain(driver):
+        cap.close()
+        return None
+    files = cap.close()
+    return files[0] if files else None
+
+
+# Lean profile: skip images, fonts, media and off-site requests while watching.
+# CDP Network.setBlockedURLs can be switched off again at runtime (unlike launch prefs),
+# so the full profile comes back just before form interaction without a restart.
+LEAN_BLOCKED_EXTENSIONS = [
+    "png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3", "ogg", "wav", "m4a",
+]
+# Never needed by this flow; content settings that are safe to deny for the whole run
+LEAN_CONTENT_PREFS = {
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+    "profile.default_content_setting_values.media_stream": 2,
+    "profile.default_content_setting_values.automatic_downloads": 2,
+}
+
+OFFSITE_HOSTS_JS = r"""
+var site = arguments[0], seen = {}, out = [];
+var entries = performance.getEntriesByType('resource');
+for (var i = 0; i < entries.length; i++) {
+  try {
+    var h = new URL(entries[i].name).hostname;
+    if (h && h !== site && !h.endsWith('.' + site) && !seen[h]) { seen[h] = 1; out.push(h); }
+  } catch (e) {}
+}
+return out;
+"""
+
+PAGE_METRICS_JS = r"""
+var nav = (performance.getEntriesByType('navigation') || [])[0] || {};
+var res = performance.getEntriesByType('resource');
+var bytes = 0;
+for (var i = 0; i < res.length; i++) { bytes += res[i].transferSize || 0; }
+return {
+  dcl_ms: Math.round(nav.domContentLoadedEventEnd || 0),
+  load_ms: Math.round(nav.loadEventEnd || 0),
+  resources: res.length,
+  transfer_kb: Math.round((bytes + (nav.transferSize || 0)) / 1024)
+};
+"""
+
+
+def lean_blocked_urls(offsite_hosts: List[str]) -> List[str]:
+    urls: List[str] = []
+    for ext in LEAN_BLOCKED_EXTENSIONS:
+        urls += [f"*.{ext}", f"*.{ext}?*"]
+    for h in offsite_hosts:
+        urls.append(f"*://{h}/*")
+    return urls
+
+
+def offsite_hosts(driver, site_host: str) -> List[str]:
+    """Hosts other than the site that the current page loaded resources from."""
+    try:
+        return list(driver.execute_script(OFFSITE_HOSTS_JS, site_host) or [])
+    except Exception:
+        return []
+
+
+def set_lean_profile(driver, enabled: bool, blocked_hosts: Optional[List[str]] = None) -> bool:
+    """Toggle request blocking via CDP. Returns False when CDP is unavailable."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        urls = lean_blocked_urls(blocked_hosts or []) if enabled else []
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+        return True
+    except Exception:
+        return False
+
+
+def page_load_metrics(driver) -> Dict[str, Any]:
+    try:
+        return dict(driver.execute_script(PAGE_METRICS_JS) or {})
+    except Exception:
+        return {}
+
+
+def chrome_usage(driver) -> Optional[Dict[str, float]]:
+    """RSS (MB) and CPU time (s, user+system of live processes) of chromedriver's Chrome
+    process tree (Linux /proc)."""
+    try:
+        root = driver.service.process.pid
+    except Exception:
+        return None
+    children: Dict[int, List[int]] = {}
+    rss_kb: Dict[int, int] = {}
+    try:
+        for name in os.listdir("/proc"):
+            if not name.isdigit():
+                continue
+            try:
+                with open(f"/proc/{name}/status", "r") as f:
+                    ppid = rss = 0
+                    for line in f:
+                        if line.startswith("PPid:"):
+                            ppid = int(line.split()[1])
+                        elif line.startswith("VmRSS:"):
+                            rss = int(line.split()[1])
+                children.setdefault(ppid, []).append(int(name))
+                rss_kb[int(name)] = rss
+            except Exception:
+                continue
+    except Exception:
+        return None
+    tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    total, cpu, procs, stack = 0, 0, 0, list(children.get(root, []))
+    while stack:
+        pid = stack.pop()
+        total += rss_kb.get(pid, 0)
+        procs += 1
+        try:
+            with open(f"/proc/{pid}/stat", "r") as f:
+                # Fields after the ")" of comm: utime/stime are the 12th/13th
+                fields = f.read().rsplit(")", 1)[1].split()
+            cpu += int(fields[11]) + int(fields[12])
+        except Exception:
+            pass
+        stack.extend(children.get(pid, []))
+    return {"rss_mb": round(total / 1024, 1), "cpu_s": round(cpu / tick, 2), "processes": procs}
+
+
+def chrome_rss_mb(driver) -> Optional[float]:
+    """Resident memory of chromedriver's Chrome process tree (Linux /proc)."""
+    usage = chrome_usage(driver)
+    return usage["rss_mb"] if usage else None
+
+
+# Selector batch: evaluate an ordered list of XPath/CSS candidates in one script call
+# instead of find_elements + is_displayed (+ get_attribute) round-trips per element.
+SELECTOR_BATCH_JS = r"""
+var cands = arguments[0], climb = arguments[1], root = arguments[2] || document;
+var visible = function(e) {
+  if (!(e.offsetWidth || e.offsetHeight || e.getClientRects().length)) return false;
+  var cs = window.getComputedStyle(e);
+  return cs.visibility !== 'hidden' && cs.display !== 'none';
+};
+var clickable = function(e) {
+  for (var i = 0; e && i <= climb; i++, e = e.parentElement) {
+    var tag = e.tagName.toLowerCase();
+    if (tag === 'a' || tag === 'button') return e;
+  }
+  return null;
+};
+for (var i = 0; i < cands.length; i++) {
+  var nodes = [];
+  try {
+    if (cands[i][0] === 'css') {
+      nodes = root.querySelectorAll(cands[i][1]);
+    } else {
+      var snap = document.evaluate(cands[i][1], root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      for (var j = 0; j < snap.snapshotLength; j++) nodes.push(snap.snapshotItem(j));
+    }
+  } catch (e) { continue; }
+  for (var k = 0; k < nodes.length; k++) {
+    var n = nodes[k];
+    if (n.nodeType !== 1 || !visible(n)) continue;
+    var el = climb ? clickable(n) : n;
+    if (!el) continue;
+    return {
+      el: el, index: i, selector: cands[i][1], tag: el.tagName.toLowerCase(),
+      outer_html: el.outerHTML, href: el.href || el.getAttribute('href'),
+      onclick: el.getAttribute('onclick'), text: (el.innerText || el.value || '').trim().slice(0, 200)
+    };
+  }
+}
+return null;
+"""
+
+
+def selector_kind(selector: str) -> str:
+    s = selector.lstrip()
+    return "xpath" if s.startswith(("/", "./", "(")) else "css"
+
+
+def first_visible(driver, selectors: List[str], climb: int = 0, root=None) -> Optional[Dict[str, Any]]:
+    """First visible match over ordered XPath/CSS candidates, in one execute_script.
+
+    Strings starting with '/', './' or '(' are XPath, anything else CSS. With climb > 0
+    a match that is not an a/button is replaced by its nearest a/button ancestor within
+    `climb` levels (skipped if there is none). Returns a dict with el (WebElement), index,
+    selector, tag, outer_html, href, onclick and text, or None.
+    """
+    cands = [[selector_kind(s), s] for s in selectors]
+    return driver.execute_script(SELECTOR_BATCH_JS, cands, int(climb), root)
@@ -0,0 +1,117 @@
+import os
+import re
+import sys
+import json
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+# Structured event log: JSON lines written by a background thread from a bounded
+# queue, so callers (the hot watch loop included) never wait on disk. Each record has
+#   t_ms   monotonic ms since the log was opened (for latency math)
+#   ts     wall-clock time (for humans)
+#   phase  the "[tag]" of the message unless given explicitly
+#   msg    the human-readable line, plus dur_ms / any extra fields passed by the caller
+# Pending records are flushed on close(), at interpreter exit and from the crash hook.
+TAG_RE = re.compile(r"^\[([\w-]+)\]")
+
+
+class EventLog:
+    def __init__(self, path: Optional[str], maxsize: int = 10000, echo: bool = True):
+        self.path = path
+        self.echo = echo
+        self.dropped = 0
+        self._t0 = time.monotonic_ns()
+        self._q: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if path:
+            self._thread = threading.Thread(target=self._writer, name="event-log", daemon=True)
+            self._thread.start()
+
+    def _writer(self) -> None:
+        try:
+            f = open(self.path, "a", encoding="utf-8", buffering=1 << 16)
+        except Exception:
+            return
+        with f:
+            while True:
+                rec = self._q.get()
+                if rec is None:
+                    break
+                batch = [rec]
+                # Drain whatever else is queued before touching the file
+                while True:
+                    try:
+                        nxt = self._q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if nxt is None:
+                        self._q.put_nowait(None)
+                        break
+                    batch.append(nxt)
+                try:
+                    f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch))
+                    f.flush()
+                except Exception:
+                    pass
+
+    def emit(self, msg: str, phase: Optional[str] = None, dur_ms: Optional[float] = None, **fields: Any) -> None:
+        now = datetime.now()
+        if self.echo:
+            print(f"[{now.strftime('%H:%M:%S')}] {msg}")
+        if self._thread is None or self._closed:
+            return
+        m = TAG_RE.match(msg) if phase is None else None
+        rec: Dict[str, Any] = {
+            "t_ms": round((time.monotonic_ns() - self._t0) / 1e6, 3),
+            "ts": now.isoformat(timespec="milliseconds"),
+            "phase": phase or (m.group(1) if m else None),
+            "msg": msg,
+        }
+        if dur_ms is not None:
+            rec["dur_ms"] = round(dur_ms, 3)
+        rec.update(fields)
+        try:
+            self._q.put_nowait(rec)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending records and stop the writer (idempotent)."""
+        if self._closed or self._thread is None:
+            self._closed = True
+            return
+        if self.dropped:
+            self.emit(f"[log] Dropped {self.dropped} event(s) on a full queue", phase="log")
+        self._closed = True
+        try:
+            self._q.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+
+def open_event_log(prefix: str = "events", directory: str = "logs", **kwargs: Any) -> EventLog:
+    """logs/<prefix>_<epoch>.jsonl, flushed at exit and on an uncaught exception."""
+    path: Optional[str] = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{prefix}_{int(time.time())}.jsonl")
+    except Exception:
+        path = None
+    log = EventLog(path, **kwargs)
+    atexit.register(log.close)
+    prev_hook = sys.excepthook
+
+    def _crash_hook(exc_type, exc, tb):
+        log.emit(f"[crash] {exc_type.__name__}: {exc}", phase="crash")
+        log.close()
+        prev_hook(exc_type, exc, tb)
+
+    sys.excepthook = _crash_hook
+    return log
@@ -0,0 +1,129 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+# Declarative field-role table used by heuristic form filling.
+# kinds:    which control kinds the rule applies to ("text", "checkbox", "radio")
+# all_of:   every keyword group must have at least one hit
+# none_of:  any hit here vetoes the rule
+# priority: lower wins when several roles match the same control
+# source:   USER_DATA key that supplies the value (None = just check/select it)
+FIELD_RULES: List[Dict] = [
+    {"role": "child_name", "kinds": ("text",), "priority": 10, "source": "child_name",
+     "all_of": [["자녀", "아동", "아이"], ["이름", "성명", "name"]], "none_of": []},
+    {"role": "parent_name", "kinds": ("text",), "priority": 20, "source": "name",
+     "all_of": [["보호자", "신청자", "이름", "성명"]], "none_of": ["자녀"]},
+    {"role": "child_age", "kinds": ("text",), "priority": 30, "source": "child_age",
+     "all_of": [["나이", "개월", "연령", "age"]], "none_of": []},
+    {"role": "phone", "kinds": ("text",), "priority": 40, "source": "phone",
+     "all_of": [["휴대", "연락처", "전화", "핸드폰", "tel", "phone"]], "none_of": []},
+    {"role": "email", "kinds": ("text",), "priority": 50, "source": "email",
+     "all_of": [["email", "이메일"]], "none_of": []},
+    {"role": "address", "kinds": ("text",), "priority": 60, "source": "address",
+     "all_of": [["주소", "address"]], "none_of": []},
+    {"role": "consent", "kinds": ("checkbox",), "priority": 10, "source": None,
+     "all_of": [["agree", "동의", "약관", "개인정보", "동의함", "chkall", "checkall", "all"]], "none_of": []},
+    # "disagree"/"동의하지 않습니다" options share the group name with the "yes" option
+    {"role": "consent", "kinds": ("radio",), "priority": 10, "source": None,
+     "all_of": [["agree"]], "none_of": ["disagree", "않", "비동의", "미동의"]},
+    {"role": "gender_male", "kinds": ("radio",), "priority": 20, "source": None,
+     "all_of": [["남", "남자", "male", "m"]], "none_of": []},
+    {"role": "gender_female", "kinds": ("radio",), "priority": 21, "source": None,
+     "all_of": [["여", "여자", "female", "f"]], "none_of": []},
+    {"role": "required_choice", "kinds": ("radio",), "priority": 90, "source": None,
+     "all_of": [["필수", "required", "성별", "남", "여"]], "none_of": ["disagree", "않", "비동의", "미동의"]},
+]
+
+
+class CompiledRules:
+    """FIELD_RULES compiled into one regex plus keyword bitmasks.
+
+    The regex is a zero-width lookahead alternation (longest keyword first), so one
+    finditer pass reports the longest keyword starting at every position. Shorter
+    keywords contained in a hit are implied through a precomputed closure, which
+    makes the result identical to testing every keyword with `in`.
+    """
+
+    def __init__(self, rules: List[Dict]):
+        self.rules = sorted(rules, key=lambda r: r["priority"])
+        keywords = sorted({k for r in rules for g in r["all_of"] for k in g} | {k for r in rules for k in r["none_of"]},
+                          key=lambda k: (-len(k), k))
+        self._regex = re.compile("(?=(" + "|".join(re.escape(k) for k in keywords) + "))")
+
+        bit_of: Dict[Tuple[int, int], int] = {}
+        kw_mask: Dict[str, int] = {k: 0 for k in keywords}
+        # (kinds, role, source, required mask, veto mask) per rule
+        self._compiled: List[Tuple[Tuple[str, ...], str, Optional[str], int, int]] = []
+        for ri, r in enumerate(self.rules):
+            need = 0
+            for gi, group in enumerate(r["all_of"]):
+                bit = 1 << len(bit_of)
+                bit_of[(ri, gi)] = bit
+                need |= bit
+                for k in group:
+                    kw_mask[k] |= bit
+            veto = 1 << len(bit_of)
+            bit_of[(ri, -1)] = veto
+            for k in r["none_of"]:
+                kw_mask[k] |= veto
+            self._compiled.append((tuple(r["kinds"]), r["role"], r.get("source"), need, veto if r["none_of"] else 0))
+
+        # A hit on a keyword also counts as a hit on every keyword it contains
+        self._implied: Dict[str, int] = {}
+        for k in keywords:
+            m = 0
+            for other in keywords:
+                if other in k:
+                    m |= kw_mask[other]
+            self._implied[k] = m
+
+    def hits(self, text_blob: str) -> int:
+        mask = 0
+        for m in self._regex.finditer(text_blob):
+            mask |= self._implied[m.group(1)]
+        return mask
+
+    def classify(self, text_blob: str, kind: str) -> List[Tuple[str, Optional[str]]]:
+        """All (role, source) pairs matching text_blob for a control kind, best first."""
+        mask = self.hits(text_blob)
+        out = []
+        for kinds, role, source, need, veto in self._compiled:
+            if kind in kinds and (mask & need) == need and not (mask & veto):
+                out.append((role, source))
+        return out
+
+    def best(self, text_blob: str, kind: str) -> Tuple[Optional[str], Optional[str]]:
+        matches = self.classify(text_blob, kind)
+        return matches[0] if matches else (None, None)
+
+
+COMPILED_RULES = CompiledRules(FIELD_RULES)
+
+
+def control_kind(field: Dict) -> Optional[str]:
+    """Map a snapshot field to a rule kind, or None when rules don't apply."""
+    itype = (field.get("type") or "").lower()
+    if field.get("tag") == "select":
+        return None
+    if itype in ("checkbox", "radio"):
+        return itype
+    if field.get("tag") == "textarea" or itype in ("text", "tel", "email", "textarea", ""):
+        return "text"
+    return None
+
+
+def text_blob_for(field: Dict, kind: str) -> str:
+    name = (field.get("name") or "").lower()
+    pid = (field.get("id") or "").lower()
+    placeholder = (field.get("placeholder") or "").lower()
+    label = (field.get("label") or "").lower()
+    if kind == "radio":
+        return name + pid + label
+    return " ".join([name, pid, placeholder, label])
+
+
+def classify_field(field: Dict) -> List[Tuple[str, Optional[str]]]:
+    kind = control_kind(field)
+    if not kind:
+        return []
+    return COMPILED_RULES.classify(text_blob_for(field, kind), kind)
@@ -0,0 +1,552 @@
+import os
+import re
+import sys
+import glob
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+
+# Local stand-in for www.sahascc.or.kr built from the saved pages in logs/, so the bot
+# (and probe_flow / open_item_scanner) can be measured and regression-tested offline.
+#   python3 fixture_server.py --open-in 60 --variant popup --latency-ms 40
+#   python3 resilient_bot.py --base-url http://127.0.0.1:8765 --start-at <open time>
+#
+# Endpoints: /member/login.asp (+ login_ok.asp, logout.asp), /parent/Appchild_view.asp
+# (status block rendered from the fixture clock), /parent/*_regist.asp (the saved
+# application form), /parent/*_regist_ok.asp (records the application and answers with
+# the site's alert), /mypage/Appchild.asp (saved list + recorded applications), and
+# every page saved by preflight_mapper, replayed by path and query.
+# Control: /__fixture/stats, /__fixture/open, /__fixture/close, /__fixture/reset,
+# /__fixture/clock?open_in=S (all GET, JSON responses).
+SITE = "https://www.sahascc.or.kr"
+
+VIEW_PAGE = os.path.join("logs", "preflight_1755172737_644.html")
+FORM_PAGE = os.path.join("logs", "open_scan_1755176457.html")
+MYPAGE_PAGE = os.path.join("logs", "preflight_1755172737_161.html")
+HOME_PAGE = os.path.join("logs", "preflight_1755172737_322.html")
+
+SESSION_COOKIE = "FIXTURESESSION"
+VARIANTS = ("plain", "alert", "iframe", "popup")
+
+BTN_GRP_RE = re.compile(r'(<div class="btn-grp">)(.*?)(</div>)', re.S)
+OFFSITE_SCRIPT_RE = re.compile(r'<script[^>]*\bsrc="(?:https?:)?//[^"]*"[^>]*>\s*</script>', re.I)
+OFFSITE_LINK_RE = re.compile(r'<link[^>]*\bhref="(?:https?:)?//[^"]*"[^>]*>', re.I)
+MYPAGE_TBODY_RE = re.compile(r"(<tbody>)", re.I)
+LECTURE_SN_RE = re.compile(r'(<input type="hidden" name="lecture_sn" value=")\d*(">)')
+
+LOGIN_HTML = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>부산 사하구 육아종합지원센터</title></head>
+<body>
+<div class="top-srch"><form method="POST" action="/total_search.asp" name="top_search">
+<input type="text" name="SearchString"><input type="submit" value="검색" class="btn-search"></form></div>
+<div class="login-box">
+<form method="POST" action="/member/login_ok.asp" name="loginform">
+<input type="hidden" name="returnurl" value="{returnurl}">
+<p><input type="text" name="userid" placeholder="아이디"></p>
+<p><input type="password" name="Pass" placeholder="비밀번호"></p>
+<p><input type="submit" value="로그인"></p>
+</form></div>
+</body></html>
+"""
+
+IFRAME_HTML = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>부산 사하구 육아종합지원센터</title></head>
+<body><a href="/member/logout.asp" class="logout">로그아웃</a>
+<iframe src="{src}" style="width:100%;height:900px;border:0"></iframe>
+</body></html>
+"""
+
+# Minimal stand-in for the jQuery calls the saved pages make inline (checkIt/checkIt2):
+# $(":input:radio[name=agree1]:checked").val(), $("input:checkbox[id='chkall']").is(":checked"), .prop()
+JQUERY_SHIM = r"""
+(function(){
+  function css(sel){ return String(sel).replace(/:input/g, 'input').replace(/:(radio|checkbox)/g, '[type=$1]'); }
+  function wrap(els){
+    var o = {
+      length: els.length,
+      val: function(v){ if (v === undefined) return els[0] ? els[0].value : undefined; els.forEach(function(e){ e.value = v; }); return p; },
+      is: function(q){ return els.some(function(e){ return e.matches(css(q)); }); },
+      prop: function(k, v){ if (v === undefined) return els[0] ? els[0][k] : undefined; els.forEach(function(e){ e[k] = v; }); return p; },
+      attr: function(k, v){ if (v === undefined) return els[0] ? els[0].getAttribute(k) : undefined; els.forEach(function(e){ e.setAttribute(k, v); }); return p; },
+      each: function(fn){ els.forEach(function(e, i){ fn.call(e, i, e); }); return p; },
+      get: function(i){ return els[i]; }
+    };
+    var p = new Proxy(o, {get: function(t, k){ return k in t ? t[k] : function(){ return p; }; }});
+    return p;
+  }
+  window.$ = window.jQuery = function(sel){
+    if (typeof sel === 'function') { if (document.readyState === 'loading') document.addEventListener('DOMContentLoaded', sel); else sel(); return wrap([]); }
+    if (typeof sel !== 'string') return wrap(sel ? [sel] : []);
+    try { return wrap(Array.prototype.slice.call(document.querySelectorAll(css(sel)))); } catch (e) { return wrap([]); }
+  };
+})();
+"""
+
+
+def _not_found_html(path: str) -> str:
+    # The site's 404 is a fixed template (~4.4KB) echoing the path; pad to a similar size
+    body = f"<h1>404 - 파일 또는 디렉터리를 찾을 수 없습니다.</h1><p>{path}</p>"
+    pad = "<!-- " + "-" * 4240 + " -->"
+    return f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>404</title></head><body>{body}{pad}</body></html>"
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def replay_pages(pattern: str = "logs/preflight_map_*.json") -> Dict[str, str]:
+    """lower-cased "path?query" -> saved HTML file, from every preflight map."""
+    out: Dict[str, str] = {}
+    for map_path in sorted(glob.glob(pattern)):
+        try:
+            with open(map_path, "r", encoding="utf-8") as f:
+                pmap = json.load(f)
+        except Exception:
+            continue
+        for r in pmap.get("results") or []:
+            if r.get("saved") and os.path.exists(r["saved"]):
+                u = urlsplit(r.get("final_url") or r.get("path") or "")
+                out[(u.path + ("?" + u.query if u.query else "")).lower()] = r["saved"]
+    return out
+
+
+class FixtureState:
+    """Fixture clock, fault injection and everything the server recorded."""
+
+    def __init__(
+        self,
+        open_at: Optional[float] = None,
+        close_after: Optional[float] = None,
+        clock_offset: float = 0.0,
+        variant: str = "plain",
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        path_latency: Optional[Dict[str, float]] = None,
+        rate_limit: int = 0,
+        fail_429: float = 0.0,
+        seed: int = 0,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+    ):
+        self.open_at = open_at
+        self.close_after = close_after
+        self.clock_offset = clock_offset
+        self.variant = variant
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.path_latency = path_latency or {}
+        self.rate_limit = rate_limit
+        self.fail_429 = fail_429
+        self.username = username
+        self.password = password
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._hits: Dict[str, List[float]] = {}
+        self.sessions: Dict[str, str] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: Dict[str, int] = {}
+            self.status: Dict[str, int] = {}
+            self.rate_limited = 0
+            self.logins = 0
+            self.first_open_view: Optional[float] = None
+            self.applications: List[Dict[str, Any]] = []
+
+    # --- clock ---
+    def now(self) -> float:
+        """Server wall clock (epoch s); Date headers and the flip use it."""
+        return time.time() + self.clock_offset
+
+    def state(self) -> str:
+        if self.open_at is None or self.now() < self.open_at:
+            return "pending"
+        if self.close_after is not None and self.now() >= self.open_at + self.close_after:
+            return "closed"
+        return "open"
+
+    def set_open_in(self, seconds: float) -> None:
+        self.open_at = self.now() + seconds
+
+    # --- faults ---
+    def delay_s(self, path: str) -> float:
+        ms = self.latency_ms
+        for prefix, v in self.path_latency.items():
+            if path.lower().startswith(prefix.lower()):
+                ms = v
+        if self.jitter_ms:
+            with self._lock:
+                ms += self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, ms) / 1000
+
+    def throttled(self, client: str, path: str) -> bool:
+        if path.startswith("/__fixture/"):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if self.fail_429 and path.endswith(".asp") and self._rng.random() < self.fail_429:
+                self.rate_limited += 1
+                return True
+            if self.rate_limit:
+                hits = [t for t in self._hits.get(client, []) if now - t < 1.0]
+                hits.append(now)
+                self._hits[client] = hits
+                if len(hits) > self.rate_limit:
+                    self.rate_limited += 1
+                    return True
+        return False
+
+    def count(self, path: str, status: int) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.status[str(status)] = self.status.get(str(status), 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "now": datetime.fromtimestamp(self.now()).isoformat(timespec="milliseconds"),
+                "state": self.state(),
+                "open_at": datetime.fromtimestamp(self.open_at).isoformat(timespec="milliseconds") if self.open_at else None,
+                "variant": self.variant,
+                "requests": dict(self.requests),
+                "status": dict(self.status),
+                "rate_limited": self.rate_limited,
+                "logins": self.logins,
+                # Seconds from the flip to the first view served open / to each application
+                "first_open_view_s": round(self.first_open_view - self.open_at, 3)
+                if self.first_open_view and self.open_at else None,
+                "applications": [
+                    {**a, "after_open_s": round(a["at"] - self.open_at, 3) if self.open_at else None}
+                    for a in self.applications
+                ],
+            }
+
+
+def btn_grp(state: str, sn: str, variant: str) -> str:
+    """Status block markup for each clock state / click variant."""
+    if state == "pending":
+        return "\n\t\t\t\t\t\t\t\n\t\t\t\t\t\t\t\t<span >신청예정</span>\n\t\t\t\t\t\t\t\n\t\t\t\t\t\t\t<a href=\"Appchild.asp\" class=\"blue line\">목록</a>\n\t\t\t\t\t\t"
+    if state == "closed":
+        return "\n\t\t\t\t\t\t\t\t<span >마감</span>\n\t\t\t\t\t\t\t<a href=\"Appchild.asp\" class=\"blue line\">목록</a>\n\t\t\t\t\t\t"
+    href = f"Appchild_regist.asp?sn={sn}"
+    if variant == "alert":
+        a = f'<a href="{href}" class="blue" onclick="alert(\'신청 페이지로 이동합니다.\');">신청</a>'
+    elif variant == "popup":
+        a = f'<a href="#" class="blue" onclick="window.open(\'{href}\', \'apply\', \'width=900,height=800\'); return false;">신청</a>'
+    else:
+        a = f'<a href="{href}" class="blue">신청</a>'
+    return f"\n\t\t\t\t\t\t\t\t{a}\n\t\t\t\t\t\t\t<a href=\"Appchild.asp\" class=\"blue line\">목록</a>\n\t\t\t\t\t\t"
+
+
+def _alert_page(msg: str, then: str = "history.back();") -> str:
+    return f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"></head><body><script>alert('{msg}');{then}</script></body></html>"
+
+
+def _form_fields(body: bytes, ctype: str) -> Dict[str, str]:
+    if ctype.startswith("multipart/"):
+        msg = BytesParser(policy=HTTP).parsebytes(b"Content-Type: " + ctype.encode() + b"\r\n\r\n" + body)
+        out: Dict[str, str] = {}
+        for part in msg.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name and not part.get_filename():
+                out[name] = (part.get_payload(decode=True) or b"").decode("utf-8", errors="replace")
+        return out
+    return {k: v[-1] for k, v in parse_qs(body.decode("utf-8", errors="replace"), keep_blank_values=True).items()}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "Microsoft-IIS/10.0"
+    state: FixtureState
+    pages: Dict[str, str]
+    base: str
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            sys.stderr.write(f"[fixture] {self.address_string()} {fmt % args}\n")
+
+    def handle(self) -> None:
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # http_watch stops reading once the status block is in and drops the connection
+            pass
+
+    def date_time_string(self, timestamp: Optional[float] = None) -> str:
+        return super().date_time_string(self.state.now() if timestamp is None else timestamp)
+
+    # --- helpers ---
+    def _session(self) -> Optional[str]:
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            k, _, v = part.strip().partition("=")
+            if k == SESSION_COOKIE and v in self.state.sessions:
+                return v
+        return None
+
+    def _send(self, status: int, body: str = "", ctype: str = "text/html; charset=utf-8",
+              headers: Optional[List[Tuple[str, str]]] = None) -> None:
+        data = body.encode("utf-8")
+        etag = None
+        if status == 200 and ctype.startswith("text/html"):
+            etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                status, data = 304, b""
+        self.state.count(urlsplit(self.path).path, status)
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            if etag:
+                self.send_header("ETag", etag)
+            for k, v in headers or []:
+                self.send_header(k, v)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _redirect(self, location: str, headers: Optional[List[Tuple[str, str]]] = None) -> None:
+        self._send(302, "", headers=[("Location", location)] + (headers or []))
+
+    def _page(self, path: str) -> str:
+        html = _read(path).replace(SITE, self.base)
+        html = OFFSITE_SCRIPT_RE.sub("", html)
+        return OFFSITE_LINK_RE.sub("", html)
+
+    def _login_required(self, u) -> bool:
+        if self._session():
+            return False
+        self._redirect("/member/login.asp?returnurl=" + quote(u.path + ("?" + u.query if u.query else ""), safe=""))
+        return True
+
+    # --- dispatch ---
+    def do_HEAD(self) -> None:
+        self.do_GET()
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def _handle(self) -> None:
+        u = urlsplit(self.path)
+        path = u.path
+        q = {k: v[-1] for k, v in parse_qs(u.query, keep_blank_values=True).items()}
+        body = b""
+        if self.command == "POST":
+            n = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(n) if n else b""
+        if self.state.throttled(self.client_address[0], path):
+            self._send(429, _alert_page("요청이 많습니다. 잠시 후 다시 시도해 주세요."), headers=[("Retry-After", "1")])
+            return
+        delay = self.state.delay_s(path)
+        if delay:
+            time.sleep(delay)
+        lp = path.lower()
+
+        if lp.startswith("/__fixture/"):
+            return self._control(lp, q)
+        if lp == "/robots.txt":
+            return self._send(200, "User-agent: *\nDisallow:\n", "text/plain")
+        if lp.startswith("/js/jquery"):
+            return self._send(200, JQUERY_SHIM, "application/javascript")
+        if lp.endswith(".js"):
+            return self._send(200, "", "application/javascript")
+        if lp.endswith(".css"):
+            return self._send(200, "", "text/css")
+        if re.search(r"\.(png|jpe?g|gif|ico|svg|woff2?|ttf)$", lp):
+            return self._send(204, "", "application/octet-stream")
+
+        if lp == "/member/login.asp":
+            return self._send(200, LOGIN_HTML.format(returnurl=q.get("returnurl", "/")))
+        if lp == "/member/login_ok.asp" and self.command == "POST":
+            f = _form_fields(body, self.headers.get("Content-Type") or "")
+            if not f.get("userid") or not f.get("Pass") or (
+                self.state.username and (f["userid"], f["Pass"]) != (self.state.username, self.state.password)
+            ):
+                return self._send(200, _alert_page("아이디 또는 비밀번호가 일치하지 않습니다."))
+            token = hashlib.sha1(f"{f['userid']}{time.time()}{random.random()}".encode()).hexdigest()[:24]
+            self.state.sessions[token] = f["userid"]
+            self.state.logins += 1
+            return self._redirect(f.get("returnurl") or "/", [("Set-Cookie", f"{SESSION_COOKIE}={token}; path=/; HttpOnly")])
+        if lp == "/member/logout.asp":
+            self.state.sessions.pop(self._session() or "", None)
+            return self._redirect("/", [("Set-Cookie", f"{SESSION_COOKIE}=; path=/; Max-Age=0")])
+
+        if lp == "/parent/appchild_view.asp":
+            if self._login_required(u):
+                return
+            state = self.state.state()
+            if state == "open" and self.state.first_open_view is None:
+                self.state.first_open_view = self.state.now()
+            sn = q.get("sn", "")
+            html = BTN_GRP_RE.sub(lambda m: m.group(1) + btn_grp(state, sn, self.state.variant) + m.group(3),
+                                  self._page(VIEW_PAGE), count=1)
+            return self._send(200, html, headers=[("Cache-Control", "private")])
+        if re.fullmatch(r"/parent/\w+_regist\.asp", lp):
+            if self._login_required(u):
+                return
+            if self.state.state() != "open":
+                return self._send(200, _alert_page("신청기간이 아닙니다."))
+            if self.state.variant == "iframe" and "inner" not in q:
+                return self._send(200, IFRAME_HTML.format(src=f"{u.path}?{u.query}&inner=1" if u.query else f"{u.path}?inner=1"))
+            html = self._page(FORM_PAGE)
+            if q.get("sn"):
+                html = LECTURE_SN_RE.sub(lambda m: m.group(1) + q["sn"] + m.group(2), html, count=1)
+            return self._send(200, html)
+        if re.fullmatch(r"/parent/\w+_regist_ok\.asp", lp) and self.command == "POST":
+            if self._login_required(u):
+                return
+            return self._apply(_form_fields(body, self.headers.get("Content-Type") or ""))
+        if lp == "/mypage/appchild.asp":
+            if self._login_required(u):
+                return
+            return self._send(200, self._mypage())
+        if lp in ("/", "/index.asp"):
+            return self._send(200, self._page(HOME_PAGE))
+
+        saved = self.pages.get((path + ("?" + u.query if u.query else "")).lower()) or self.pages.get(lp)
+        if saved:
+            return self._send(200, self._page(saved))
+        self._send(404, _not_found_html(path))
+
+    def _apply(self, fields: Dict[str, str]) -> None:
+        if self.state.state() != "open":
+            return self._send(200, _alert_page("신청기간이 아닙니다."))
+        if not all(fields.get(f"agree{i}") == "Y" for i in (1, 2, 3)):
+            return self._send(200, _alert_page("개인정보 수집 이용 동의,초상권 사용 동의,교육 시 유의 사항에 대한 동의에 모두 동의를 하셔야 합니다."))
+        user = self.state.sessions.get(self._session() or "", "")
+        sn = fields.get("lecture_sn") or fields.get("sn") or ""
+        if any(a["user"] == user and a["sn"] == sn for a in self.state.applications):
+            return self._send(200, _alert_page("이미 신청하셨습니다.", "location.href='/mypage/Appchild.asp';"))
+        self.state.applications.append({"user": user, "sn": sn, "at": self.state.now(), "fields": fields})
+        self._send(200, _alert_page("신청이 완료되었습니다.", "location.href='/mypage/Appchild.asp';"))
+
+    def _mypage(self) -> str:
+        user = self.state.sessions.get(self._session() or "", "")
+        rows = ""
+        for i, a in enumerate(x for x in self.state.applications if x["user"] == user):
+            rows += (
+                f"\n\t\t\t\t\t\t\t<tr>\n\t\t\t\t\t\t\t\t<td class=\"num\">{100 + i}</td>"
+                f"<td class=\"title\" data-label=\"교육명\"><a href=\"/parent/Appchild_view.asp?sn={a['sn']}\">"
+                f"[fixture] sn={a['sn']} {a['fields'].get('name') or ''}</a></td>"
+                f"<td data-label=\"교육일시\">{datetime.fromtimestamp(a['at']).strftime('%Y-%m-%d %H:%M:%S')}</td>"
+                f"<td data-label=\"신청상태\"><span class='btn-status red'>신청</span></td><td></td><td></td>\n\t\t\t\t\t\t\t</tr>"
+            )
+        return MYPAGE_TBODY_RE.sub(lambda m: m.group(1) + rows, self._page(MYPAGE_PAGE), count=1)
+
+    def _control(self, lp: str, q: Dict[str, str]) -> None:
+        st = self.state
+        if lp == "/__fixture/open":
+            st.set_open_in(0)
+        elif lp == "/__fixture/close":
+            st.open_at = None
+        elif lp == "/__fixture/reset":
+            st.reset()
+        elif lp == "/__fixture/clock":
+            if "open_in" in q:
+                st.set_open_in(float(q["open_in"]))
+            if "variant" in q and q["variant"] in VARIANTS:
+                st.variant = q["variant"]
+            if "latency_ms" in q:
+                st.latency_ms = float(q["latency_ms"])
+            if "fail_429" in q:
+                st.fail_429 = float(q["fail_429"])
+        elif lp != "/__fixture/stats":
+            return self._send(404, json.dumps({"error": "unknown control"}), "application/json")
+        self._send(200, json.dumps(st.stats(), ensure_ascii=False), "application/json")
+
+
+def start_fixture(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    state: Optional[FixtureState] = None,
+    verbose: bool = False,
+) -> Tuple[ThreadingHTTPServer, FixtureState, str]:
+    """Serve in a daemon thread; returns (server, state, base_url). port=0 picks a free port."""
+    state = state or FixtureState()
+    handler = type("Handler", (FixtureHandler,), {"state": state, "pages": replay_pages(), "base": ""})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose  # type: ignore[attr-defined]
+    base = f"http://{host}:{server.server_address[1]}"
+    handler.base = base
+    threading.Thread(target=server.serve_forever, name="fixture", daemon=True).start()
+    return server, state, base
+
+
+def _path_latency(values: List[str]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for v in values:
+        prefix, _, ms = v.rpartition("=")
+        out[prefix] = float(ms)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--open-in", type=float, default=None, help="Flip 신청예정 → 신청 this many seconds from now")
+    parser.add_argument("--open-at", default=None, help="Flip at this local ISO time instead")
+    parser.add_argument("--close-after", type=float, default=None, help="Show 마감 this many seconds after the flip")
+    parser.add_argument("--clock-offset", type=float, default=0.0, help="Server clock skew in seconds (Date header)")
+    parser.add_argument("--variant", choices=VARIANTS, default="plain",
+                        help="How the 신청 control opens the form: link, alert first, iframe form, popup window")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform ± jitter on the added latency")
+    parser.add_argument("--latency", action="append", default=[], metavar="PATH_PREFIX=MS",
+                        help="Per-path latency override, e.g. /parent/Appchild_view.asp=300")
+    parser.add_argument("--rate-limit", type=int, default=0, help="429 beyond this many requests/s per client (0: off)")
+    parser.add_argument("--fail-429", type=float, default=0.0, help="Probability of a random 429 on .asp pages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--user", default=None, help="Only accept this login (default: any)")
+    parser.add_argument("--password", default=None)
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    open_at = None
+    if args.open_at:
+        open_at = datetime.fromisoformat(args.open_at).timestamp()
+    elif args.open_in is not None:
+        open_at = time.time() + args.clock_offset + args.open_in
+    state = FixtureState(
+        open_at=open_at, close_after=args.close_after, clock_offset=args.clock_offset, variant=args.variant,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, path_latency=_path_latency(args.latency),
+        rate_limit=args.rate_limit, fail_429=args.fail_429, seed=args.seed,
+        username=args.user, password=args.password,
+    )
+    server, state, base = start_fixture(args.host, args.port, state, verbose=args.verbose)
+    print(f"[fixture] Serving {len(server.RequestHandlerClass.pages)} saved page(s) at {base} "
+          f"(variant={state.variant}, state={state.state()})")
+    if state.open_at:
+        print(f"[fixture] Flips to 신청 at {datetime.fromtimestamp(state.open_at).isoformat(timespec='seconds')} (server clock)")
+    print(f"[fixture] Bot: python3 resilient_bot.py --base-url {base}"
+          + (f" --start-at {datetime.fromtimestamp(state.open_at - args.clock_offset).isoformat(timespec='seconds')}" if state.open_at else ""))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(f"[fixture] {json.dumps(state.stats(), ensure_ascii=False)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from field_rules import classify_field
+
+
+# Fill plans keyed by a structural fingerprint of the form (tag/type/name/id/flags,
+# resolved label and placeholder of every control, option values and texts,
+# radio/checkbox values, form name/method/action path) - every input the planner reads.
+# A hit lets heuristic_fill_form skip the full snapshot and classification and apply
+# the stored ops directly; any structural change gives a new fingerprint (a miss).
+SCHEMA_CACHE_FILE = os.path.join(".cache", "form_schemas.json")
+
+STRUCTURE_JS = r"""
+var form = arguments[0];
+var els = form.querySelectorAll('input, select, textarea');
+// Same text and label resolution as SNAPSHOT_FORM_JS, whitespace collapsed
+function txt(n) { return n ? (n.innerText || n.textContent || '').replace(/\s+/g, ' ').trim() : ''; }
+function labelOf(el) {
+  try {
+    if (el.id) {
+      var l = document.querySelector('label[for="' + CSS.escape(el.id) + '"]');
+      if (l) { return txt(l); }
+    }
+  } catch (e) {}
+  try {
+    var r = document.evaluate('ancestor-or-self::*[1]/preceding::label[1]', el, null,
+                              XPathResult.FIRST_ORDERED_NODE_TYPE, null);
+    return txt(r.singleNodeValue);
+  } catch (e) { return ''; }
+}
+var out = [];
+for (var i = 0; i < els.length; i++) {
+  var el = els[i], tag = el.tagName.toLowerCase();
+  var type = (el.getAttribute('type') || (el.tagName === 'TEXTAREA' ? 'textarea' : '')).toLowerCase();
+  var sig = [tag, type, el.getAttribute('name') || '', el.getAttribute('id') || '',
+             el.hasAttribute('required') ? 1 : 0, el.hasAttribute('readonly') ? 1 : 0,
+             el.hasAttribute('disabled') ? 1 : 0, labelOf(el),
+             (el.getAttribute('placeholder') || '').replace(/\s+/g, ' ').trim()];
+  if (tag === 'select') {
+    var ov = [], ot = [];
+    for (var j = 0; j < el.options.length; j++) {
+      ov.push(el.options[j].value || '');
+      ot.push(txt(el.options[j]));
+    }
+    sig.push(ov.join(','));
+    sig.push(ot.join(','));
+  } else if (type === 'radio' || type === 'checkbox') {
+    sig.push(el.getAttribute('value') || '');
+  }
+  out.push(sig.join('|'));
+}
+return {
+  form: [form.getAttribute('name') || '', (form.getAttribute('method') || 'get').toLowerCase(),
+         (form.getAttribute('action') || '').split('?')[0]].join('|'),
+  fields: out
+};
+"""
+
+
+def _squash(text: Any) -> str:
+    return " ".join((text or "").split())
+
+
+def structure_from_fields(form: Dict[str, Any], fields: List[dict]) -> Dict[str, Any]:
+    """STRUCTURE_JS's result rebuilt from saved HTML (html_forms) or a snapshot. Option
+    values are option.value on both sides (the text when there is no value attribute)."""
+    out = []
+    for f in fields:
+        sig = [f.get("tag") or "", f.get("type") or "", f.get("name") or "", f.get("id") or "",
+               "1" if f.get("required") else "0", "1" if f.get("readonly") else "0",
+               "1" if f.get("disabled") else "0", _squash(f.get("label")), _squash(f.get("placeholder"))]
+        if f.get("tag") == "select":
+            sig.append(",".join(o.get("value") or "" for o in f.get("options") or []))
+            sig.append(",".join(_squash(o.get("text")) for o in f.get("options") or []))
+        elif f.get("type") in ("radio", "checkbox"):
+            sig.append(f.get("value") or "")
+        out.append("|".join(sig))
+    return {
+        "form": "|".join([form.get("name") or "", (form.get("method") or "get").lower(),
+                          (form.get("action") or "").split("?")[0]]),
+        "fields": out,
+    }
+
+
+def fingerprint(structure: Dict[str, Any]) -> str:
+    h = hashlib.sha1()
+    h.update((structure.get("form") or "").encode("utf-8"))
+    for sig in structure.get("fields") or []:
+        h.update(b"\n")
+        h.update(sig.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def form_fingerprint(driver, form) -> Optional[str]:
+    """One script call; None when the structure could not be read."""
+    try:
+        structure = driver.execute_script(STRUCTURE_JS, form)
+    except Exception:
+        return None
+    if not structure or not structure.get("fields"):
+        return None
+    return fingerprint(structure)
+
+
+def data_digest(user_data: Dict[str, Any]) -> str:
+    """Stored ops embed user data values, so entries only match the data they were planned for."""
+    raw = json.dumps(user_data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+# Entries planned by older code embedded the page's prefill state in their ops; ignore them
+PLAN_VERSION = 2
+
+# path -> schemas, read once per process; remember_plan keeps it current
+_SCHEMAS: Dict[str, Dict[str, Any]] = {}
+
+
+def load_schemas(path: str = SCHEMA_CACHE_FILE) -> Dict[str, Any]:
+    if path in _SCHEMAS:
+        return _SCHEMAS[path]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        data = {}
+    _SCHEMAS[path] = data.get("schemas") or {}
+    return _SCHEMAS[path]
+
+
+def lookup_plan(fp: Optional[str], user_data: Dict[str, Any], path: str = SCHEMA_CACHE_FILE) -> Optional[List[dict]]:
+    if not fp:
+        return None
+    entry = load_schemas(path).get(fp)
+    if not entry or entry.get("version") != PLAN_VERSION or entry.get("data") != data_digest(user_data):
+        return None
+    return entry.get("ops") or None
+
+
+def remember_plan(
+    fp: Optional[str],
+    fields: List[dict],
+    ops: List[dict],
+    user_data: Dict[str, Any],
+    path: str = SCHEMA_CACHE_FILE,
+) -> None:
+    """Store the field→role mapping and the ops planned for it (atomic write)."""
+    if not fp or not ops:
+        return
+    roles = {}
+    for f in fields:
+        hits = classify_field(f)
+        if hits:
+            roles[f"{f['index']}:{f.get('name') or f.get('id') or ''}"] = [role for role, _ in hits]
+    schemas = load_schemas(path)
+    schemas[fp] = {
+        "version": PLAN_VERSION,
+        "saved_at": int(time.time()),
+        "data": data_digest(user_data),
+        "fields": len(fields),
+        "roles": roles,
+        "ops": ops,
+    }
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"schemas": schemas}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except Exception:
+        pass
@@ -0,0 +1,329 @@
+import os
+import re
+import sys
+import glob
+import json
+import argparse
+from datetime import datetime, timezone
+from typing import Any, Dict, IO, Iterator, List, Optional
+from urllib.parse import urlsplit, parse_qsl
+
+
+# Offline HAR 1.2 builder + per-phase latency waterfall for the performance-log JSONL
+# written by perf_capture (logs/har_*.jsonl, logs/open_scan_har_*.jsonl, rotated parts
+# included). Input is streamed line by line; only in-flight requests are held in
+# memory and each finished entry is written to the HAR immediately.
+#   python3 har_tool.py logs/har_1755176457.jsonl
+#   python3 har_tool.py 'logs/har_1755176457*.jsonl' --out run.har
+#
+# Phases are decided per document request (URL/method rules below, checked in order)
+# and inherited by every subresource that follows it; requests before the first
+# matching document are "startup".
+PHASE_RULES = [
+    ("login", re.compile(r"/member/login|/robots\.txt", re.I), None),
+    ("submit_to_result", re.compile(r"_ok\.asp|regist_ok|apply_ok|/mypage/", re.I), None),
+    ("submit_to_result", re.compile(r".*"), "POST"),
+    ("click_to_form", re.compile(r"_regist\.asp|[?&](apply=1|mode=apply)", re.I), None),
+    ("watch", re.compile(r"_view\.asp", re.I), None),
+]
+
+
+def phase_for(url: str, method: str) -> Optional[str]:
+    for name, rx, m in PHASE_RULES:
+        if m and m != method.upper():
+            continue
+        if rx.search(url):
+            return name
+    return None
+
+
+def iter_messages(paths: List[str]) -> Iterator[Dict[str, Any]]:
+    """CDP messages ({"method", "params"}) from JSONL files, one line at a time."""
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except Exception:
+                    continue
+                msg = rec.get("message") if isinstance(rec.get("message"), dict) else rec
+                if isinstance(msg, dict) and msg.get("method"):
+                    yield msg
+
+
+def _headers(h: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+    return [{"name": k, "value": str(v)} for k, v in (h or {}).items()]
+
+
+def _iso(wall: Optional[float]) -> str:
+    if not wall:
+        return "1970-01-01T00:00:00.000Z"
+    return datetime.fromtimestamp(wall, tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _span(t: Dict[str, float], a: str, b: str) -> float:
+    s, e = t.get(a, -1), t.get(b, -1)
+    return round(e - s, 3) if s is not None and s >= 0 and e is not None and e >= 0 else -1
+
+
+def har_timings(timing: Optional[Dict[str, float]], start_ts: float, end_ts: Optional[float]) -> Dict[str, float]:
+    """CDP ResourceTiming (ms offsets from requestTime) -> HAR timings. ssl is part of connect."""
+    total = round(((end_ts or start_ts) - start_ts) * 1000, 3)
+    if not timing:
+        return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0, "wait": max(0.0, total), "receive": 0}
+    # Gap between requestWillBeSent and the timing base
+    queued = max(0.0, (timing.get("requestTime", start_ts) - start_ts) * 1000)
+    first = next((timing[k] for k in ("dnsStart", "connectStart", "sendStart") if timing.get(k, -1) >= 0), 0.0)
+    send = max(0.0, _span(timing, "sendStart", "sendEnd"))
+    wait = max(0.0, _span(timing, "sendEnd", "receiveHeadersEnd"))
+    receive = 0.0
+    if end_ts:
+        receive = max(0.0, (end_ts - timing.get("requestTime", start_ts)) * 1000 - timing.get("receiveHeadersEnd", 0))
+    return {
+        "blocked": round(queued + first, 3),
+        "dns": _span(timing, "dnsStart", "dnsEnd"),
+        "connect": _span(timing, "connectStart", "connectEnd"),
+        "ssl": _span(timing, "sslStart", "sslEnd"),
+        "send": round(send, 3),
+        "wait": round(wait, 3),
+        "receive": round(receive, 3),
+    }
+
+
+class HarBuilder:
+    """Pairs requestWillBeSent/responseReceived/loadingFinished(-Failed) per requestId
+    and hands each finished HAR entry to `sink` right away."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.inflight: Dict[str, Dict[str, Any]] = {}
+        self.phase = "startup"
+        self.count = 0
+
+    def _finish(self, rid: str, end_ts: Optional[float], size: Optional[float] = None, error: Optional[str] = None) -> None:
+        r = self.inflight.pop(rid, None)
+        if r is None:
+            return
+        timings = har_timings(r.get("timing"), r["ts"], end_ts)
+        total = sum(v for k, v in timings.items() if k != "ssl" and v > 0)
+        resp = r.get("response") or {}
+        url = r["url"]
+        entry = {
+            "pageref": r["phase"],
+            "startedDateTime": _iso(r.get("wall")),
+            "time": round(total, 3),
+            "request": {
+                "method": r["method"],
+                "url": url,
+                "httpVersion": resp.get("protocol") or "",
+                "cookies": [],
+                "headers": _headers(r.get("req_headers")),
+                "queryString": [{"name": k, "value": v} for k, v in parse_qsl(urlsplit(url).query, keep_blank_values=True)],
+                "headersSize": -1,
+                "bodySize": len(r.get("post") or ""),
+            },
+            "response": {
+                "status": resp.get("status", 0),
+                "statusText": resp.get("statusText") or (error or ""),
+                "httpVersion": resp.get("protocol") or "",
+                "cookies": [],
+                "headers": _headers(resp.get("headers")),
+                "content": {"size": int(size or 0), "mimeType": resp.get("mimeType") or ""},
+                "redirectURL": (resp.get("headers") or {}).get("location") or (resp.get("headers") or {}).get("Location") or "",
+                "headersSize": -1,
+                "bodySize": int(size) if size is not None else -1,
+            },
+            "cache": {},
+            "timings": timings,
+            "serverIPAddress": resp.get("remoteIPAddress") or "",
+            "_resourceType": r.get("type") or "",
+            "_fromCache": bool(r.get("from_cache")),
+        }
+        if r.get("post"):
+            entry["request"]["postData"] = {"mimeType": (r.get("req_headers") or {}).get("Content-Type", ""), "text": r["post"]}
+        if error:
+            entry["_error"] = error
+        self.count += 1
+        self.sink(entry)
+
+    def feed(self, msg: Dict[str, Any]) -> None:
+        m, p = msg.get("method"), msg.get("params") or {}
+        rid = p.get("requestId")
+        if not rid:
+            return
+        if m == "Network.requestWillBeSent":
+            if rid in self.inflight and p.get("redirectResponse"):
+                # Same requestId continues after a redirect: close the previous hop
+                self.inflight[rid]["response"] = p["redirectResponse"]
+                self.inflight[rid]["timing"] = p["redirectResponse"].get("timing")
+                self._finish(rid, p.get("timestamp"), size=0)
+            req = p.get("request") or {}
+            method = req.get("method") or "GET"
+            if p.get("type") == "Document":
+                self.phase = phase_for(req.get("url") or "", method) or self.phase
+            self.inflight[rid] = {
+                "url": req.get("url") or "",
+                "method": method,
+                "req_headers": req.get("headers"),
+                "post": req.get("postData"),
+                "ts": p.get("timestamp") or 0.0,
+                "wall": p.get("wallTime"),
+                "type": p.get("type"),
+                "phase": self.phase,
+            }
+        elif rid not in self.inflight:
+            return
+        elif m == "Network.requestWillBeSentExtraInfo":
+            self.inflight[rid]["req_headers"] = p.get("headers") or self.inflight[rid].get("req_headers")
+        elif m == "Network.responseReceived":
+            resp = p.get("response") or {}
+            self.inflight[rid]["response"] = resp
+            self.inflight[rid]["timing"] = resp.get("timing")
+        elif m == "Network.requestServedFromCache":
+            self.inflight[rid]["from_cache"] = True
+        elif m == "Network.loadingFinished":
+            self._finish(rid, p.get("timestamp"), size=p.get("encodedDataLength"))
+        elif m == "Network.loadingFailed":
+            self._finish(rid, p.get("timestamp"), error=p.get("errorText") or "failed")
+
+    def close(self) -> None:
+        for rid in list(self.inflight):
+            self._finish(rid, None, error="incomplete")
+
+
+class Waterfall:
+    """Per-phase aggregates of HAR entries: span, bytes, and DNS/connect/TTFB/download."""
+
+    KEYS = ("dns", "connect", "wait", "receive")
+
+    def __init__(self, top: int = 5):
+        self.top = top
+        self.phases: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, e: Dict[str, Any]) -> None:
+        ph = self.phases.setdefault(e["pageref"], {
+            "requests": 0, "failed": 0, "bytes": 0, "first": None, "last": None,
+            "sums": {k: 0.0 for k in self.KEYS}, "values": {k: [] for k in self.KEYS}, "slowest": [],
+        })
+        ph["requests"] += 1
+        ph["failed"] += 1 if e.get("_error") else 0
+        ph["bytes"] += max(0, e["response"]["bodySize"])
+        start = datetime.fromisoformat(e["startedDateTime"].replace("Z", "+00:00")).timestamp() * 1000
+        end = start + e["time"]
+        ph["first"] = start if ph["first"] is None else min(ph["first"], start)
+        ph["last"] = end if ph["last"] is None else max(ph["last"], end)
+        for k in self.KEYS:
+            v = e["timings"].get(k, -1)
+            if v >= 0:
+                ph["sums"][k] += v
+                ph["values"][k].append(v)
+        ph["slowest"].append((e["time"], e["request"]["method"], e["request"]["url"], e["timings"]))
+        ph["slowest"] = sorted(ph["slowest"], key=lambda x: -x[0])[: self.top]
+
+    def pages(self) -> List[Dict[str, Any]]:
+        """One HAR page per phase, so every entry's pageref resolves; started at its first request."""
+        return [
+            {"startedDateTime": _iso(ph["first"] / 1000 if ph["first"] is not None else None),
+             "id": name, "title": name, "pageTimings": {"onContentLoad": -1, "onLoad": -1}}
+            for name, ph in sorted(self.phases.items(), key=lambda kv: kv[1]["first"] or 0)
+        ]
+
+    def report(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name, ph in sorted(self.phases.items(), key=lambda kv: kv[1]["first"] or 0):
+            stats = {}
+            for k in self.KEYS:
+                v = sorted(ph["values"][k])
+                stats[k] = {
+                    "sum_ms": round(ph["sums"][k], 1),
+                    "p50_ms": round(v[len(v) // 2], 1) if v else None,
+                    "max_ms": round(v[-1], 1) if v else None,
+                }
+            out[name] = {
+                "requests": ph["requests"],
+                "failed": ph["failed"],
+                "bytes": ph["bytes"],
+                "span_ms": round((ph["last"] or 0) - (ph["first"] or 0), 1),
+                "dns": stats["dns"], "connect": stats["connect"], "ttfb": stats["wait"], "download": stats["receive"],
+                "slowest": [
+                    {"ms": round(t, 1), "method": m, "url": u,
+                     "dns": tm["dns"], "connect": tm["connect"], "ttfb": tm["wait"], "download": tm["receive"]}
+                    for t, m, u, tm in ph["slowest"]
+                ],
+            }
+        return out
+
+
+def build(paths: List[str], har_out: IO[str], waterfall: Waterfall) -> int:
+    """Stream messages from paths into a HAR 1.2 document written to har_out.
+    Entries are streamed first; the phase pages they reference follow once all are known."""
+    har_out.write('{"log": {"version": "1.2", "creator": {"name": "har_tool", "version": "1.0"}, "entries": [\n')
+    first = [True]
+
+    def sink(entry: Dict[str, Any]) -> None:
+        if not first[0]:
+            har_out.write(",\n")
+        first[0] = False
+        json.dump(entry, har_out, ensure_ascii=False)
+        waterfall.add(entry)
+
+    b = HarBuilder(sink)
+    for msg in iter_messages(paths):
+        b.feed(msg)
+    b.close()
+    har_out.write('\n], "pages": ')
+    json.dump(waterfall.pages(), har_out, ensure_ascii=False)
+    har_out.write("}}\n")
+    return b.count
+
+
+def expand(inputs: List[str]) -> List[str]:
+    """Globs, with rotated parts (x.jsonl, x.1.jsonl, x.2.jsonl, ...) in order."""
+    def part(p: str) -> int:
+        m = re.search(r"\.(\d+)\.jsonl$", p)
+        return int(m.group(1)) if m else 0
+    out: List[str] = []
+    for pattern in inputs:
+        matches = glob.glob(pattern) or ([pattern] if os.path.exists(pattern) else [])
+        out.extend(sorted(matches, key=lambda p: (re.sub(r"\.\d+\.jsonl$", ".jsonl", p), part(p))))
+    return list(dict.fromkeys(out))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("inputs", nargs="+", help="Performance-log JSONL file(s) or globs")
+    parser.add_argument("--out", default=None, help="HAR path (default: <first input>.har)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest requests listed per phase")
+    args = parser.parse_args()
+
+    paths = expand(args.inputs)
+    if not paths:
+        print("[har] No input files")
+        return 1
+    base = re.sub(r"(\.\d+)?\.jsonl$", "", paths[0])
+    har_path = args.out or base + ".har"
+    wf = Waterfall(top=args.top)
+    with open(har_path, "w", encoding="utf-8") as f:
+        n = build(paths, f, wf)
+    report = wf.report()
+    report_path = os.path.splitext(har_path)[0] + ".waterfall.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"inputs": paths, "entries": n, "phases": report}, f, ensure_ascii=False, indent=2)
+
+    print(f"[har] {n} entries from {len(paths)} file(s) -> {har_path}")
+    for name, ph in report.items():
+        print(
+            f"[waterfall] {name:<16} n={ph['requests']:<4} span={ph['span_ms']}ms {ph['bytes'] // 1024}KB "
+            f"dns={ph['dns']['sum_ms']}ms connect={ph['connect']['sum_ms']}ms "
+            f"ttfb p50={ph['ttfb']['p50_ms']}ms max={ph['ttfb']['max_ms']}ms "
+            f"download p50={ph['download']['p50_ms']}ms"
+        )
+    print(f"[har] Wrote {report_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
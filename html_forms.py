@@ -0,0 +1,110 @@
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+
+
+class _FormParser(HTMLParser):
+    """Collect forms and their controls from saved HTML in the same shape that
+    resilient_bot.SNAPSHOT_FORM_JS returns from a live page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms: List[Dict[str, Any]] = []
+        self.labels_for: Dict[str, str] = {}
+        self._form: Optional[Dict[str, Any]] = None
+        self._label_stack: List[List[Any]] = []  # [for_id, text]
+        self._last_label = ""
+        self._select: Optional[Dict[str, Any]] = None
+        self._option: Optional[Dict[str, Any]] = None
+        self._textarea: Optional[Dict[str, Any]] = None
+
+    def handle_starttag(self, tag, attrs):
+        a = {k: (v if v is not None else "") for k, v in attrs}
+        if tag == "form":
+            self._form = {
+                "index": len(self.forms),
+                "name": a.get("name", ""),
+                "id": a.get("id", ""),
+                "action": a.get("action", ""),
+                "method": (a.get("method") or "get").lower(),
+                "enctype": a.get("enctype", ""),
+                "fields": [],
+            }
+            self.forms.append(self._form)
+        elif tag == "label":
+            self._label_stack.append([a.get("for", ""), ""])
+        elif tag in ("input", "select", "textarea") and self._form is not None:
+            itype = a.get("type") or ("textarea" if tag == "textarea" else "")
+            field = {
+                "index": len(self._form["fields"]),
+                "tag": tag,
+                "type": itype.lower(),
+                "name": a.get("name", ""),
+                "id": a.get("id", ""),
+                "placeholder": a.get("placeholder", ""),
+                "label": self._last_label,
+                "required": "required" in a,
+                "readonly": "readonly" in a,
+                "disabled": "disabled" in a,
+                "value": a.get("value", ""),
+                "checked": "checked" in a,
+                "options": [],
+            }
+            self._form["fields"].append(field)
+            if tag == "select":
+                self._select = field
+            elif tag == "textarea":
+                self._textarea = field
+        elif tag == "option" and self._select is not None:
+            # No value attribute: filled from the text in forms_from_html, like option.value
+            self._option = {"text": "", "value": a.get("value") if "value" in a else None}
+            self._select["options"].append(self._option)
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._form = None
+        elif tag == "label" and self._label_stack:
+            for_id, text = self._label_stack.pop()
+            text = " ".join(text.split())
+            if for_id and for_id not in self.labels_for:
+                self.labels_for[for_id] = text
+            self._last_label = text
+        elif tag == "select":
+            self._select = None
+        elif tag == "option":
+            self._option = None
+        elif tag == "textarea":
+            self._textarea = None
+
+    def handle_data(self, data):
+        for lbl in self._label_stack:
+            lbl[1] += data
+        if self._option is not None:
+            self._option["text"] += data
+        if self._textarea is not None:
+            self._textarea["value"] += data
+
+
+def forms_from_html(html: str) -> List[Dict[str, Any]]:
+    """Parse every <form> in html. Labels resolve like the live snapshot:
+    label[for=id] first, otherwise the closest preceding label. An option without a
+    value attribute takes its text, as option.value does in the browser."""
+    p = _FormParser()
+    try:
+        p.feed(html)
+        p.close()
+    except Exception:
+        pass
+    for form in p.forms:
+        for f in form["fields"]:
+            if f["id"] and f["id"] in p.labels_for:
+                f["label"] = p.labels_for[f["id"]]
+            for o in f["options"]:
+                o["text"] = " ".join(o["text"].split())
+                if o["value"] is None:
+                    o["value"] = o["text"]
+    return p.forms
+
+
+def forms_from_file(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return forms_from_html(f.read())
@@ -0,0 +1,148 @@
+import re
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+
+# The view page renders its status inside <div class="btn-grp">…</div>, e.g.
+#   <span >신청예정</span> <a href="Appchild.asp" class="blue line">목록</a>
+# Menus elsewhere on the page also contain '신청', so only this block is inspected.
+BTN_GRP_RE = re.compile(r"<div[^>]*class=[\"'][^\"']*\bbtn-grp\b[^\"']*[\"'][^>]*>(.*?)</div>", re.S | re.I)
+CONTROL_RE = re.compile(r"<(a|button|span)\b([^>]*)>(.*?)</\1>", re.S | re.I)
+INPUT_RE = re.compile(r"<input\b([^>]*)>", re.S | re.I)
+ATTR_RE = re.compile(r"([\w-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))", re.S)
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _attrs(raw: str) -> Dict[str, str]:
+    return {m.group(1).lower(): (m.group(2) or m.group(3) or m.group(4) or "") for m in ATTR_RE.finditer(raw)}
+
+
+def _text(raw: str) -> str:
+    return " ".join(TAG_RE.sub("", raw).split())
+
+
+def parse_apply_state(html: str) -> Dict[str, Any]:
+    """Classify the btn-grp status block of a view page.
+
+    state: "open" (a real 신청 control), "pending" (신청예정), "closed" (마감),
+    or "unknown" (no btn-grp, e.g. redirected to login).
+    """
+    out: Dict[str, Any] = {"state": "unknown", "text": "", "href": None, "onclick": None}
+    blocks = BTN_GRP_RE.findall(html or "")
+    if not blocks:
+        return out
+    block = " ".join(blocks)
+    out["text"] = _text(block)[:120]
+    for tag, raw_attrs, inner in CONTROL_RE.findall(block):
+        txt = _text(inner)
+        if "신청" not in txt or "예정" in txt:
+            continue
+        tag = tag.lower()
+        if tag == "span" and txt != "신청":
+            continue
+        a = _attrs(raw_attrs)
+        out.update(state="open", href=a.get("href"), onclick=a.get("onclick"))
+        return out
+    for raw_attrs in INPUT_RE.findall(block):
+        a = _attrs(raw_attrs)
+        if a.get("type", "").lower() in ("button", "submit") and "신청" in a.get("value", "") and "예정" not in a.get("value", ""):
+            out.update(state="open", onclick=a.get("onclick"))
+            return out
+    if "예정" in out["text"]:
+        out["state"] = "pending"
+    elif "마감" in out["text"]:
+        out["state"] = "closed"
+    return out
+
+
+def session_from_driver(driver, sess: Optional[requests.Session] = None) -> requests.Session:
+    """Copy the browser's cookies (and User-Agent) into a requests.Session."""
+    sess = sess or requests.Session()
+    for c in driver.get_cookies():
+        sess.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+    try:
+        ua = driver.execute_script("return navigator.userAgent")
+        if ua:
+            sess.headers["User-Agent"] = ua
+    except Exception:
+        pass
+    return sess
+
+
+BTN_GRP_MARK = b"btn-grp"
+DIV_CLOSE = b"</div>"
+
+
+def poll_apply_state(
+    sess: requests.Session,
+    url: str,
+    timeout: float = 10,
+    validators: Optional[Dict[str, Any]] = None,
+    partial: bool = True,
+    chunk_size: int = 4096,
+) -> Dict[str, Any]:
+    """Fetch the view page over HTTP and parse its status block.
+
+    validators: per-URL dict kept by the caller between polls. It stores the last
+    ETag/Last-Modified (sent back as If-None-Match/If-Modified-Since) and the last
+    result, which is reused on 304 Not Modified.
+    partial: stream the body and stop reading once the btn-grp block has closed.
+    Closing early drops the keep-alive connection, so the next poll reconnects.
+    """
+    t0 = time.perf_counter()
+    headers: Dict[str, str] = {}
+    if validators is not None:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    sent_at = time.time()
+    r = sess.get(url, allow_redirects=True, timeout=timeout, headers=headers, stream=True)
+    recv_at = time.time()
+    buf = b""
+    truncated = False
+    decision_ms = None
+    try:
+        if r.status_code == 304 and validators is not None and validators.get("last"):
+            res = dict(validators["last"])
+            res["not_modified"] = True
+            decision_ms = round((time.perf_counter() - t0) * 1000, 1)
+        else:
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                buf += chunk
+                if partial:
+                    i = buf.find(BTN_GRP_MARK)
+                    if i >= 0 and buf.find(DIV_CLOSE, i) >= 0:
+                        truncated = True
+                        break
+            # requests guesses ISO-8859-1 when the header has no charset; the site is UTF-8
+            ctype = (r.headers.get("Content-Type") or "").lower()
+            enc = r.encoding if (r.encoding and "charset" in ctype) else "utf-8"
+            res = parse_apply_state(buf.decode(enc, errors="replace"))
+            res["not_modified"] = False
+            decision_ms = round((time.perf_counter() - t0) * 1000, 1)
+    finally:
+        r.close()
+
+    if validators is not None and r.status_code == 200:
+        validators["etag"] = r.headers.get("ETag")
+        validators["last_modified"] = r.headers.get("Last-Modified")
+        validators["last"] = {k: res[k] for k in ("state", "text", "href", "onclick")}
+    res.update(
+        status=r.status_code,
+        final_url=r.url,
+        bytes=len(buf),
+        truncated=truncated,
+        decision_ms=decision_ms,
+        elapsed_ms=round((time.perf_counter() - t0) * 1000, 1),
+        logged_out="login.asp" in (r.url or "").lower(),
+        rate_limited=(r.status_code == 429),
+        date=r.headers.get("Date"),
+        sent_at=sent_at,
+        recv_at=recv_at,
+    )
+    return res
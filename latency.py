@@ -0,0 +1,170 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# Span timing for the apply path, anchored on the moment the page first shows '신청'
+# (mark("flip")) and ending at the submission result alert (mark("result")).
+# Spans before the flip (idle detection ticks, keepalive refreshes) are only
+# aggregated per stage; spans after it are kept in order with their offsets from the
+# flip, which is the breakdown that explains the end-to-end number.
+#   logs/latency_<epoch>.json   one run
+#   logs/latency_summary.json   percentiles across runs (python3 latency.py)
+def _pct(v: List[float], q: float) -> Optional[float]:
+    if not v:
+        return None
+    v = sorted(v)
+    return round(v[min(len(v) - 1, int(len(v) * q))], 1)
+
+
+class RunSpans:
+    def __init__(self):
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.t0_ns = time.monotonic_ns()
+        self.marks: Dict[str, float] = {}
+        self.spans: List[Dict[str, Any]] = []
+        self.idle: Dict[str, Dict[str, float]] = {}
+
+    def _ms(self, ns: int) -> float:
+        return (ns - self.t0_ns) / 1e6
+
+    def mark(self, name: str) -> bool:
+        """First occurrence only; returns True when this call set it."""
+        if name in self.marks:
+            return False
+        self.marks[name] = round(self._ms(time.monotonic_ns()), 3)
+        return True
+
+    @contextmanager
+    def span(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """Times the block; the yielded dict can take extra fields (e.g. a result)."""
+        rec: Dict[str, Any] = dict(fields)
+        t = time.monotonic_ns()
+        ok = True
+        try:
+            yield rec
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            dur = (time.monotonic_ns() - t) / 1e6
+            flip = self.marks.get("flip")
+            if flip is None:
+                agg = self.idle.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                agg["count"] += 1
+                agg["total_ms"] += dur
+                agg["max_ms"] = max(agg["max_ms"], dur)
+            else:
+                rec.update({
+                    "name": name,
+                    "at_ms": round(self._ms(t) - flip, 3),
+                    "dur_ms": round(dur, 3),
+                    "ok": ok,
+                })
+                self.spans.append(rec)
+
+    def e2e_ms(self) -> Optional[float]:
+        if "flip" in self.marks and "result" in self.marks:
+            return round(self.marks["result"] - self.marks["flip"], 3)
+        return None
+
+    def stages(self) -> Dict[str, Dict[str, float]]:
+        """Post-flip time per stage (a stage may repeat, e.g. a click retried after an alert)."""
+        out: Dict[str, Dict[str, float]] = {}
+        for s in self.spans:
+            agg = out.setdefault(s["name"], {"count": 0, "total_ms": 0.0})
+            agg["count"] += 1
+            agg["total_ms"] = round(agg["total_ms"] + s["dur_ms"], 3)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "marks_ms": self.marks,
+            "e2e_ms": self.e2e_ms(),
+            "stages": self.stages(),
+            "spans": self.spans,
+            "before_flip": {k: {**v, "total_ms": round(v["total_ms"], 3), "max_ms": round(v["max_ms"], 3)}
+                            for k, v in self.idle.items()},
+        }
+
+    def describe(self) -> str:
+        e2e = self.e2e_ms()
+        parts = [f"{k}={v['total_ms']:.0f}ms" + (f"x{v['count']}" if v["count"] > 1 else "")
+                 for k, v in self.stages().items()]
+        return f"e2e={'%.0fms' % e2e if e2e is not None else 'n/a'} " + " ".join(parts)
+
+    def write(self, directory: str = "logs") -> Optional[str]:
+        if "flip" not in self.marks and not self.idle:
+            return None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"latency_{int(time.time())}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            return path
+        except Exception:
+            return None
+
+
+def summarize(paths: List[str]) -> Dict[str, Any]:
+    """p50/p90/p95/max of the end-to-end time and of each stage's per-run total."""
+    e2e: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    runs = 0
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                run = json.load(f)
+        except Exception:
+            continue
+        if "flip" not in (run.get("marks_ms") or {}):
+            continue
+        runs += 1
+        if run.get("e2e_ms") is not None:
+            e2e.append(run["e2e_ms"])
+        for name, agg in (run.get("stages") or {}).items():
+            stages.setdefault(name, []).append(agg["total_ms"])
+
+    def pct(v: List[float]) -> Dict[str, Any]:
+        return {"runs": len(v), "p50_ms": _pct(v, 0.5), "p90_ms": _pct(v, 0.9),
+                "p95_ms": _pct(v, 0.95), "max_ms": _pct(v, 1.0)}
+
+    return {
+        "runs": runs,
+        "e2e": pct(e2e),
+        "stages": {k: pct(v) for k, v in sorted(stages.items(), key=lambda kv: -(_pct(kv[1], 0.5) or 0))},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--glob", default="logs/latency_[0-9]*.json", help="Per-run latency files")
+    parser.add_argument("--out", default=os.path.join("logs", "latency_summary.json"))
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.glob))
+    summary = summarize(paths)
+    if not summary["runs"]:
+        print(f"[latency] No runs with a '신청' flip in {len(paths)} file(s)")
+        return 1
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    e = summary["e2e"]
+    print(f"[latency] {summary['runs']} run(s); flip→result p50={e['p50_ms']}ms p90={e['p90_ms']}ms "
+          f"p95={e['p95_ms']}ms max={e['max_ms']}ms (n={e['runs']})")
+    for name, s in summary["stages"].items():
+        print(f"[latency] {name:<28} p50={s['p50_ms']}ms p90={s['p90_ms']}ms p95={s['p95_ms']}ms max={s['max_ms']}ms")
+    print(f"[latency] Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import time
+from typing import Any, Dict, List, Optional
+
+
+# Readiness predicates for drivers running with pageLoadStrategy "eager"/"none".
+# driver.get/refresh then return early, and each navigation waits only for the part
+# of the page the next step actually reads. Every predicate also accepts a fully
+# loaded document, so a page without the expected block costs no more than before.
+#
+# The previous document is marked before navigating so a predicate evaluated before
+# the new document commits (likely with "none") cannot match the old page.
+MARK_JS = "window.__navPending__ = true;"
+
+_CLOSED = "function(el){ return !!el && (!!el.nextSibling || document.readyState !== 'loading'); }"
+
+READY_JS: Dict[str, str] = {
+    # View page: status block (신청예정/신청 + 목록) fully parsed, or the login form after a redirect
+    "view": f"var closed = {_CLOSED};"
+            "return closed(document.querySelector('div.btn-grp')) || !!document.querySelector('input[name=userid]');",
+    # Any form fully parsed (fields after the opening tag are present)
+    "form": f"var closed = {_CLOSED};"
+            "var fs = document.forms; for (var i = 0; i < fs.length; i++) { if (closed(fs[i])) return true; }"
+            "return false;",
+    # MyPage: application table with at least one row
+    "mypage": f"var closed = {_CLOSED};"
+              "var t = document.querySelector('table tbody tr') && document.querySelector('table');"
+              "return closed(t);",
+    # Anything parsed (DOMContentLoaded)
+    "dom": "return document.readyState !== 'loading';",
+    # Load event only (e.g. before reading navigation timing)
+    "load": "return false;",
+}
+
+
+def _ready_script(ready: str) -> str:
+    body = READY_JS.get(ready, READY_JS["dom"])
+    return (
+        "if (window.__navPending__) return false;"
+        "if (document.readyState === 'complete') return true;"
+        f"return (function(){{ {body} }})();"
+    )
+
+
+class NavTimings:
+    """Per navigation-type timings (ms) with a coarse histogram, to compare page-load strategies."""
+
+    BUCKETS_MS = [50, 100, 200, 500, 1000, 2000, 5000]
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.timeouts: Dict[str, int] = {}
+
+    def record(self, kind: str, ms: float, ok: bool = True) -> None:
+        self.samples.setdefault(kind, []).append(ms)
+        if not ok:
+            self.timeouts[kind] = self.timeouts.get(kind, 0) + 1
+
+    def histogram(self, kind: str) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for ms in self.samples.get(kind, []):
+            label = next((f"<{b}" for b in self.BUCKETS_MS if ms < b), f">={self.BUCKETS_MS[-1]}")
+            out[label] = out.get(label, 0) + 1
+        return out
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for kind, vals in self.samples.items():
+            v = sorted(vals)
+            out[kind] = {
+                "count": len(v),
+                "p50_ms": round(v[len(v) // 2], 1),
+                "p95_ms": round(v[min(len(v) - 1, int(len(v) * 0.95))], 1),
+                "max_ms": round(v[-1], 1),
+                "timeouts": self.timeouts.get(kind, 0),
+                "histogram": self.histogram(kind),
+            }
+        return out
+
+    def describe(self) -> str:
+        return "; ".join(
+            f"{k}: n={s['count']} p50={s['p50_ms']}ms p95={s['p95_ms']}ms max={s['max_ms']}ms"
+            f" {' '.join(f'{b}:{n}' for b, n in s['histogram'].items())}"
+            for k, s in sorted(self.stats().items())
+        )
+
+
+def wait_ready(driver, ready: str = "dom", timeout: float = 15, poll: float = 0.05) -> str:
+    """Poll a readiness predicate. Returns "ready", "alert" (left open for the caller) or "timeout"."""
+    script = _ready_script(ready)
+    end = time.monotonic() + timeout
+    while True:
+        # An open alert would be dismissed by execute_script, so look for it first
+        try:
+            driver.switch_to.alert
+            return "alert"
+        except Exception:
+            pass
+        try:
+            if driver.execute_script(script):
+                return "ready"
+        except Exception as e:
+            if "invalid session id" in str(e).lower() or "disconnected" in str(e).lower():
+                raise
+        if time.monotonic() >= end:
+            return "timeout"
+        time.sleep(poll)
+
+
+def navigate(
+    driver,
+    url: Optional[str],
+    ready: str = "dom",
+    kind: Optional[str] = None,
+    timings: Optional[NavTimings] = None,
+    timeout: float = 15,
+) -> str:
+    """driver.get(url) (or refresh when url is None), then wait for `ready`. Records the
+    time under `kind` (default: the predicate name) and returns wait_ready()'s result."""
+    try:
+        driver.execute_script(MARK_JS)
+    except Exception:
+        pass
+    t0 = time.perf_counter()
+    if url is None:
+        driver.refresh()
+    else:
+        driver.get(url)
+    result = wait_ready(driver, ready, timeout=timeout)
+    if timings is not None:
+        timings.record(kind or ready, (time.perf_counter() - t0) * 1000, ok=result != "timeout")
+    return result
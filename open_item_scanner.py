@@ -1,16 +1,20 @@
 import os
 import time
-import shutil
 import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+from core import (
+    build_driver,
+    ensure_login,
+    enumerate_forms,
+    wait_alert_and_accept,
+    first_visible,
+)
+from session_store import login_with_store
+from perf_capture import PerfCapture
 
 
 BASE = "https://www.sahascc.or.kr"
@@ -35,107 +39,17 @@ LISTING_URLS = [
 ]
 
 
-def build_driver() -> webdriver.Chrome:
-    opts = Options()
-    opts.add_argument("--headless=new")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--window-size=1400,900")
-    opts.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
-    )
-    # Perf logs for HAR-like capture
-    try:
-        opts.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
-    except Exception:
-        pass
-    chromedriver_path = shutil.which("chromedriver") or "/usr/bin/chromedriver"
-    if chromedriver_path and os.path.exists(chromedriver_path):
-        service = Service(chromedriver_path)
-        return webdriver.Chrome(service=service, options=opts)
-    return webdriver.Chrome(options=opts)
-
-
-def wait_alert_and_accept(driver, timeout=2) -> Optional[str]:
-    try:
-        WebDriverWait(driver, timeout).until(EC.alert_is_present())
-        a = driver.switch_to.alert
-        txt = a.text
-        a.accept()
-        return txt
-    except Exception:
-        return None
-
-
-def ensure_login(driver, timeout=20) -> None:
-    driver.get(LOGIN_URL)
-    WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.NAME, "userid")))
-    driver.find_element(By.NAME, "userid").clear()
-    driver.find_element(By.NAME, "userid").send_keys(USERNAME)
-    driver.find_element(By.NAME, "Pass").clear()
-    driver.find_element(By.NAME, "Pass").send_keys(PASSWORD)
-    submits = driver.find_elements(By.XPATH, "//input[@type='submit']")
-    (submits[1] if len(submits) >= 2 else submits[0]).click()
-    wait_alert_and_accept(driver, timeout=5)
-    WebDriverWait(driver, timeout).until(EC.url_changes(LOGIN_URL))
-
-
-def enumerate_forms(driver) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    forms = driver.find_elements(By.TAG_NAME, "form")
-    for idx, form in enumerate(forms):
-        fm: Dict[str, Any] = {
-            "index": idx,
-            "action": form.get_attribute("action"),
-            "method": form.get_attribute("method"),
-            "inputs": [],
-            "buttons": [],
-        }
-        inputs = form.find_elements(By.XPATH, ".//input | .//select | .//textarea")
-        for inp in inputs:
-            fm["inputs"].append({
-                "tag": inp.tag_name,
-                "type": inp.get_attribute("type"),
-                "name": inp.get_attribute("name"),
-                "id": inp.get_attribute("id"),
-                "placeholder": inp.get_attribute("placeholder"),
-                "required": bool(inp.get_attribute("required")),
-            })
-        buttons = form.find_elements(By.XPATH, ".//button | .//input[@type='submit'] | .//input[@type='button']")
-        for b in buttons:
-            fm["buttons"].append({
-                "tag": b.tag_name,
-                "type": b.get_attribute("type"),
-                "name": b.get_attribute("name"),
-                "text": b.text or b.get_attribute("value"),
-            })
-        out.append(fm)
-    return out
-
-
-def dump_perf(driver, prefix: str) -> Optional[str]:
-    os.makedirs("logs", exist_ok=True)
-    ts = int(time.time())
-    path = f"logs/{prefix}_{ts}.jsonl"
-    try:
-        entries = driver.get_log("performance")
-    except Exception:
-        entries = []
-    if not entries:
-        return None
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            for e in entries:
-                try:
-                    msg = json.loads(e.get("message", "{}"))
-                except Exception:
-                    msg = {"raw": e.get("message")}
-                json.dump(msg, f, ensure_ascii=False)
-                f.write("\n")
-        return path
-    except Exception:
-        return None
+# Direct '신청' controls on a listing or detail page, in priority order
+CAPTURE_XPATHS = [
+    # Strict inside btn-grp
+    "//div[contains(@class,'btn-grp')]//a[normalize-space(.)='신청']",
+    "//div[contains(@class,'btn-grp')]//button[normalize-space(.)='신청']",
+    "//div[contains(@class,'btn-grp')]//input[( @type='button' or @type='submit') and contains(@value,'신청')]",
+    # Broader variants anywhere
+    "//a[contains(normalize-space(.), '신청하기') or normalize-space(.)='신청' or contains(normalize-space(.),'예약') or contains(normalize-space(.),'접수')]",
+    "//button[contains(normalize-space(.), '신청하기') or normalize-space(.)='신청' or contains(normalize-space(.),'예약') or contains(normalize-space(.),'접수')]",
+    "//input[( @type='button' or @type='submit') and (contains(@value,'신청') or contains(@value,'예약') or contains(@value,'접수'))]",
+]
 
 
 def scan_and_probe(driver) -> Dict[str, Any]:
@@ -150,30 +64,20 @@ def scan_and_probe(driver) -> Dict[str, Any]:
         "forms": [],
         "artifacts": {},
     }
+    # Network events drained after every page so the bounded Chrome buffer never overflows
+    perf = PerfCapture(prefix="open_scan_har")
+
     def try_capture_from_current(summary: Dict[str, Any]) -> bool:
         # Try direct '신청' controls on the current page (listing or detail)
-        xps = [
-            # Strict inside btn-grp
-            "//div[contains(@class,'btn-grp')]//a[normalize-space(.)='신청']",
-            "//div[contains(@class,'btn-grp')]//button[normalize-space(.)='신청']",
-            "//div[contains(@class,'btn-grp')]//input[( @type='button' or @type='submit') and contains(@value,'신청')]",
-            # Broader variants anywhere
-            "//a[contains(normalize-space(.), '신청하기') or normalize-space(.)='신청' or contains(normalize-space(.),'예약') or contains(normalize-space(.),'접수')]",
-            "//button[contains(normalize-space(.), '신청하기') or normalize-space(.)='신청' or contains(normalize-space(.),'예약') or contains(normalize-space(.),'접수')]",
-            "//input[( @type='button' or @type='submit') and (contains(@value,'신청') or contains(@value,'예약') or contains(@value,'접수'))]",
-        ]
-        controls = []
-        for xp in xps:
-            controls.extend(driver.find_elements(By.XPATH, xp))
-        controls = [c for c in controls if c.is_displayed()]
-        if not controls:
+        hit = first_visible(driver, CAPTURE_XPATHS)
+        if not hit:
             return False
 
-        ctl = controls[0]
+        ctl = hit["el"]
         summary["found"] = True
-        summary["apply_html"] = ctl.get_attribute("outerHTML")
-        summary["apply_href"] = ctl.get_attribute("href")
-        summary["apply_onclick"] = ctl.get_attribute("onclick")
+        summary["apply_html"] = hit["outer_html"]
+        summary["apply_href"] = hit["href"]
+        summary["apply_onclick"] = hit["onclick"]
 
         pre_handles = driver.window_handles[:]
         try:
@@ -224,9 +128,7 @@ def scan_and_probe(driver) -> Dict[str, Any]:
             summary["artifacts"]["html"] = base + ".html"
         except Exception:
             pass
-        p = dump_perf(driver, prefix="open_scan_har")
-        if p:
-            summary["artifacts"]["har"] = p
+        perf.drain(driver)
         return True
 
     def collect_detail_links(max_links: int = 60) -> List[str]:
@@ -264,24 +166,32 @@ def scan_and_probe(driver) -> Dict[str, Any]:
         return list(hrefs)
 
     attempted_details: List[str] = []
-    for url in LISTING_URLS:
-        driver.get(url)
-        time.sleep(0.5)
-        # First try direct control on listing page
-        summary["listing_url"] = url
-        if try_capture_from_current(summary):
-            break
-
-        # If not found, navigate into detail pages we can discover
-        detail_links = collect_detail_links(max_links=30)
-        for href in detail_links:
-            driver.get(href)
-            attempted_details.append(href)
-            time.sleep(0.3)
+    try:
+        for url in LISTING_URLS:
+            driver.get(url)
+            time.sleep(0.5)
+            perf.drain(driver)
+            # First try direct control on listing page
+            summary["listing_url"] = url
             if try_capture_from_current(summary):
                 break
-        if summary["found"]:
-            break
+
+            # If not found, navigate into detail pages we can discover
+            detail_links = collect_detail_links(max_links=30)
+            for href in detail_links:
+                driver.get(href)
+                attempted_details.append(href)
+                time.sleep(0.3)
+                perf.drain(driver)
+                if try_capture_from_current(summary):
+                    break
+            if summary["found"]:
+                break
+    finally:
+        files = perf.close()
+        # One path as before; rotated parts (.1.jsonl, ...) sit next to it for har_tool
+        if summary["found"] and files:
+            summary["artifacts"]["har"] = files[0]
     summary["attempted_details"] = attempted_details
     summary["tried_detail_count"] = len(attempted_details)
     return summary
@@ -290,7 +200,7 @@ def scan_and_probe(driver) -> Dict[str, Any]:
 def main():
     driver = build_driver()
     try:
-        ensure_login(driver)
+        login_with_store(driver, lambda: ensure_login(driver, USERNAME, PASSWORD, login_url=LOGIN_URL), BASE)
         result = scan_and_probe(driver)
         print(json.dumps(result, ensure_ascii=False, indent=2))
     finally:
@@ -0,0 +1,105 @@
+import os
+import json
+import time
+from typing import List, Optional
+
+
+# Incremental capture of Chrome's performance log (goog:loggingPrefs performance=ALL).
+# Chrome keeps a bounded buffer, so draining only once at the end loses early entries;
+# drain() is called at idle points instead (scheduler job, after navigations) and
+# streams the Network.* events needed for HAR to a JSONL file that rotates by size:
+#   logs/<prefix>_<epoch>.jsonl, logs/<prefix>_<epoch>.1.jsonl, ...
+# Each line keeps the raw log shape ({"message": {"method", "params"}, "webview"})
+# plus the entry's wall-clock "timestamp" (ms), so old end-of-run dumps and these read the same.
+HAR_METHODS = frozenset([
+    "Network.requestWillBeSent",
+    "Network.requestWillBeSentExtraInfo",
+    "Network.responseReceived",
+    "Network.responseReceivedExtraInfo",
+    "Network.loadingFinished",
+    "Network.loadingFailed",
+    "Network.requestServedFromCache",
+])
+
+
+def _method_of(raw: str) -> Optional[str]:
+    """Pull "method" out of the raw JSON without decoding the whole message."""
+    i = raw.find('"method":"')
+    if i < 0:
+        return None
+    i += len('"method":"')
+    j = raw.find('"', i)
+    return raw[i:j] if j > i else None
+
+
+class PerfCapture:
+    def __init__(
+        self,
+        prefix: str = "har",
+        directory: str = "logs",
+        max_bytes: int = 20 * 1024 * 1024,
+        methods: frozenset = HAR_METHODS,
+    ):
+        self.base = os.path.join(directory, f"{prefix}_{int(time.time())}")
+        self.max_bytes = max_bytes
+        self.methods = methods
+        self.files: List[str] = []
+        self.seen = 0
+        self.kept = 0
+        self.drains = 0
+        self.drain_ms = 0.0
+        self._f = None
+        self._size = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _open_next(self) -> None:
+        if self._f is not None:
+            self._f.close()
+        n = len(self.files)
+        path = f"{self.base}.jsonl" if n == 0 else f"{self.base}.{n}.jsonl"
+        self._f = open(path, "a", encoding="utf-8")
+        self._size = 0
+        self.files.append(path)
+
+    def drain(self, driver) -> int:
+        """Fetch and write whatever Chrome buffered since the last drain. Returns entries kept."""
+        t0 = time.perf_counter()
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            entries = []
+        kept = 0
+        for e in entries:
+            self.seen += 1
+            raw = e.get("message") or ""
+            if _method_of(raw) not in self.methods:
+                continue
+            try:
+                msg = json.loads(raw)
+            except Exception:
+                continue
+            msg["timestamp"] = e.get("timestamp")
+            line = json.dumps(msg, ensure_ascii=False) + "\n"
+            if self._f is None or self._size + len(line) > self.max_bytes:
+                self._open_next()
+            self._f.write(line)
+            self._size += len(line)
+            kept += 1
+        if self._f is not None:
+            self._f.flush()
+        self.kept += kept
+        self.drains += 1
+        self.drain_ms += (time.perf_counter() - t0) * 1000
+        return kept
+
+    def close(self) -> List[str]:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        return self.files
+
+    def describe(self) -> str:
+        return (
+            f"{self.kept}/{self.seen} entries kept in {len(self.files)} file(s), "
+            f"{self.drains} drains, {self.drain_ms:.0f}ms total"
+        )
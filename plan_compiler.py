@@ -0,0 +1,220 @@
+import os
+import re
+import sys
+import glob
+import json
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, parse_qs
+
+from html_forms import forms_from_html
+from field_rules import classify_field, control_kind
+from form_cache import fingerprint, structure_from_fields
+
+
+# Compiles preflight artifacts (logs/preflight_map_*.json + the HTML it saved, plus any
+# other saved pages such as logs/open_scan_*.html) into a submission plan that
+# resilient_bot loads at startup: which form, where it posts, its fields/roles, the
+# consent controls and the submit function, so open time only fills and submits.
+#   python3 plan_compiler.py
+#   python3 plan_compiler.py --html 'logs/open_scan_*.html' --page-url https://www.sahascc.or.kr/parent/
+PLAN_FILE = os.path.join("logs", "submission_plan.json")
+
+JS_HREF_RE = re.compile(r"""href\s*=\s*["']javascript:\s*([A-Za-z_$][\w$]*)\s*\(""", re.I)
+
+
+def latest_map(pattern: str = "logs/preflight_map_*.json") -> Optional[str]:
+    files = glob.glob(pattern)
+    return max(files, key=os.path.getmtime) if files else None
+
+
+def submit_function(html: str, form_name: str) -> Optional[str]:
+    """javascript: anchor function that submits this form (e.g. checkIt), if any."""
+    for fn in dict.fromkeys(JS_HREF_RE.findall(html)):
+        m = re.search(r"function\s+" + re.escape(fn) + r"\s*\(", html)
+        if not m:
+            continue
+        body = html[m.end():m.end() + 4000]
+        nxt = re.search(r"\n\s*function\s", body)
+        body = body[:nxt.start()] if nxt else body
+        if (form_name and f"document.{form_name}.submit" in body) or ".submit()" in body:
+            return fn
+    return None
+
+
+def form_sn(form: Dict[str, Any]) -> Optional[str]:
+    """The program the form applies to (its hidden lecture_sn/sn), if it says."""
+    for f in form["fields"]:
+        if f["type"] == "hidden" and (f.get("name") or "").lower() in ("lecture_sn", "sn") and f.get("value"):
+            return str(f["value"])
+    return None
+
+
+def url_sn(url: Optional[str]) -> Optional[str]:
+    qs = parse_qs(urlsplit(url or "").query)
+    return (qs.get("sn") or qs.get("SN") or [None])[0]
+
+
+def apply_url_for(form: Dict[str, Any], page: Dict[str, Any], sn: Optional[str]) -> Tuple[Optional[str], bool]:
+    """(page to open for this form, checked). A preflight-fetched page whose sn matches is
+    checked; otherwise the *_regist.asp?sn= page derived from the form's action, unchecked."""
+    page_url = page.get("page_url")
+    if page.get("map_path") and page_url and url_sn(page_url) == sn:
+        return page_url, True
+    action = urlsplit(form.get("action") or "").path
+    regist = re.sub(r"(?i)_ok(?=\.asp$)", "", action)
+    if page_url and sn and regist.lower().endswith("_regist.asp"):
+        return urljoin(page_url, f"{regist}?sn={sn}"), False
+    return None, False
+
+
+def score_form(form: Dict[str, Any], html: str, sn: Optional[int]) -> Tuple[int, Dict[str, Any]]:
+    action = (form.get("action") or "").lower()
+    roles = {f["index"]: [r for r, _ in classify_field(f)] for f in form["fields"]}
+    consent = [f for f in form["fields"] if "consent" in roles[f["index"]]]
+    score = 0
+    if "search" in action or "search" in (form.get("name") or "").lower():
+        score -= 10
+    if consent:
+        score += 5
+    if any(k in action for k in ("regist", "apply", "_ok", "insert")):
+        score += 3
+    if submit_function(html, form.get("name") or ""):
+        score += 2
+    score += sum(1 for r in roles.values() if r)
+    if sn is not None and any(
+        f["type"] == "hidden" and f.get("value") == str(sn) for f in form["fields"]
+    ):
+        score += 3
+    return score, {"roles": roles, "consent": consent}
+
+
+def compile_plan(
+    pages: List[Dict[str, Any]],
+    sn: Optional[int],
+    base: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """pages: [{"html_path", "page_url", "map_path"}]. Returns the plan for the best-scoring form."""
+    best: Optional[Tuple[int, Dict[str, Any], Dict[str, Any], Dict[str, Any], str]] = None
+    for page in pages:
+        try:
+            with open(page["html_path"], "r", encoding="utf-8", errors="replace") as f:
+                html = f.read()
+        except Exception:
+            continue
+        for form in forms_from_html(html):
+            # A form for another program (e.g. --html pages vs the map's sn) is not this plan
+            if sn is not None and form_sn(form) not in (None, str(sn)):
+                continue
+            score, info = score_form(form, html, sn)
+            if best is None or score > best[0]:
+                best = (score, form, info, page, html)
+    if best is None or best[0] <= 0:
+        return None
+    score, form, info, page, html = best
+    page_url = page.get("page_url") or base
+    fields = form["fields"]
+    plan_sn = form_sn(form) or (str(sn) if sn is not None else None)
+    apply_url, checked = apply_url_for(form, page, plan_sn)
+    plan = {
+        "compiled_at": datetime.now().isoformat(timespec="seconds"),
+        "sn": plan_sn,
+        "score": score,
+        "source": {"html": page["html_path"], "page_url": page.get("page_url"), "map": page.get("map_path")},
+        # Page that renders the form; try_direct_apply tries it first only when checked
+        "apply_url": apply_url,
+        "apply_url_checked": checked,
+        "form": {
+            "name": form.get("name") or "",
+            "id": form.get("id") or "",
+            "action": form.get("action") or "",
+            "action_url": urljoin(page_url, form.get("action") or "") if page_url else None,
+            "method": form.get("method") or "get",
+            "enctype": form.get("enctype") or "",
+            "fingerprint": fingerprint(structure_from_fields(form, fields)),
+        },
+        "hidden": {f["name"]: f.get("value") or "" for f in fields if f["type"] == "hidden" and f["name"]},
+        "fields": fields,
+        "roles": {
+            f"{f['index']}:{f.get('name') or f.get('id') or ''}": info["roles"][f["index"]]
+            for f in fields if info["roles"][f["index"]]
+        },
+        "consent": [
+            {"name": f["name"], "id": f.get("id") or "", "kind": control_kind(f), "value": f.get("value") or ""}
+            for f in info["consent"]
+        ],
+        "submit": {"function": submit_function(html, form.get("name") or "")},
+    }
+    return plan
+
+
+def load_plan(path: str = PLAN_FILE, sn: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Plan file for this sn (any sn when the plan or caller has none), or None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            plan = json.load(f)
+    except Exception:
+        return None
+    if sn is not None and plan.get("sn") is not None and str(plan["sn"]) != str(sn):
+        return None
+    lecture_sn = (plan.get("hidden") or {}).get("lecture_sn")
+    if sn is not None and lecture_sn and str(lecture_sn) != str(sn):
+        return None
+    return plan
+
+
+def describe_plan(plan: Dict[str, Any]) -> str:
+    form = plan.get("form") or {}
+    return (
+        f"form={form.get('name') or form.get('id') or '?'} {form.get('method', '').upper()} "
+        f"{form.get('action_url') or form.get('action')} fields={len(plan.get('fields') or [])} "
+        f"consent={len(plan.get('consent') or [])} submit={(plan.get('submit') or {}).get('function') or 'form.submit()'}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--map", default=None, help="Preflight map JSON (default: newest logs/preflight_map_*.json)")
+    parser.add_argument("--html", action="append", default=[], help="Extra saved HTML glob(s) to consider")
+    parser.add_argument("--page-url", default=None, help="URL to resolve relative actions of --html pages against")
+    parser.add_argument("--sn", type=int, default=None, help="Target sn (default: from the map)")
+    parser.add_argument("--out", default=PLAN_FILE)
+    args = parser.parse_args()
+
+    map_path = args.map or latest_map()
+    pages: List[Dict[str, Any]] = []
+    sn = args.sn
+    if map_path:
+        try:
+            with open(map_path, "r", encoding="utf-8") as f:
+                pmap = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[plan] Cannot read preflight map {map_path}: {e}")
+            return 1
+        if sn is None:
+            sn = pmap.get("sn")
+        for r in pmap.get("results") or []:
+            if r.get("saved"):
+                pages.append({"html_path": r["saved"], "page_url": r.get("final_url"), "map_path": map_path})
+    for pattern in args.html:
+        for path in sorted(glob.glob(pattern)):
+            pages.append({"html_path": path, "page_url": args.page_url})
+    if not pages:
+        print("[plan] No preflight map or saved HTML to compile from")
+        return 1
+
+    plan = compile_plan(pages, sn)
+    if plan is None:
+        print(f"[plan] No application form found in {len(pages)} page(s)")
+        return 1
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(plan, f, ensure_ascii=False, indent=2)
+    print(f"[plan] {describe_plan(plan)} (from {plan['source']['html']})")
+    print(f"[plan] Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from html_forms import forms_from_html
+from form_cache import fingerprint, structure_from_fields
+from preflight_prune import is_hit
+
+
+# Per-URL results of earlier preflight runs: the mapped result plus a content hash,
+# ETag/Last-Modified and the structural fingerprint of every form on the page.
+# Entries younger than max_age are reused without a request; stale ones are re-probed
+# with If-None-Match/If-Modified-Since, so an unchanged page costs a 304. diff() compares
+# a run against the cache as it was loaded (endpoints/forms that appeared, disappeared
+# or changed). Only definitive answers are stored: a throttled (429) or failing (5xx)
+# response keeps the previous entry, so the next run probes that URL again.
+PREFLIGHT_CACHE_FILE = os.path.join(".cache", "preflight_paths.json")
+MAX_AGE_S = 6 * 3600
+
+# Keys kept only in the cache, not in preflight_map results
+_CACHE_ONLY = ("hash", "etag", "last_modified", "forms", "checked_at")
+
+
+def definitive(info: Dict[str, Any]) -> bool:
+    """2xx/3xx, 404 or the learned not-found page; not 429, 5xx or a request error."""
+    status = info.get("status")
+    if not isinstance(status, int) or status == 429:
+        return False
+    return status < 400 or status == 404 or bool(info.get("not_found"))
+
+
+def form_prints(html: str) -> List[str]:
+    return sorted({fingerprint(structure_from_fields(f, f["fields"])) for f in forms_from_html(html)})
+
+
+class PathCache:
+    def __init__(self, path: str = PREFLIGHT_CACHE_FILE, max_age: float = MAX_AGE_S):
+        self.path = path
+        self.max_age = max_age
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries: Dict[str, Dict[str, Any]] = json.load(f).get("paths") or {}
+        except Exception:
+            self.entries = {}
+        self.before = {k: dict(v) for k, v in self.entries.items()}
+        self.reused = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def result(entry: Dict[str, Any], **marks: Any) -> Dict[str, Any]:
+        out = {k: v for k, v in entry.items() if k not in _CACHE_ONLY}
+        out.update(marks)
+        return out
+
+    def fresh(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached result when it is recent enough (and its saved HTML is still there)."""
+        with self._lock:
+            e = self.entries.get(url)
+            if not e or time.time() - e.get("checked_at", 0) > self.max_age:
+                return None
+            if e.get("saved") and not os.path.exists(e["saved"]):
+                return None
+            self.reused += 1
+            return self.result(e, cached=True)
+
+    def conditional(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            e = self.entries.get(url) or {}
+        headers = {}
+        if e.get("etag"):
+            headers["If-None-Match"] = e["etag"]
+        if e.get("last_modified"):
+            headers["If-Modified-Since"] = e["last_modified"]
+        return headers
+
+    def revalidated(self, url: str) -> Dict[str, Any]:
+        """304: the cached result still holds."""
+        with self._lock:
+            e = self.entries[url]
+            e["checked_at"] = int(time.time())
+            self.not_modified += 1
+            return self.result(e, revalidated=True)
+
+    def store(self, url: str, info: Dict[str, Any], resp) -> bool:
+        """Cache a probe result; returns False (nothing stored) when it is not definitive."""
+        if not definitive(info):
+            return False
+        body = resp.text or ""
+        entry = dict(info)
+        entry.update({
+            "hash": hashlib.sha1(resp.content or b"").hexdigest()[:16],
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "forms": form_prints(body) if info.get("has_form") and not info.get("not_found") else [],
+            "checked_at": int(time.time()),
+        })
+        with self._lock:
+            self.entries[url] = entry
+        return True
+
+    def save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with self._lock:
+                data = json.dumps({"paths": self.entries}, ensure_ascii=False, indent=2)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def diff(self, urls: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """What changed for the URLs probed this run, relative to the cache as loaded."""
+        out: Dict[str, List[Dict[str, Any]]] = {
+            "new": [], "appeared": [], "disappeared": [], "changed": [], "forms_appeared": [], "forms_disappeared": [],
+        }
+        for url in urls:
+            b, a = self.before.get(url), self.entries.get(url)
+            if a is None or a.get("checked_at", 0) <= (b or {}).get("checked_at", 0):
+                continue
+            path = a.get("path") or url
+            if b is None:
+                # Never probed before (e.g. skipped by pruning last time): no baseline to diff
+                if is_hit(a):
+                    out["new"].append({"path": path, "status": a.get("status"), "forms": a.get("forms") or []})
+                continue
+            was, now = is_hit(b), is_hit(a)
+            if now and not was:
+                out["appeared"].append({"path": path, "status": a.get("status"), "before": b.get("status")})
+            elif was and not now:
+                out["disappeared"].append({"path": path, "status": a.get("status"), "before": b.get("status")})
+            elif was and now and b.get("hash") != a.get("hash"):
+                out["changed"].append({"path": path, "len": a.get("len"), "before_len": b.get("len"),
+                                       "forms_changed": b.get("forms") != a.get("forms")})
+            old, new = set(b.get("forms") or []), set(a.get("forms") or [])
+            out["forms_appeared"] += [{"path": path, "form": fp} for fp in sorted(new - old)]
+            out["forms_disappeared"] += [{"path": path, "form": fp} for fp in sorted(old - new)]
+        return out
@@ -1,18 +1,22 @@
 import os
 import re
+import sys
 import json
 import time
-import shutil
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
 
 import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from requests.adapters import HTTPAdapter
+
+from core import build_driver, ensure_login
+from session_store import http_session_with_store
+from preflight_prune import Pruner, load_priors
+from preflight_cache import PREFLIGHT_CACHE_FILE, MAX_AGE_S, PathCache
 
 
 # ====== USER CONFIG ======
@@ -23,45 +27,24 @@ USERNAME = "kfqsangwoo"
 PASSWORD = "1wndeowkd1!"
 # =========================
 
-
-def build_driver() -> webdriver.Chrome:
-    opts = Options()
-    opts.add_argument("--headless=new")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--window-size=1400,900")
-    chromedriver_path = shutil.which("chromedriver") or "/usr/bin/chromedriver"
-    if chromedriver_path and os.path.exists(chromedriver_path):
-        service = Service(chromedriver_path)
-        return webdriver.Chrome(service=service, options=opts)
-    return webdriver.Chrome(options=opts)
+# Probe pacing. Workers share one keep-alive connection pool; request starts are spaced
+# so the mapper never exceeds MAX_RPS overall, at most PER_HOST requests are in flight
+# per host, and each worker pauses POLITE_DELAY_S after every response.
+#   python3 preflight_mapper.py --workers 4 --max-rps 8
+#   python3 preflight_mapper.py --workers 1 --max-rps 0 --delay 0   (old sequential behaviour)
+WORKERS = 4
+PER_HOST = 4
+POLITE_DELAY_S = 0.1
+MAX_RPS = 8.0
+TIMEOUT_S = 10
 
 
-def selenium_login_get_session() -> requests.Session:
-    driver = build_driver()
+def selenium_login_cookies() -> List[Dict[str, Any]]:
+    # Selenium is only imported (via core) when the saved session is stale
+    driver = build_driver(perf_logs=False)
     try:
-        driver.get(LOGIN_URL)
-        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.NAME, "userid")))
-        driver.find_element(By.NAME, "userid").clear()
-        driver.find_element(By.NAME, "userid").send_keys(USERNAME)
-        driver.find_element(By.NAME, "Pass").clear()
-        driver.find_element(By.NAME, "Pass").send_keys(PASSWORD)
-        submits = driver.find_elements(By.XPATH, "//input[@type='submit']")
-        (submits[1] if len(submits) >= 2 else submits[0]).click()
-        # Alert swallow
-        try:
-            WebDriverWait(driver, 3).until(EC.alert_is_present())
-            driver.switch_to.alert.accept()
-        except Exception:
-            pass
-        WebDriverWait(driver, 10).until(EC.url_changes(LOGIN_URL))
-
-        sess = requests.Session()
-        # Copy cookies
-        for c in driver.get_cookies():
-            sess.cookies.set(c['name'], c['value'], domain=c.get('domain'))
-        return sess
+        ensure_login(driver, USERNAME, PASSWORD, login_url=LOGIN_URL, timeout=15)
+        return driver.get_cookies()
     finally:
         try:
             driver.quit()
@@ -69,27 +52,34 @@ def selenium_login_get_session() -> requests.Session:
             pass
 
 
+def selenium_login_get_session() -> requests.Session:
+    # Saved cookies skip Chrome entirely; a Selenium login only runs when they are stale
+    return http_session_with_store(selenium_login_cookies, BASE)
+
+
+CANDIDATE_NAMES = [
+    "Appchild", "AppChild", "appchild",
+    "ChildApply", "ApplyChild", "ChildApp", "ChildReg",
+]
+CANDIDATE_SUFFIXES = [
+    "", "_write", "_apply", "_form", "_input", "_proc", "_ok", "_insert", "_reg", "_request", "_submit", "_join",
+    "_regist", "_regist_ok",
+    "Write", "Apply", "Form", "Input", "Proc", "Ok", "Insert", "Reg", "Request", "Submit", "Join",
+    "Regist", "Regist_ok",
+]
+CANDIDATE_FOLDERS = ["parent", "mypage"]
+
+
 def candidate_paths(sn: int) -> List[str]:
-    names = [
-        "Appchild", "AppChild", "appchild",
-        "ChildApply", "ApplyChild", "ChildApp", "ChildReg",
-    ]
-    suffixes = [
-        "", "_write", "_apply", "_form", "_input", "_proc", "_ok", "_insert", "_reg", "_request", "_submit", "_join",
-        "_regist", "_regist_ok",
-        "Write", "Apply", "Form", "Input", "Proc", "Ok", "Insert", "Reg", "Request", "Submit", "Join",
-        "Regist", "Regist_ok",
-    ]
-    folders = ["parent", "mypage"]
     out = []
-    for f in folders:
-        for n in names:
-            for s in suffixes:
+    for f in CANDIDATE_FOLDERS:
+        for n in CANDIDATE_NAMES:
+            for s in CANDIDATE_SUFFIXES:
                 out.append(f"/{f}/{n}{s}.asp?sn={sn}")
     # Also try without sn to see redirections
-    for f in folders:
-        for n in names:
-            for s in suffixes:
+    for f in CANDIDATE_FOLDERS:
+        for n in CANDIDATE_NAMES:
+            for s in CANDIDATE_SUFFIXES:
                 out.append(f"/{f}/{n}{s}.asp")
     # A few other likely generic handlers
     out += [
@@ -108,44 +98,229 @@ def candidate_paths(sn: int) -> List[str]:
     return uniq
 
 
+class Pacer:
+    """Shared gate for all workers: spaces request starts at >= 1/max_rps seconds and
+    caps concurrent requests per host."""
+
+    def __init__(self, max_rps: float = MAX_RPS, per_host: int = PER_HOST):
+        self.interval = 1.0 / max_rps if max_rps > 0 else 0.0
+        self.per_host = max(1, per_host)
+        self._next = 0.0
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self.sent = 0
+        self.peak_rps = 0
+        self._window: List[float] = []
+
+    def _host(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def _slot(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.interval
+            self.sent += 1
+            # Starts within any 1s window of the schedule (what the ceiling bounds)
+            self._window = [x for x in self._window if at - x < 1.0 - 1e-6] + [at]
+            self.peak_rps = max(self.peak_rps, len(self._window))
+        if at > now:
+            time.sleep(at - now)
+
+    def get(self, sess: requests.Session, url: str, **kw) -> requests.Response:
+        with self._host(url):
+            self._slot()
+            r = sess.get(url, **kw)
+            if r.status_code == 429:
+                # Server asked us to slow down: honour Retry-After once, pushing back every worker
+                try:
+                    wait = min(30.0, float(r.headers.get("Retry-After") or 1))
+                except ValueError:
+                    wait = 1.0
+                with self._lock:
+                    self._next = max(self._next, time.monotonic() + wait)
+                self._slot()
+                r = sess.get(url, **kw)
+            return r
+
+
+def worker_sessions(sess: requests.Session, workers: int) -> List[requests.Session]:
+    """One Session per worker (cookie jars are not shared across threads), all mounted on a
+    single keep-alive adapter so connections are reused between workers."""
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, workers), pool_block=True)
+    out = []
+    for _ in range(max(1, workers)):
+        s = requests.Session()
+        s.headers.update(sess.headers)
+        s.cookies.update(sess.cookies)
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        out.append(s)
+    return out
+
+
+def probe(
+    sess: requests.Session,
+    pacer: Pacer,
+    i: int,
+    path: str,
+    ts: int,
+    pruner: Optional[Pruner] = None,
+    cache: Optional[PathCache] = None,
+) -> Dict[str, Any]:
+    url = BASE + path
+    try:
+        headers = cache.conditional(url) if cache is not None else {}
+        r = pacer.get(sess, url, allow_redirects=True, timeout=TIMEOUT_S, headers=headers)
+        if r.status_code == 304 and cache is not None and url in cache.entries:
+            info = cache.revalidated(url)
+            if pruner is not None:
+                pruner.note(path, info)
+            return info
+        info: Dict[str, Any] = {
+            "path": path,
+            "status": r.status_code,
+            "final_url": r.url,
+            "len": len(r.text or ""),
+            "has_form": ("<form" in (r.text or "").lower()),
+        }
+        if pruner is not None and pruner.record(path, r.status_code, r.url, r.text or ""):
+            info["not_found"] = True
+            if cache is not None:
+                cache.store(url, info, r)
+            return info
+        # Heuristic: save interesting responses
+        if r.status_code in (200, 302, 303) and (info["has_form"] or "신청" in r.text or "동의" in r.text):
+            sample = f"logs/preflight_{ts}_{i}.html"
+            with open(sample, "w", encoding="utf-8") as f:
+                f.write(r.text)
+            info["saved"] = sample
+        if cache is not None:
+            cache.store(url, info, r)
+        return info
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+
+def map_paths(
+    sess: requests.Session,
+    paths: List[str],
+    ts: int,
+    workers: int = WORKERS,
+    pacer: Optional[Pacer] = None,
+    delay: float = POLITE_DELAY_S,
+    pruner: Optional[Pruner] = None,
+    cache: Optional[PathCache] = None,
+) -> List[Dict[str, Any]]:
+    """Probe every path on a small worker pool; results keep the candidate order. With a
+    pruner, candidates go out best-first and ruled-out ones are recorded as skipped; with
+    a cache, fresh entries are reused without a request and stale ones revalidated."""
+    pacer = pacer or Pacer()
+    sessions = worker_sessions(sess, workers)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(paths)
+    if cache is not None:
+        for i, path in enumerate(paths):
+            hit = cache.fresh(BASE + path)
+            if hit is not None:
+                results[i] = hit
+                if pruner is not None:
+                    pruner.claim(i)
+                    pruner.note(path, hit)
+    idx = iter([i for i in range(len(paths)) if results[i] is None])
+    idx_lock = threading.Lock()
+
+    def take() -> Optional[Tuple[int, str, Optional[str]]]:
+        if pruner is not None:
+            return pruner.next()
+        with idx_lock:
+            i = next(idx, None)
+        return None if i is None else (i, paths[i], None)
+
+    def run(s: requests.Session) -> None:
+        while True:
+            item = take()
+            if item is None:
+                return
+            i, path, skip = item
+            if skip:
+                results[i] = {"path": path, "skipped": skip}
+                continue
+            try:
+                results[i] = probe(s, pacer, i, path, ts, pruner, cache)
+            finally:
+                if pruner is not None:
+                    pruner.release(path)
+            if delay > 0:
+                time.sleep(delay)
+
+    with ThreadPoolExecutor(max_workers=len(sessions)) as pool:
+        for f in [pool.submit(run, s) for s in sessions]:
+            f.result()
+    for s in sessions:
+        s.close()
+    return [r for r in results if r is not None]
+
+
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Concurrent probe workers")
+    parser.add_argument("--per-host", type=int, default=PER_HOST, help="Max in-flight requests per host")
+    parser.add_argument("--delay", type=float, default=POLITE_DELAY_S, help="Pause per worker after each response (s)")
+    parser.add_argument("--max-rps", type=float, default=MAX_RPS, help="Peak request-start rate ceiling (0 = none)")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="Probe every candidate (no 404 fingerprint, family pruning or prior ordering)")
+    parser.add_argument("--priors", default="logs/preflight_map_*.json", help="Earlier maps used to rank candidates")
+    parser.add_argument("--cache", default=PREFLIGHT_CACHE_FILE, help="Per-path result cache for incremental runs")
+    parser.add_argument("--max-age", type=float, default=MAX_AGE_S,
+                        help="Reuse cached results younger than this (s); older ones are revalidated (0: all)")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor update the cache")
+    args = parser.parse_args()
+
     sess = selenium_login_get_session()
     paths = candidate_paths(TARGET_SN)
-    results: List[Dict[str, Any]] = []
     os.makedirs("logs", exist_ok=True)
     ts = int(time.time())
 
-    for i, path in enumerate(paths):
-        url = BASE + path
-        try:
-            r = sess.get(url, allow_redirects=True, timeout=10)
-            info: Dict[str, Any] = {
-                "path": path,
-                "status": r.status_code,
-                "final_url": r.url,
-                "len": len(r.text or ""),
-                "has_form": ("<form" in (r.text or "").lower()),
-            }
-            # Heuristic: save interesting responses
-            if r.status_code in (200, 302, 303) and (info["has_form"] or "신청" in r.text or "동의" in r.text):
-                sample = f"logs/preflight_{ts}_{i}.html"
-                with open(sample, "w", encoding="utf-8") as f:
-                    f.write(r.text)
-                info["saved"] = sample
-            results.append(info)
-        except Exception as e:
-            results.append({"path": path, "error": str(e)})
+    pruner = None if args.no_prune else Pruner(paths, CANDIDATE_NAMES, load_priors(args.priors, CANDIDATE_NAMES))
+    cache = None if args.no_cache else PathCache(args.cache, max_age=args.max_age)
+    pacer = Pacer(max_rps=args.max_rps, per_host=args.per_host)
+    t0 = time.monotonic()
+    results = map_paths(sess, paths, ts, workers=args.workers, pacer=pacer, delay=args.delay, pruner=pruner,
+                        cache=cache)
+    print(f"[preflight] {pacer.sent} requests in {time.monotonic() - t0:.1f}s "
+          f"({args.workers} workers, peak {pacer.peak_rps} req/s)")
+    if pruner is not None:
+        print(f"[preflight] {pruner.describe()}")
+    if cache is not None:
+        cache.save()
+        print(f"[preflight] cache: {cache.reused} reused, {cache.not_modified} not modified (304)")
+        if cache.before:
+            diff = cache.diff([BASE + r["path"] for r in results if "status" in r and not r.get("cached")])
+            diff_file = f"logs/preflight_diff_{ts}.json"
+            with open(diff_file, "w", encoding="utf-8") as f:
+                json.dump(diff, f, ensure_ascii=False, indent=2)
+            print("[preflight] diff: " + " ".join(f"{k}={len(v)}" for k, v in diff.items()) + f" ({diff_file})")
+            for k in ("new", "appeared", "disappeared", "changed"):
+                for d in diff[k]:
+                    print(f"[preflight]   {k}: {d['path']}")
 
     out = {
         "time": datetime.now().isoformat(timespec="seconds"),
         "sn": TARGET_SN,
         "results": results,
     }
+    if pruner is not None:
+        out["pruning"] = pruner.to_dict()
     out_file = f"logs/preflight_map_{ts}.json"
     with open(out_file, "w", encoding="utf-8") as f:
         json.dump(out, f, ensure_ascii=False, indent=2)
     print(f"[preflight] Wrote {out_file}. Interesting HTML (if any) saved as logs/preflight_*_*.html")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,228 @@
+import re
+import glob
+import json
+import html
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+
+# Candidate pruning and ordering for preflight_mapper. Nearly every probe of the old
+# maps came back as the site's ~4.4KB "not found" page, which echoes the requested path.
+# - NotFoundPrint learns that page from the first few 404s: a hash of the body with the
+#   path removed, plus the size band (length minus path length). Later responses are
+#   classified by hash/size; bodies are neither saved nor diffed.
+# - A missing .asp is missing for every query string, and on a case-insensitive server
+#   (IIS) for every spelling of the path.
+# - Within a folder, a suffix family (_write/Write, _ok/Ok, ...) that missed for
+#   MISS_LIMIT names, or a name that missed for MISS_LIMIT suffix families, is dropped
+#   unless it has a hit.
+# - The remaining candidates are probed in order of hit probability from earlier maps.
+LEARN_404 = 3
+SIZE_SLACK = 16
+MISS_LIMIT = 3
+PRIOR_WEIGHT = 2.0
+HIT_STATUSES = (200, 301, 302, 303)
+
+_PATH_RE = re.compile(r"^/([^/]+)/([^/?]+?)\.asp(?:\?.*)?$", re.I)
+
+
+def split_path(path: str, names: Sequence[str]) -> Tuple[str, str, str]:
+    """(folder, name family, suffix family) of a candidate, all lower-cased.
+    /parent/AppChild_Regist_ok.asp?sn=1 -> ("parent", "appchild", "regist_ok")"""
+    m = _PATH_RE.match(path)
+    if not m:
+        return "", urlsplit(path).path.lower(), ""
+    folder, stem = m.group(1).lower(), m.group(2)
+    low = stem.lower()
+    for n in sorted({n.lower() for n in names}, key=len, reverse=True):
+        if low.startswith(n):
+            return folder, n, low[len(n):].lstrip("_")
+    return folder, low, ""
+
+
+def file_of(path: str) -> str:
+    return urlsplit(path).path
+
+
+def is_hit(r: Dict[str, Any]) -> bool:
+    return (r.get("status") in HIT_STATUSES and not r.get("not_found")
+            and "login.asp" not in (r.get("final_url") or "").lower())
+
+
+class NotFoundPrint:
+    def __init__(self, learn: int = LEARN_404, slack: int = SIZE_SLACK):
+        self.learn = learn
+        self.slack = slack
+        self.hashes: Set[str] = set()
+        self.deltas: List[int] = []
+
+    @property
+    def learned(self) -> bool:
+        return len(self.deltas) >= self.learn
+
+    @staticmethod
+    def digest(path: str, body: str) -> str:
+        for v in sorted({path, unquote(path), quote(path, safe="/?=&"), html.escape(path), file_of(path)},
+                        key=len, reverse=True):
+            body = body.replace(v, "")
+        return hashlib.sha1(body.encode("utf-8", "replace")).hexdigest()[:16]
+
+    def matches(self, path: str, status: int, body: str) -> bool:
+        """True for the site's not-found page; 404s before the print is learned teach it."""
+        h = self.digest(path, body)
+        delta = len(body) - len(path)
+        if status == 404:
+            if len(self.hashes) < 32:
+                self.hashes.add(h)
+            if not self.learned:
+                self.deltas.append(delta)
+            return True
+        if not self.learned:
+            return False
+        if h in self.hashes:
+            return True
+        # Same template under another error status (e.g. a 500 that renders the 404 page)
+        return status >= 400 and min(self.deltas) - self.slack <= delta <= max(self.deltas) + self.slack
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"learned_from": len(self.deltas), "hashes": sorted(self.hashes),
+                "size_band": [min(self.deltas), max(self.deltas)] if self.deltas else None}
+
+
+def load_priors(pattern: str, names: Sequence[str]) -> Dict[Tuple[str, ...], List[int]]:
+    """[tries, hits] per (folder, name, suffix), (folder, "name", name) and (folder, "suffix", suffix)
+    from earlier preflight maps."""
+    out: Dict[Tuple[str, ...], List[int]] = {}
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                results = json.load(f).get("results") or []
+        except Exception:
+            continue
+        for r in results:
+            if "status" not in r:
+                continue
+            folder, name, suffix = split_path(r.get("path") or "", names)
+            hit = int(is_hit(r))
+            for key in ((folder, name, suffix), (folder, "name", name), (folder, "suffix", suffix)):
+                s = out.setdefault(key, [0, 0])
+                s[0] += 1
+                s[1] += hit
+    return out
+
+
+def hit_probability(path: str, names: Sequence[str], priors: Dict[Tuple[str, ...], List[int]]) -> float:
+    """Smoothed hit rate of this exact family, shrunk towards its name and suffix rates."""
+    folder, name, suffix = split_path(path, names)
+
+    def rate(key: Tuple[str, ...]) -> float:
+        tries, hits = priors.get(key, (0, 0))
+        return (hits + 1) / (tries + 2)
+
+    base = (rate((folder, "name", name)) + rate((folder, "suffix", suffix))) / 2
+    tries, hits = priors.get((folder, name, suffix), (0, 0))
+    return (hits + PRIOR_WEIGHT * base) / (tries + PRIOR_WEIGHT)
+
+
+class Pruner:
+    """Hands out candidates best-first, skipping the ones earlier answers rule out.
+    Thread-safe: preflight_mapper workers call next()/record() concurrently."""
+
+    def __init__(self, paths: List[str], names: Sequence[str], priors: Optional[Dict[Tuple[str, ...], List[int]]] = None):
+        self.paths = paths
+        self.names = names
+        self.print = NotFoundPrint()
+        priors = priors or {}
+        # Stable sort: without priors every candidate ties and the original order is kept
+        self.queue = sorted(range(len(paths)), key=lambda i: -hit_probability(paths[i], names, priors))
+        self.missing: Set[str] = set()
+        self.family_miss: Dict[Tuple[str, str, str], Set[str]] = {}
+        self.family_hit: Set[Tuple[str, str, str]] = set()
+        self.seen: Dict[str, Tuple[str, Any, int]] = {}
+        # Probes still in flight per family: a family is never dropped while one may yet hit
+        self.pending: Dict[Tuple[str, str, str], int] = {}
+        self.case_insensitive = False
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def _skip_reason(self, path: str) -> Optional[str]:
+        f = file_of(path)
+        if f in self.missing or (self.case_insensitive and f.lower() in {m.lower() for m in self.missing}):
+            return f"missing file {f}"
+        if self.case_insensitive and path.lower() in self.seen and self.seen[path.lower()][0] != path:
+            return f"same as {self.seen[path.lower()][0]}"
+        for fam in self._families(path):
+            if (fam not in self.family_hit and not self.pending.get(fam)
+                    and len(self.family_miss.get(fam, ())) >= MISS_LIMIT):
+                return f"{fam[1]} family '{fam[2]}' not served in /{fam[0]}/"
+        return None
+
+    def _families(self, path: str) -> Tuple[Tuple[str, str, str], Tuple[str, str, str]]:
+        folder, name, suffix = split_path(path, self.names)
+        return (folder, "suffix", suffix), (folder, "name", name)
+
+    def next(self) -> Optional[Tuple[int, str, Optional[str]]]:
+        """(index, path, skip reason or None), or None when every candidate is handed out."""
+        with self._lock:
+            if not self.queue:
+                return None
+            i = self.queue.pop(0)
+            reason = self._skip_reason(self.paths[i])
+            if reason:
+                self.skipped += 1
+            else:
+                for fam in self._families(self.paths[i]):
+                    self.pending[fam] = self.pending.get(fam, 0) + 1
+            return i, self.paths[i], reason
+
+    def release(self, path: str) -> None:
+        """The probe handed out by next() finished (recorded or failed)."""
+        with self._lock:
+            for fam in self._families(path):
+                self.pending[fam] = max(0, self.pending.get(fam, 0) - 1)
+
+    def record(self, path: str, status: int, final_url: str, body: str) -> bool:
+        """Feed a response back; returns True when it is the not-found page."""
+        with self._lock:
+            not_found = self.print.matches(path, status, body)
+            self._note(path, status, final_url, len(body), not_found)
+            return not_found
+
+    def note(self, path: str, result: Dict[str, Any]) -> None:
+        """Feed an outcome known without a body (a cached or revalidated result)."""
+        with self._lock:
+            self._note(path, result.get("status"), result.get("final_url") or "", result.get("len") or 0,
+                       bool(result.get("not_found")))
+
+    def claim(self, i: int) -> None:
+        """Take a candidate out of the queue (its result is already known)."""
+        with self._lock:
+            if i in self.queue:
+                self.queue.remove(i)
+
+    def _note(self, path: str, status: Any, final_url: str, length: int, not_found: bool) -> None:
+        hit = not not_found and is_hit({"status": status, "final_url": final_url})
+        sfam, nfam = self._families(path)
+        for fam, other in ((sfam, nfam[2]), (nfam, sfam[2])):
+            if hit:
+                self.family_hit.add(fam)
+            elif not_found:
+                self.family_miss.setdefault(fam, set()).add(other)
+        if not_found and status == 404:
+            self.missing.add(file_of(path))
+        elif not not_found:
+            # Two spellings of one path giving the same page: the server ignores case
+            prev = self.seen.get(path.lower())
+            if prev and prev[0] != path and prev[1:] == (status, length):
+                self.case_insensitive = True
+            self.seen.setdefault(path.lower(), (path, status, length))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"candidates": len(self.paths), "skipped": self.skipped, "case_insensitive": self.case_insensitive,
+                "not_found_print": self.print.to_dict()}
+
+    def describe(self) -> str:
+        return (f"skipped {self.skipped}/{len(self.paths)} candidates; case-insensitive={self.case_insensitive}; "
+                f"404 print from {len(self.print.deltas)} page(s)")
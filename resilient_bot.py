@@ -1,15 +1,12 @@
 import os
 import sys
 import time
-import random
-import shutil
+import threading
 import re
 from datetime import datetime, timedelta
 from typing import Optional, List, Tuple
 
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -21,10 +18,34 @@ from selenium.common.exceptions import (
     WebDriverException,
 )
 
+from core import (
+    build_driver,
+    wait_alert_and_accept,
+    ensure_login,
+    set_lean_profile,
+    offsite_hosts,
+    page_load_metrics,
+    chrome_rss_mb,
+    first_visible,
+)
+from field_rules import classify_field, control_kind
+from http_watch import session_from_driver, poll_apply_state
+from clock_sync import ClockSync
+from scheduler import Scheduler, NS
+from session_store import COOKIE_FILE, login_with_store
+from navigation import MARK_JS, NavTimings, navigate, wait_ready
+from form_cache import form_fingerprint, lookup_plan, remember_plan
+from plan_compiler import PLAN_FILE, load_plan, describe_plan
+from event_log import EventLog, open_event_log
+from perf_capture import PerfCapture
+from latency import RunSpans
+import command_profiler
+
 
 # ====== USER CONFIG (hardcoded) ======
-LOGIN_URL = "https://www.sahascc.or.kr/member/login.asp"
-TARGET_URL = "https://www.sahascc.or.kr/parent/Appchild_view.asp?sn=108"
+BASE_URL = "https://www.sahascc.or.kr"
+LOGIN_URL = f"{BASE_URL}/member/login.asp"
+TARGET_URL = f"{BASE_URL}/parent/Appchild_view.asp?sn=108"
 
 # Credentials (edit these)
 USERNAME = "kfqsangwoo"
@@ -46,29 +67,90 @@ USER_DATA = {
 }
 # =====================================
 
-EVENTS_LOG_PATH = None
+# Structured event log (event_log.py); console-only until main() opens the file
+EVENT_LOG = EventLog(None)
+# pageLoadStrategy for the bot's drivers ("none"/"eager" + readiness predicates, or "normal")
+PAGE_LOAD_STRATEGY = "none"
+# Time per navigation type (see navigation.NavTimings)
+NAV_TIMINGS = NavTimings()
+# Stage spans from the '신청' flip to the submission result (see latency.py)
+LATENCY = RunSpans()
+# Reuse fill plans for forms seen before (see form_cache.py)
+FORM_CACHE = True
+# Submission plan compiled from preflight artifacts (plan_compiler.py); loaded in bot_session
+SUBMISSION_PLAN: Optional[dict] = None
+PLAN_PATH = PLAN_FILE
+# Saved login cookies; per host when --base-url points elsewhere (e.g. fixture_server.py)
+COOKIE_PATH = COOKIE_FILE
 
 def _init_event_log():
-    global EVENTS_LOG_PATH
-    try:
-        os.makedirs("logs", exist_ok=True)
-        ts = int(time.time())
-        EVENTS_LOG_PATH = os.path.join("logs", f"events_{ts}.log")
-    except Exception:
-        EVENTS_LOG_PATH = None
+    global EVENT_LOG
+    EVENT_LOG = open_event_log("events")
 
 
-def evt(msg: str) -> None:
-    ts = datetime.now().strftime("%H:%M:%S")
-    line = f"[{ts}] {msg}"
-    print(line)
-    if not EVENTS_LOG_PATH:
-        return
+def evt(msg: str, phase: Optional[str] = None, dur_ms: Optional[float] = None, **fields) -> None:
+    """Print and queue a JSON-lines record; never blocks on disk."""
+    EVENT_LOG.emit(msg, phase=phase, dur_ms=dur_ms, **fields)
+
+
+def _site_base() -> str:
+    from urllib.parse import urlparse
+    u = urlparse(TARGET_URL)
+    return f"{u.scheme}://{u.netloc}"
+
+
+def _rebase(url: str) -> str:
+    """Same path/query on TARGET_URL's host (URLs compiled against another base)."""
+    from urllib.parse import urlparse
+    u = urlparse(url)
+    return _site_base() + u.path + ("?" + u.query if u.query else "")
+
+
+def _site_host() -> str:
+    from urllib.parse import urlparse
+    return urlparse(TARGET_URL).hostname or ""
+
+
+def _fmt_profile(metrics: dict, rss_mb: Optional[float]) -> str:
+    return (
+        f"load={metrics.get('load_ms', '?')}ms dcl={metrics.get('dcl_ms', '?')}ms "
+        f"res={metrics.get('resources', '?')} {metrics.get('transfer_kb', '?')}KB "
+        f"rss={rss_mb if rss_mb is not None else '?'}MB"
+    )
+
+
+def enter_lean_profile(driver, report: bool = True) -> bool:
+    """Block images/fonts/media and off-site hosts for the watch phase.
+    With report, reload once and log page-load time and Chrome RSS for both profiles."""
+    if report:
+        wait_ready(driver, "load")
+    full = page_load_metrics(driver) if report else {}
+    full_rss = chrome_rss_mb(driver) if report else None
+    if not set_lean_profile(driver, True, offsite_hosts(driver, _site_host())):
+        evt("[profile] CDP unavailable; staying on the full profile")
+        return False
+    if not report:
+        return True
     try:
-        with open(EVENTS_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        navigate(driver, None, "load", kind="profile_reload", timings=NAV_TIMINGS)
+        inject_same_tab_policy(driver)
     except Exception:
         pass
+    evt(f"[profile] full: {_fmt_profile(full, full_rss)}")
+    evt(f"[profile] lean: {_fmt_profile(page_load_metrics(driver), chrome_rss_mb(driver))}")
+    return True
+
+
+def restore_full_profile(driver, reason: str) -> None:
+    if set_lean_profile(driver, False):
+        evt(f"[profile] Full profile restored ({reason})")
+
+
+def _target_sn() -> Optional[str]:
+    from urllib.parse import urlparse, parse_qs
+    qs = parse_qs(urlparse(TARGET_URL).query)
+    return (qs.get('sn') or qs.get('SN') or [None])[0]
+
 
 def _append_query(url: str, extra: str) -> str:
     if "?" in url:
@@ -100,91 +182,20 @@ def inject_same_tab_policy(driver) -> None:
         pass
 
 
-def build_driver(headless: bool = True) -> webdriver.Chrome:
-    opts = Options()
-    # Headless new is more stable with Chrome >= 109
-    if headless:
-        opts.add_argument("--headless=new")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--disable-blink-features=AutomationControlled")
-    opts.add_argument("--window-size=1400,900")
-    opts.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
-    )
-    # Enable performance + browser logs (HAR-like capture)
-    try:
-        opts.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
-    except Exception:
-        pass
+def _deadline_ns(dt: datetime, clock: Optional[ClockSync] = None, lead: float = 0.0) -> int:
+    """time.monotonic_ns() value at which dt arrives (on the site's clock when given), minus lead seconds."""
+    if clock is not None:
+        return int(clock.monotonic_deadline(dt, lead=lead) * NS)
+    return time.monotonic_ns() + int(((dt - datetime.now()).total_seconds() - lead) * NS)
 
-    # Prefer chromedriver from PATH or common locations
-    chromedriver_path = shutil.which("chromedriver") or "/usr/bin/chromedriver"
-    # Also allow bundled drivers in workspace venv
-    workspace_candidates = [
-        os.path.join(os.getcwd(), "venv", "chromedriver-Linux64"),
-        os.path.join(os.getcwd(), "venv", "chromedriver"),
-    ]
-    for p in [chromedriver_path] + workspace_candidates:
-        try:
-            if p and os.path.exists(p):
-                service = Service(p)
-                return webdriver.Chrome(service=service, options=opts)
-        except Exception:
-            continue
-    # Fallback: try default discovery
-    return webdriver.Chrome(options=opts)
 
-
-def wait_alert_and_accept(driver, timeout=5) -> Optional[str]:
-    try:
-        WebDriverWait(driver, timeout).until(EC.alert_is_present())
-        alert = driver.switch_to.alert
-        txt = alert.text
-        alert.accept()
-        return txt
-    except Exception:
-        return None
-
-
-def ensure_login(driver, username: str, password: str, timeout=20) -> None:
-    if not username or not password:
-        raise RuntimeError("USERNAME/PASSWORD not set in script")
-
-    driver.get(LOGIN_URL)
-    WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.NAME, "userid")))
-    driver.find_element(By.NAME, "userid").clear()
-    driver.find_element(By.NAME, "userid").send_keys(username)
-    driver.find_element(By.NAME, "Pass").clear()
-    driver.find_element(By.NAME, "Pass").send_keys(password)
-
-    # There appear to be two submit inputs; click the second when present
-    submit_buttons = driver.find_elements(By.XPATH, "//input[@type='submit']")
-    (submit_buttons[1] if len(submit_buttons) >= 2 else submit_buttons[0]).click()
-
-    msg = wait_alert_and_accept(driver, timeout=5)  # handle potential confirm/alert
-    if msg:
-        evt(f"[login] alert: {msg}")
-    WebDriverWait(driver, timeout).until(EC.url_changes(LOGIN_URL))
-    evt("[login] OK")
-
-
-def adaptive_sleep_until(start_dt: datetime) -> None:
-    # Sleep with increasing precision near the deadline
-    while True:
-        now = datetime.now()
-        if now >= start_dt:
-            return
-        remaining = (start_dt - now).total_seconds()
-        if remaining > 300:
-            time.sleep(60)
-        elif remaining > 60:
-            time.sleep(10)
-        elif remaining > 10:
-            time.sleep(2)
-        else:
-            time.sleep(0.25)
+def adaptive_sleep_until(start_dt: datetime, clock: Optional[ClockSync] = None) -> None:
+    # Coarse sleep then a short final spin on the monotonic clock (site clock when a ClockSync is given)
+    lead = (clock.rtt() or 0.0) / 2 if clock is not None else 0.0
+    target = _deadline_ns(start_dt, clock, lead)
+    actual = Scheduler().wait_until_ns(target)
+    if clock is not None:
+        evt(f"[clock] Woke {(actual - target) / 1e6:.1f}ms late ({clock.describe()})")
 
 
 def _fmt_remaining(seconds: float) -> str:
@@ -203,83 +214,146 @@ def wait_until_with_refresh(
     target_dt: datetime,
     refresh_interval_sec: int = 600,
     start_dt: Optional[datetime] = None,
+    clock: Optional[ClockSync] = None,
+    standby: Optional["StandbyPool"] = None,
+    perf: Optional[PerfCapture] = None,
 ) -> None:
     """Wait until target_dt, refreshing every refresh_interval_sec, and log remaining only on refresh.
     start_dt is the actual open time (for logging remaining until open); if None, only target remaining is shown.
+    Deadlines are monotonic, and follow the site's clock when a ClockSync is given.
+    Standby drivers (if any) are refreshed along with the main one to keep their sessions alive.
+    Performance-log entries are drained after each refresh (perf), before Chrome's buffer fills.
     """
-    now = datetime.now()
-    remain_target0 = (target_dt - now).total_seconds()
-    remain_open0 = (start_dt - now).total_seconds() if start_dt else None
-    msg0 = f"[wait] Remaining to pre-window: {_fmt_remaining(remain_target0)}"
-    if remain_open0 is not None:
-        msg0 += f" | to open: {_fmt_remaining(remain_open0)}"
-    print(msg0)
-
-    last_refresh = time.time()
-    next_refresh = last_refresh + max(1, refresh_interval_sec)
-    while True:
-        now = datetime.now()
-        if now >= target_dt:
-            return
-        remain_target = (target_dt - now).total_seconds()
-        remain_open = (start_dt - now).total_seconds() if start_dt else None
-
-        if time.time() >= next_refresh:
-            try:
-                driver.refresh()
-            except Exception:
-                pass
-            msg = f"[wait] Refreshed. Remaining to pre-window: {_fmt_remaining(remain_target)}"
-            if remain_open is not None:
-                msg += f" | to open: {_fmt_remaining(remain_open)}"
-            print(msg)
-            last_refresh = time.time()
-            next_refresh = last_refresh + max(1, refresh_interval_sec)
-
-
-        # Choose a small sleep step but wake up before next refresh
-        if remain_target > 300:
-            base = 60
-        elif remain_target > 60:
-            base = 10
-        elif remain_target > 10:
-            base = 2
-        else:
-            base = 0.25
-        sleep_for = min(base, max(0.05, next_refresh - time.time()))
-        time.sleep(sleep_for)
+    sched = Scheduler()
+    target_ns = _deadline_ns(target_dt, clock)
+    open_ns = _deadline_ns(start_dt, clock) if start_dt else None
+
+    def remaining_msg(prefix: str) -> str:
+        now = sched.now_ns()
+        msg = f"{prefix}Remaining to pre-window: {_fmt_remaining((target_ns - now) / NS)}"
+        if open_ns is not None:
+            msg += f" | to open: {_fmt_remaining((open_ns - now) / NS)}"
+        return msg
+
+    def refresh() -> None:
+        try:
+            navigate(driver, None, "view", kind="refresh_wait", timings=NAV_TIMINGS)
+        except Exception:
+            pass
+        if perf is not None:
+            perf.drain(driver)
+        print(remaining_msg("[wait] Refreshed. "))
+        if standby is not None:
+            standby.keepalive(refresh=True)
+
+    print(remaining_msg("[wait] "))
+    sched.every("refresh", max(1, refresh_interval_sec), refresh)
+    sched.at("target", target_ns, sched.stop)
+    sched.run()
+
+
+# Clickable controls representing the real server-side "신청" state.
+# Avoid matching "신청예정" or "마감".
+APPLY_XPATHS: List[str] = [
+    # The view page's status block
+    "//div[contains(@class,'btn-grp')]//a[not(contains(.,'예정')) and contains(normalize-space(.), '신청')]",
+    "//div[contains(@class,'btn-grp')]//button[not(contains(.,'예정')) and contains(normalize-space(.), '신청')]",
+    # Button or link explicitly labeled 신청, outside the site menus (gnb/allMenu/side-menu
+    # link to '...신청' pages and are visible on every page)
+    "//a[not(contains(.,'예정')) and contains(normalize-space(.), '신청')"
+    " and not(ancestor::header or ancestor::nav or ancestor::*[contains(@class,'side-menu')])]",
+    "//button[not(contains(.,'예정')) and contains(normalize-space(.), '신청')"
+    " and not(ancestor::header or ancestor::nav or ancestor::*[contains(@class,'side-menu')])]",
+    "//input[( @type='button' or @type='submit') and contains(@value,'신청') and not(contains(@value,'예정'))]",
+    # A status span saying '신청' with a clickable ancestor
+    "//span[contains(@class,'status') and normalize-space(text())='신청']",
+]
+
+# In-page watcher: a MutationObserver re-evaluates APPLY_XPATHS inside the page and
+# records when the apply control first appears. Installed once per document (the
+# first wait after a navigation installs it), then each wait is a single
+# execute_async_script that resolves on the transition or after timeout_ms.
+APPLY_WATCH_JS = r"""
+var xpaths = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var W = window.__applyWatch__;
+if (!W) {
+  W = window.__applyWatch__ = {el: null, at: null, installed: performance.now(), checks: 0, waiters: []};
+  var visible = function(e) {
+    if (!(e.offsetWidth || e.offsetHeight || e.getClientRects().length)) return false;
+    var cs = window.getComputedStyle(e);
+    return cs.visibility !== 'hidden' && cs.display !== 'none';
+  };
+  var clickable = function(e) {
+    for (var i = 0; e && i <= 5; i++, e = e.parentElement) {
+      var tag = e.tagName.toLowerCase();
+      if (tag === 'a' || tag === 'button') return e;
+    }
+    return null;
+  };
+  var scan = function() {
+    for (var i = 0; i < xpaths.length; i++) {
+      var snap = document.evaluate(xpaths[i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      for (var j = 0; j < snap.snapshotLength; j++) {
+        var n = snap.snapshotItem(j);
+        if (visible(n)) { var c = clickable(n); if (c) return c; }
+      }
+    }
+    return null;
+  };
+  var check = function() {
+    W.checks++;
+    if (W.el && document.contains(W.el)) return;
+    W.el = scan();
+    if (W.el) {
+      W.at = performance.now();
+      W.waiters.splice(0).forEach(function(f) { f(); });
+    }
+  };
+  check();
+  new MutationObserver(check).observe(document.documentElement, {
+    childList: true, subtree: true, characterData: true,
+    attributes: true, attributeFilter: ['class', 'style', 'value', 'disabled', 'hidden']
+  });
+}
+var report = function() {
+  return {el: W.el, at_ms: W.at, installed_ms: W.installed, checks: W.checks};
+};
+if (W.el) { done(report()); return; }
+var timer = setTimeout(function() { done(null); }, timeoutMs);
+W.waiters.push(function() { clearTimeout(timer); done(report()); });
+"""
+
+
+def wait_apply_element(driver, timeout_s: float) -> Tuple[Optional[webdriver.remote.webelement.WebElement], bool]:
+    """Block (inside the page) up to timeout_s for the apply control.
+    Returns (element or None, watcher_ok); watcher_ok is False when the script failed."""
+    try:
+        res = driver.execute_async_script(APPLY_WATCH_JS, APPLY_XPATHS, int(max(0.0, timeout_s) * 1000))
+    except TimeoutException:
+        return None, True
+    except Exception as e:
+        if is_disconnect_error(e):
+            raise
+        return None, False
+    if not res or not res.get("el"):
+        return None, True
+    if res.get("at_ms") is not None and res.get("installed_ms") is not None:
+        evt(
+            f"[watch] In-page watcher saw '신청' {res['at_ms'] - res['installed_ms']:.0f}ms after install"
+            f" ({res.get('checks')} checks)"
+        )
+    return res["el"], True
 
 
 def find_apply_element(driver) -> Optional[webdriver.remote.webelement.WebElement]:
-    # Look for clickable controls representing the real server-side "신청" state.
-    # Avoid matching "신청예정" or "마감".
-    xpaths: List[str] = [
-        # Button or link explicitly labeled 신청
-        "//a[not(contains(.,'예정')) and contains(normalize-space(.), '신청')]",
-        "//button[not(contains(.,'예정')) and contains(normalize-space(.), '신청')]",
-        "//input[( @type='button' or @type='submit') and contains(@value,'신청') and not(contains(@value,'예정'))]",
-        # A status span saying '신청' with a clickable ancestor
-        "//span[contains(@class,'status') and normalize-space(text())='신청']",
-    ]
-    for xp in xpaths:
-        try:
-            elems = driver.find_elements(By.XPATH, xp)
-            for e in elems:
-                if e.is_displayed():
-                    # If it's already clickable control (a/button/input), return it
-                    tag = e.tag_name.lower()
-                    if tag in ("a", "button"):
-                        return e
-                    # climb ancestors to find nearest clickable anchor/button
-                    anc = e
-                    for _ in range(5):
-                        anc = anc.find_element(By.XPATH, "..")
-                        tag = anc.tag_name.lower()
-                        if tag in ("a", "button"):
-                            return anc
-        except Exception:
-            continue
-    return None
+    # Fallback for when the in-page watcher cannot run: one selector-batch call
+    try:
+        hit = first_visible(driver, APPLY_XPATHS, climb=5)
+    except Exception as e:
+        if is_disconnect_error(e):
+            raise
+        return None
+    return hit["el"] if hit else None
 
 
 def detect_captcha(driver) -> bool:
@@ -318,8 +392,7 @@ def verify_success_on_mypage(driver) -> bool:
         sn = None
     summary = {"sn": sn, "found": False, "matches": []}
     try:
-        driver.get("https://www.sahascc.or.kr/mypage/Appchild.asp")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+        navigate(driver, f"{_site_base()}/mypage/Appchild.asp", "mypage", timings=NAV_TIMINGS, timeout=10)
         page = driver.page_source
         # Heuristic: look for any anchor/link containing sn= or target title
         found = False
@@ -386,9 +459,17 @@ def try_direct_apply(driver) -> bool:
             candidates.insert(0, f"{parsed.scheme}://{parsed.netloc}/parent/Appchild_regist.asp?sn={sn}")
     except Exception:
         pass
+    # The plan's page goes first only when preflight fetched it for this sn; otherwise last
+    plan = SUBMISSION_PLAN or {}
+    apply_url = plan.get("apply_url")
+    if apply_url and apply_url not in candidates:
+        if plan.get("apply_url_checked"):
+            candidates.insert(0, apply_url)
+        else:
+            candidates.append(apply_url)
     for url in candidates:
         try:
-            driver.get(url)
+            navigate(driver, url, "form", kind="apply_flag", timings=NAV_TIMINGS)
             msg = wait_alert_and_accept(driver, timeout=2)
             if msg:
                 print(f"[apply-flag] alert: {msg}")
@@ -396,9 +477,11 @@ def try_direct_apply(driver) -> bool:
             forms = driver.find_elements(By.TAG_NAME, "form")
             if forms:
                 evt(f"[apply-flag] form detected via {url}")
-                heuristic_fill_form(driver, forms[0], USER_DATA)
-                agree_all(driver)
-                submitted = submit_current_form(driver)
+                submitted = plan_fill_and_submit(driver)
+                if submitted is None:
+                    heuristic_fill_form(driver, forms[0], USER_DATA)
+                    agree_all(driver)
+                    submitted = submit_current_form(driver)
                 if submitted:
                     evt("[apply-flag] submitted via flagged URL")
                 return submitted
@@ -407,32 +490,6 @@ def try_direct_apply(driver) -> bool:
     return False
 
 
-def dump_performance_logs(driver, label_prefix: str = "perf") -> Optional[str]:
-    os.makedirs("logs", exist_ok=True)
-    ts = int(time.time())
-    out_path = os.path.join("logs", f"{label_prefix}_{ts}.jsonl")
-    try:
-        entries = driver.get_log("performance")
-    except Exception:
-        entries = []
-    if not entries:
-        return None
-    try:
-        import json as _json
-        with open(out_path, "w", encoding="utf-8") as f:
-            for e in entries:
-                # Each e is a dict with 'message' JSON string from CDP
-                try:
-                    msg = _json.loads(e.get("message", "{}"))
-                except Exception:
-                    msg = {"raw": e.get("message")}
-                _json.dump(msg, f, ensure_ascii=False)
-                f.write("\n")
-        return out_path
-    except Exception:
-        return None
-
-
 def safe_click(driver, elem) -> None:
     for _ in range(3):
         try:
@@ -523,176 +580,350 @@ def agree_all(driver) -> None:
         pass
 
 
-def fill_text(elem, value: str) -> None:
-    try:
-        if elem.get_attribute("readonly") or elem.get_attribute("disabled"):
-            return
-        elem.clear()
-        if value:
-            elem.send_keys(value)
-    except Exception:
-        pass
+# One round-trip: read every input/select/textarea of the form with the attributes
+# the mapping needs. Label resolution mirrors the old per-element XPath lookups
+# (label[for=id] first, then the closest preceding label).
+SNAPSHOT_FORM_JS = r"""
+var form = arguments[0];
+var els = form.querySelectorAll('input, select, textarea');
+function txt(n) { return n ? (n.innerText || n.textContent || '').trim() : ''; }
+function labelOf(el) {
+  try {
+    if (el.id) {
+      var l = document.querySelector('label[for="' + CSS.escape(el.id) + '"]');
+      if (l) { return txt(l); }
+    }
+  } catch (e) {}
+  try {
+    var r = document.evaluate('ancestor-or-self::*[1]/preceding::label[1]', el, null,
+                              XPathResult.FIRST_ORDERED_NODE_TYPE, null);
+    return txt(r.singleNodeValue);
+  } catch (e) { return ''; }
+}
+var out = [];
+for (var i = 0; i < els.length; i++) {
+  var el = els[i];
+  var f = {
+    index: i,
+    tag: el.tagName.toLowerCase(),
+    type: (el.getAttribute('type') || (el.tagName === 'TEXTAREA' ? 'textarea' : '')).toLowerCase(),
+    name: el.getAttribute('name') || '',
+    id: el.getAttribute('id') || '',
+    placeholder: el.getAttribute('placeholder') || '',
+    label: labelOf(el),
+    required: el.hasAttribute('required'),
+    readonly: el.hasAttribute('readonly'),
+    disabled: el.hasAttribute('disabled'),
+    value: el.value || '',
+    checked: !!el.checked,
+    options: []
+  };
+  if (f.tag === 'select') {
+    for (var j = 0; j < el.options.length; j++) {
+      f.options.push({text: txt(el.options[j]), value: el.options[j].value || ''});
+    }
+  }
+  out.push(f);
+}
+return out;
+"""
+
+# One round-trip: apply a list of fill ops (by snapshot index) to the same form.
+APPLY_FILL_PLAN_JS = r"""
+var form = arguments[0], ops = arguments[1];
+var els = form.querySelectorAll('input, select, textarea');
+var applied = 0;
+function fire(el, type) { try { el.dispatchEvent(new Event(type, {bubbles: true})); } catch (e) {} }
+for (var k = 0; k < ops.length; k++) {
+  var op = ops[k], el = els[op.index];
+  if (!el) { continue; }
+  try {
+    if (op.op === 'text') {
+      if (el.readOnly || el.disabled || (op.if_empty && el.value.trim())) { continue; }
+      el.focus && el.focus();
+      el.value = op.value;
+      fire(el, 'input'); fire(el, 'change');
+    } else if (op.op === 'check') {
+      if (!el.checked) { el.click(); }
+    } else if (op.op === 'select') {
+      el.selectedIndex = op.value;
+      fire(el, 'change');
+    }
+    applied++;
+  } catch (e) {}
+}
+return applied;
+"""
 
 
-def label_text_for(driver, elem) -> str:
-    try:
-        eid = elem.get_attribute("id")
-        if eid:
-            lbl = driver.find_elements(By.XPATH, f"//label[@for='{eid}']")
-            if lbl:
-                return lbl[0].text.strip()
-    except Exception:
-        pass
+def snapshot_form_inputs(driver, form) -> List[dict]:
+    """Return one dict per form control (see SNAPSHOT_FORM_JS) from a single script call."""
     try:
-        # Try closest preceding label within same container
-        lbl = elem.find_element(By.XPATH, "ancestor-or-self::*[1]/preceding::label[1]")
-        return lbl.text.strip()
-    except Exception:
-        return ""
-
-
-def heuristic_fill_form(driver, form, user_data: dict) -> None:
-    inputs = form.find_elements(By.XPATH, ".//input | .//select | .//textarea")
-    for el in inputs:
-        tag = el.tag_name.lower()
-        itype = (el.get_attribute("type") or "").lower()
-        name = (el.get_attribute("name") or "").lower()
-        pid = (el.get_attribute("id") or "").lower()
-        placeholder = (el.get_attribute("placeholder") or "").lower()
-        label = label_text_for(driver, el).lower()
-
+        return driver.execute_script(SNAPSHOT_FORM_JS, form) or []
+    except Exception as e:
+        evt(f"[form] Snapshot failed: {e}")
+        return []
+
+
+def plan_form_fills(fields: List[dict], user_data: dict) -> List[dict]:
+    """Decide what to fill purely from a snapshot. Returns ops for APPLY_FILL_PLAN_JS.
+    The ops do not depend on what the page had prefilled or prechecked (they are cached
+    and replayed): every control that should end up checked gets a check op, and required
+    fallbacks are "if_empty" text ops; the script skips the ones that are already satisfied."""
+    # Simulated control state so later decisions see earlier ones (radio groups)
+    checked = {f["index"]: bool(f.get("checked")) for f in fields}
+    text_ops: dict = {}
+    if_empty: set = set()
+    select_ops: dict = {}
+    check_ops: List[int] = []
+
+    def set_text(f: dict, value: str, only_if_empty: bool = False) -> None:
+        if f.get("readonly") or f.get("disabled") or f["type"] == "hidden":
+            return
+        text_ops[f["index"]] = value
+        if only_if_empty:
+            if_empty.add(f["index"])
+        else:
+            if_empty.discard(f["index"])
+
+    def click(f: dict) -> None:
+        if f["type"] == "radio":
+            for g in fields:
+                if g["type"] == "radio" and g["name"] == f["name"]:
+                    checked[g["index"]] = False
+        checked[f["index"]] = True
+
+    desired = (user_data.get("child_gender", "") or "").strip().lower()
+    gender_role = None
+    if desired in ["남", "남자", "m", "male"]:
+        gender_role = "gender_male"
+    elif desired in ["여", "여자", "f", "female"]:
+        gender_role = "gender_female"
+
+    for f in fields:
         # Skip hidden inputs
-        if itype in ("hidden",):
+        if f["type"] in ("hidden",):
             continue
 
-        # Checkboxes: auto-check anything that looks like agreement
-        if itype == "checkbox":
-            text_blob = " ".join([name, pid, placeholder, label])
-            if any(k in text_blob for k in ["agree", "동의", "약관", "개인정보", "동의함", "chkall", "checkall", "all"]):
-                try:
-                    if not el.is_selected():
-                        el.click()
-                except Exception:
-                    pass
+        # Selects: pick first non-empty option or one matching child name
+        if f["tag"] == "select":
+            options = f.get("options") or []
+            target_text = user_data.get("child_name", "")
+            chosen = None
+            if target_text:
+                for j, opt in enumerate(options):
+                    if target_text in (opt.get("text") or ""):
+                        chosen = j
+                        break
+            if chosen is None:
+                for j, opt in enumerate(options):
+                    if (opt.get("value") or "").strip():
+                        chosen = j
+                        break
+            if chosen is not None:
+                select_ops[f["index"]] = chosen
             continue
 
-        # Radios: prefer first or one matching child/parent options (leave as-is if already selected)
-        if itype == "radio":
-            try:
-                if not el.is_selected():
-                    desired = (user_data.get("child_gender", "") or "").strip()
-                    text_blob = (name + pid + label).lower()
-                    # Consent radios: prefer selecting (yes) by default
-                    if "agree" in text_blob and not el.is_selected():
-                        el.click()
-                    if desired:
-                        if desired in ["남", "남자", "m", "male"] and any(k in text_blob for k in ["남", "남자", "male", "m"]):
-                            el.click()
-                        elif desired in ["여", "여자", "f", "female"] and any(k in text_blob for k in ["여", "여자", "female", "f"]):
-                            el.click()
-                    # If still not selected and looks required, choose it
-                    if not el.is_selected() and any(k in text_blob for k in ["필수", "required", "성별", "남", "여"]):
-                        el.click()
-            except Exception:
-                pass
+        kind = control_kind(f)
+        if not kind:
             continue
+        matches = classify_field(f)
+        roles = [role for role, _ in matches]
 
-        # Selects: pick first non-empty option or one matching child name
-        if tag == "select":
-            try:
-                options = el.find_elements(By.TAG_NAME, "option")
-                # Prefer option containing child name
-                target_text = user_data.get("child_name", "")
-                chosen = None
-                if target_text:
-                    for opt in options:
-                        if target_text in (opt.text or ""):
-                            chosen = opt
-                            break
-                if not chosen:
-                    for opt in options:
-                        val = (opt.get_attribute("value") or "").strip()
-                        if val:
-                            chosen = opt
-                            break
-                if chosen:
-                    chosen.click()
-            except Exception:
-                pass
+        # Checkboxes: auto-check anything that looks like agreement
+        if kind == "checkbox":
+            if "consent" in roles:
+                click(f)
             continue
 
-        # Text-like inputs/textarea (primary mapping)
-        if itype in ("text", "tel", "email") or tag == "textarea" or itype == "":
-            text_blob = " ".join([name, pid, placeholder, label])
-            value = ""
-            # Child name
-            if any(k in text_blob for k in ["자녀", "아동", "아이"]) and any(k in text_blob for k in ["이름", "성명", "name"]):
-                value = user_data.get("child_name", "")
-            # Parent name
-            elif any(k in text_blob for k in ["보호자", "신청자", "이름", "성명"]) and "자녀" not in text_blob:
-                value = user_data.get("name", "")
-            # Age
-            elif any(k in text_blob for k in ["나이", "개월", "연령", "age"]):
-                value = user_data.get("child_age", "")
-            # Phone
-            elif any(k in text_blob for k in ["휴대", "연락처", "전화", "핸드폰", "tel", "phone"]):
-                value = user_data.get("phone", "")
-            # Email
-            elif any(k in text_blob for k in ["email", "이메일"]):
-                value = user_data.get("email", "")
-            # Address
-            elif any(k in text_blob for k in ["주소", "address"]):
-                value = user_data.get("address", "")
+        # Radios: consent "yes", the child's gender, then anything that looks required
+        # (leave as-is if already selected)
+        if kind == "radio":
+            i = f["index"]
+            if not checked[i]:
+                if "consent" in roles:
+                    click(f)
+                if gender_role and gender_role in roles:
+                    click(f)
+                if not checked[i] and "required_choice" in roles:
+                    click(f)
+            continue
 
+        # Text-like inputs/textarea: highest-priority role with a value source
+        for role, source in matches:
+            value = user_data.get(source, "") if source else ""
             # Fallback: leave empty if we don't have confident mapping
             if value:
-                fill_text(el, value)
+                set_text(f, value)
+            break
 
-    # Birth date split fields: try year/month/day
+    # Birth date split fields: try year/month/day (later parts win on overlap, as before)
     birth = user_data.get("child_birth", "").replace("/", "-")
     if birth and len(birth) in (8, 10):
         if len(birth) == 8:
             y, m, d = birth[:4], birth[4:6], birth[6:8]
         else:
             y, m, d = birth.split("-")
-        for yq in ["birth", "생년", "년", "year", "yy"]:
-            for el in form.find_elements(By.XPATH, f".//input[contains(translate(@name,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), '{yq}')]"):
-                fill_text(el, y)
-        for mq in ["월", "month", "mm"]:
-            for el in form.find_elements(By.XPATH, f".//input[contains(translate(@name,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), '{mq}')]"):
-                fill_text(el, m)
-        for dq in ["일", "day", "dd"]:
-            for el in form.find_elements(By.XPATH, f".//input[contains(translate(@name,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), '{dq}')]"):
-                fill_text(el, d)
+        for part, queries in ((y, ["birth", "생년", "년", "year", "yy"]), (m, ["월", "month", "mm"]), (d, ["일", "day", "dd"])):
+            for f in fields:
+                if f["tag"] == "input" and any(q in f["name"].lower() for q in queries):
+                    set_text(f, part)
 
     # Second pass: ensure required-like fields are not empty
-    inputs2 = form.find_elements(By.XPATH, ".//input | .//textarea")
-    for el in inputs2:
+    for f in fields:
+        if f["tag"] == "select" or f.get("readonly") or f.get("disabled"):
+            continue
+        itype = f["type"]
+        if itype in ("hidden", "checkbox", "radio", "submit", "button", "reset", "image", "file"):
+            continue
+        label = f["label"].lower()
+        required = bool(f.get("required") or ("*" in label) or ("필수" in label))
+        if not required or f["index"] in text_ops:
+            continue
+        # Type-appropriate fallback, applied only if the field is empty at fill time
+        if itype == "email":
+            set_text(f, user_data.get("email", "test@example.com"), only_if_empty=True)
+        elif itype in ("tel", "number"):
+            fallback = re.sub(r"\D", "", user_data.get("phone", "01012345678"))
+            set_text(f, fallback or "01012345678", only_if_empty=True)
+        else:  # text/textarea/unknown
+            set_text(f, user_data.get("name") or user_data.get("child_name") or "자동입력", only_if_empty=True)
+
+    # Final state of each checkbox/radio group; already-checked ones are no-ops in the script
+    for f in fields:
+        if f["type"] in ("checkbox", "radio") and checked[f["index"]]:
+            check_ops.append(f["index"])
+
+    ops: List[dict] = []
+    ops += [dict({"index": i, "op": "text", "value": v}, **({"if_empty": True} if i in if_empty else {}))
+            for i, v in text_ops.items()]
+    ops += [{"index": i, "op": "select", "value": j} for i, j in select_ops.items()]
+    ops += [{"index": i, "op": "check"} for i in check_ops]
+    return ops
+
+
+def apply_fill_plan(driver, form, ops: List[dict]) -> int:
+    """Send all fill ops back in one script call. Returns the number applied."""
+    if not ops:
+        return 0
+    try:
+        return int(driver.execute_script(APPLY_FILL_PLAN_JS, form, ops) or 0)
+    except Exception as e:
+        evt(f"[form] Batched fill failed: {e}")
+        return 0
+
+
+def heuristic_fill_form(driver, form, user_data: dict) -> dict:
+    """Snapshot the form, plan fills in Python, apply them in one call.
+    A form whose structural fingerprint is in the schema cache skips snapshot and
+    planning and gets the stored plan. Returns a per-phase timing report (ms) which
+    is also written to the event log.
+    """
+    t0 = time.perf_counter()
+    fp = form_fingerprint(driver, form) if FORM_CACHE else None
+    ops = lookup_plan(fp, user_data)
+    cache = "hit" if ops else ("miss" if FORM_CACHE else "off")
+    fields: List[dict] = []
+    t1 = time.perf_counter()
+    if ops is None:
+        fields = snapshot_form_inputs(driver, form)
+        t1 = time.perf_counter()
+        ops = plan_form_fills(fields, user_data)
+    t2 = time.perf_counter()
+    applied = apply_fill_plan(driver, form, ops)
+    t3 = time.perf_counter()
+    if cache == "miss" and applied:
+        remember_plan(fp, fields, ops, user_data)
+    report = {
+        "cache": cache,
+        "fingerprint": fp,
+        "fields": len(fields),
+        "ops": len(ops),
+        "applied": applied,
+        "snapshot_ms": round((t1 - t0) * 1000, 1),
+        "plan_ms": round((t2 - t1) * 1000, 1),
+        "apply_ms": round((t3 - t2) * 1000, 1),
+        "total_ms": round((t3 - t0) * 1000, 1),
+    }
+    evt(
+        f"[form] fill timing: snapshot={report['snapshot_ms']}ms plan={report['plan_ms']}ms "
+        f"apply={report['apply_ms']}ms total={report['total_ms']}ms "
+        f"(schema cache {cache}{' ' + fp if fp else ''}, fields={report['fields']}, ops={report['ops']},"
+        f" applied={report['applied']})",
+        dur_ms=report["total_ms"], **{k: report[k] for k in ("cache", "snapshot_ms", "plan_ms", "apply_ms")}
+    )
+    return report
+
+
+# Deferred so an alert raised by the page's submit function (e.g. checkIt) does not
+# interrupt the script call; the caller handles it with wait_alert_and_accept.
+PLAN_SUBMIT_JS = r"""
+var fn = arguments[0], name = arguments[1];
+if (fn && typeof window[fn] === 'function') { setTimeout(function() { window[fn](); }, 0); return 'function'; }
+var f = name ? document.forms[name] : null;
+if (f) { setTimeout(function() { f.submit(); }, 0); return 'form'; }
+return null;
+"""
+
+
+# The named form once parsed; false when the document is past 'loading' without it
+# (definitely not this page), null while it may still arrive.
+PLAN_FORM_JS = r"""
+var f = arguments[0] ? document.forms[arguments[0]] : null;
+if (f && (f.nextSibling || document.readyState !== 'loading')) { return f; }
+return document.readyState === 'loading' ? null : false;
+"""
+
+
+def prepare_submission_plan(path: str = PLAN_FILE) -> Optional[dict]:
+    """Load the compiled plan for TARGET_URL's sn and precompute its fill ops."""
+    plan = load_plan(path, _target_sn())
+    if plan is None:
+        return None
+    if plan.get("apply_url"):
+        plan["apply_url"] = _rebase(plan["apply_url"])
+    plan["ops"] = plan_form_fills(plan.get("fields") or [], USER_DATA)
+    evt(f"[plan] Loaded {path}: {describe_plan(plan)}, {len(plan['ops'])} precomputed ops")
+    return plan
+
+
+def plan_fill_and_submit(driver, timeout: float = 5) -> Optional[bool]:
+    """Fill the planned form with precomputed ops and call its submit function.
+    None when there is no plan or the live form does not match it (caller falls back)."""
+    plan = SUBMISSION_PLAN
+    if not plan:
+        return None
+    t0 = time.perf_counter()
+    name = plan["form"].get("name")
+    form = None
+    end = time.monotonic() + timeout
+    # Only poll while the document is still loading; a loaded page without the form ends at once
+    while form is None and time.monotonic() < end:
         try:
-            if el.get_attribute("readonly") or el.get_attribute("disabled"):
-                continue
-            val = (el.get_attribute("value") or "").strip()
-            itype = (el.get_attribute("type") or "").lower()
-            name = (el.get_attribute("name") or "").lower()
-            label = label_text_for(driver, el).lower()
-            required = bool(el.get_attribute("required") or ("*" in label) or ("필수" in label))
-            if not required:
-                continue
-            if val:
-                continue
-            # Fill with type-appropriate fallback
-            if itype == "email":
-                fill_text(el, user_data.get("email", "test@example.com"))
-            elif itype in ("tel", "number"):
-                fallback = re.sub(r"\D", "", user_data.get("phone", "01012345678"))
-                if not fallback:
-                    fallback = "01012345678"
-                fill_text(el, fallback)
-            else:  # text/textarea/unknown
-                fb = user_data.get("name") or user_data.get("child_name") or "자동입력"
-                fill_text(el, fb)
+            form = driver.execute_script(PLAN_FORM_JS, name)
         except Exception:
-            continue
+            pass
+        if form is None:
+            time.sleep(0.05)
+    if form is False:
+        evt(f"[plan] Form '{name}' not on this page; using heuristics")
+        return None
+    if form is None:
+        evt(f"[plan] Page still loading after {timeout:.0f}s without form '{name}'; using heuristics")
+        return None
+    fp = form_fingerprint(driver, form)
+    if fp != plan["form"].get("fingerprint"):
+        evt(f"[plan] Form '{name}' changed since compile ({fp} != {plan['form'].get('fingerprint')}); using heuristics")
+        return None
+    applied = apply_fill_plan(driver, form, plan["ops"])
+    try:
+        how = driver.execute_script(PLAN_SUBMIT_JS, (plan.get("submit") or {}).get("function"), name)
+    except Exception as e:
+        evt(f"[plan] Submit call failed: {e}")
+        how = None
+    ms = (time.perf_counter() - t0) * 1000
+    evt(f"[plan] Filled {applied}/{len(plan['ops'])} ops and submitted via {how or 'nothing'} in {ms:.0f}ms", dur_ms=ms)
+    return bool(how)
 
 
 def submit_current_form(driver, timeout=10) -> bool:
@@ -751,10 +982,133 @@ def is_disconnect_error(e: Exception) -> bool:
     return any(t in s for t in tokens)
 
 
-def bot_session(headless: bool = True) -> None:
-    driver = build_driver(headless=headless)
+class StandbyPool:
+    """Warm standby drivers, logged in and parked on TARGET_URL, so a disconnect
+    becomes a handle swap instead of Chrome startup + login + navigation.
+    Refills run in a background thread to keep them off the hot path."""
+
+    def __init__(self, size: int, headless: bool = True, lean: bool = True):
+        self.size = max(0, int(size))
+        self.headless = headless
+        self.lean = lean
+        self.drivers: List = []
+        self._lock = threading.Lock()
+        self._filling = False
+        self._closed = False
+
+    def _warm_one(self):
+        t0 = time.monotonic()
+        d = build_driver(headless=self.headless, lean=self.lean, page_load_strategy=PAGE_LOAD_STRATEGY)
+        try:
+            login_with_store(d, lambda: ensure_login(d, USERNAME, PASSWORD, login_url=LOGIN_URL, log=evt), _site_base(), path=COOKIE_PATH, log=evt)
+            navigate(d, TARGET_URL, "view", kind="standby_view", timings=NAV_TIMINGS)
+            inject_same_tab_policy(d)
+            if self.lean:
+                set_lean_profile(d, True, offsite_hosts(d, _site_host()))
+        except Exception:
+            try:
+                d.quit()
+            except Exception:
+                pass
+            raise
+        ms = (time.monotonic() - t0) * 1000
+        evt(f"[standby] Driver warmed in {ms:.0f}ms", dur_ms=ms)
+        return d
+
+    def fill(self) -> None:
+        while not self._closed:
+            with self._lock:
+                if len(self.drivers) >= self.size:
+                    return
+            try:
+                d = self._warm_one()
+            except Exception as e:
+                evt(f"[standby] Warm-up failed: {e}")
+                return
+            with self._lock:
+                if self._closed:
+                    try:
+                        d.quit()
+                    except Exception:
+                        pass
+                    return
+                self.drivers.append(d)
+
+    def fill_async(self) -> None:
+        with self._lock:
+            if self._filling or self._closed or len(self.drivers) >= self.size:
+                return
+            self._filling = True
+
+        def _run():
+            try:
+                self.fill()
+            finally:
+                with self._lock:
+                    self._filling = False
+
+        threading.Thread(target=_run, name="standby-fill", daemon=True).start()
+
+    def take(self):
+        with self._lock:
+            return self.drivers.pop(0) if self.drivers else None
+
+    def keepalive(self, refresh: bool = False) -> None:
+        """Ping (or refresh, to keep the server session alive) each standby; drop dead ones.
+        Each standby is pinged under the pool lock, so take() never hands out a driver
+        that is mid-refresh or about to be quit; it waits for that one ping instead."""
+        with self._lock:
+            drivers = list(self.drivers)
+        for d in drivers:
+            dead = None
+            with self._lock:
+                if d not in self.drivers:
+                    continue
+                try:
+                    if refresh:
+                        navigate(d, None, "view", kind="standby_refresh", timings=NAV_TIMINGS)
+                        inject_same_tab_policy(d)
+                    else:
+                        d.execute_script("return 1")
+                except Exception as e:
+                    if is_disconnect_error(e):
+                        dead = e
+                        self.drivers.remove(d)
+            if dead is None:
+                continue
+            evt(f"[standby] Dropping disconnected standby: {dead}")
+            try:
+                d.quit()
+            except Exception:
+                pass
+        self.fill_async()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            drivers, self.drivers = self.drivers, []
+        for d in drivers:
+            try:
+                d.quit()
+            except Exception:
+                pass
+
+
+def bot_session(
+    headless: bool = True,
+    watch_mode: str = "http",
+    pool: Optional[StandbyPool] = None,
+    failover_t0: Optional[float] = None,
+    lean: bool = True,
+) -> None:
+    global SUBMISSION_PLAN
+    driver = pool.take() if pool is not None else None
+    warm = driver is not None
+    if driver is None:
+        driver = build_driver(headless=headless, lean=lean, page_load_strategy=PAGE_LOAD_STRATEGY)
+    perf = PerfCapture(prefix="har")
     try:
-        evt("[session] Driver started")
+        evt("[session] Using warm standby driver" if warm else "[session] Driver started")
         # Versions/capabilities
         try:
             caps = getattr(driver, 'capabilities', {}) or {}
@@ -780,12 +1134,22 @@ def bot_session(headless: bool = True) -> None:
         except Exception:
             pass
 
-        ensure_login(driver, USERNAME, PASSWORD)
-
-        # Navigate and optionally wait until the scheduled time
-        driver.get(TARGET_URL)
-        evt(f"[nav] {TARGET_URL}")
-        inject_same_tab_policy(driver)
+        if not warm:
+            login_with_store(driver, lambda: ensure_login(driver, USERNAME, PASSWORD, login_url=LOGIN_URL, log=evt), _site_base(), path=COOKIE_PATH, log=evt)
+
+            # Navigate and optionally wait until the scheduled time
+            navigate(driver, TARGET_URL, "view", timings=NAV_TIMINGS)
+            evt(f"[nav] {TARGET_URL}")
+            inject_same_tab_policy(driver)
+        # Lean profile while watching; a warm standby is already lean, so skip the comparison reload
+        lean_on = lean and enter_lean_profile(driver, report=not warm and failover_t0 is None)
+        if failover_t0 is not None:
+            ms = (time.monotonic() - failover_t0) * 1000
+            evt(f"[failover] {'Warm swap' if warm else 'Cold restart'} ready in {ms:.0f}ms", dur_ms=ms, warm=warm)
+        if pool is not None:
+            pool.fill_async()
+        if SUBMISSION_PLAN is None:
+            SUBMISSION_PLAN = prepare_submission_plan(PLAN_PATH)
 
         start_at_dt: Optional[datetime] = None
         if START_AT:
@@ -795,100 +1159,232 @@ def bot_session(headless: bool = True) -> None:
                 evt(f"Invalid START_AT format: {START_AT}")
                 raise
 
+        # HTTP session with the browser's cookies: status polling and clock sampling
+        http_sess = None
+        try:
+            http_sess = session_from_driver(driver)
+        except Exception as e:
+            evt(f"[http] Could not build HTTP session from browser cookies: {e}")
+
+        # Schedule against the site's clock (Date header), not just the local one
+        clock = ClockSync()
+        if start_at_dt and http_sess is not None:
+            clock.sample(http_sess, TARGET_URL)
+            evt(f"[clock] {clock.describe()}")
+
         if start_at_dt:
             pre_time = start_at_dt - timedelta(minutes=5)
-            now = datetime.now()
-            if now < pre_time:
+            if _deadline_ns(pre_time, clock) > time.monotonic_ns():
                 evt(f"[wait] Until pre-window {pre_time.isoformat()} (5m before start). Refresh every 10m.")
-                wait_until_with_refresh(driver, pre_time, refresh_interval_sec=600, start_dt=start_at_dt)
+                wait_until_with_refresh(
+                    driver, pre_time, refresh_interval_sec=600, start_dt=start_at_dt, clock=clock, standby=pool,
+                    perf=perf,
+                )
 
         # Phase 2: aggressive watch/click loop from 5m before until 5m after start
         evt("[poll] Aggressive watch from 5m before start (5s cadence)")
-        end_time = (start_at_dt + timedelta(minutes=5)) if start_at_dt else (datetime.now() + timedelta(minutes=30))
-        last_refresh = 0.0
-        last_flag_try = 0.0
-        rate_backoff = 12
-        while datetime.now() < end_time:
+        # HTTP watch: poll the view HTML with the browser's cookies and only touch
+        # Chrome once the status block flips to '신청'.
+        sess = http_sess if watch_mode == "http" else None
+        validators: dict = {}
+        if sess is not None:
+            evt("[poll] HTTP watch mode (browser refresh only after '신청' appears)")
+        elif watch_mode == "http":
+            evt("[poll] No HTTP session; using browser refresh")
+        # One monotonic timer drives polls, keepalive/detect ticks, the open deadline,
+        # direct-apply probes and the end-of-window timeout.
+        sched = Scheduler()
+        st = {"browser_armed": sess is None, "unknown_polls": 0, "rate_backoff": 12, "lean": lean_on}
+
+        def backoff(reason: str) -> None:
+            evt(f"[backoff] {reason}, sleeping {st['rate_backoff']}s")
+            time.sleep(st["rate_backoff"])
+            st["rate_backoff"] = min(st["rate_backoff"] * 2, 60)
+
+        def open_lead() -> float:
+            # Led by half the RTT so the first request lands on time
+            return (clock.rtt() or 0.0) / 2
+
+        def poll_job() -> None:
             # 5-second refresh cadence with jitter in pre-window
-            if time.time() - last_refresh > (5.0 + random.uniform(-1.0, 1.0)):
-                try:
-                    driver.refresh()
-                except Exception:
-                    evt("[driver] Refresh failed (driver may be gone); retrying later")
-                last_refresh = time.time()
-                time.sleep(0.1)
-                # Re-apply popup suppression after navigation
+            poll = None
+            if sess is not None:
                 try:
-                    inject_same_tab_policy(driver)
-                except Exception:
-                    pass
-
-            # Lightweight keepalive to detect silent disconnects early
+                    poll = poll_apply_state(sess, TARGET_URL, validators=validators)
+                    if clock.add_sample(poll["date"], poll["sent_at"], poll["recv_at"]) and "open" in sched.timers:
+                        sched.at("open", _deadline_ns(start_at_dt, clock, open_lead()), open_job)
+                    evt(
+                        f"[poll] http {poll['status']} {poll['state']}"
+                        f"{' (304)' if poll['not_modified'] else ''} {poll['bytes']}B"
+                        f"{' partial' if poll['truncated'] else ''} decision={poll['decision_ms']}ms"
+                        f" total={poll['elapsed_ms']}ms",
+                        dur_ms=poll["elapsed_ms"], state=poll["state"], status=poll["status"],
+                    )
+                except Exception as e:
+                    evt(f"[poll] HTTP poll failed: {e}; refreshing browser instead")
+                if poll is not None and poll["logged_out"]:
+                    evt("[poll] HTTP session logged out; re-syncing cookies and refreshing browser")
+                    poll = None
+                    try:
+                        session_from_driver(driver, sess)
+                    except Exception:
+                        pass
+                if poll is not None and poll["rate_limited"]:
+                    backoff("HTTP 429 on poll")
+                    return
+            if poll is not None and poll["state"] in ("pending", "closed"):
+                st["unknown_polls"] = 0
+                st["browser_armed"] = False
+                return
+            if poll is not None and poll["state"] == "unknown":
+                # No btn-grp in the response (markup change, login/error page): HTTP cannot
+                # tell, so the browser refreshes and detects instead
+                st["unknown_polls"] += 1
+                evt(f"[poll] HTTP state unknown ({st['unknown_polls']} in a row); refreshing browser instead")
+                poll = None
+            if poll is not None:
+                st["unknown_polls"] = 0
+                LATENCY.mark("flip")
+                evt(f"[state] HTTP poll shows '신청' ({poll['elapsed_ms']}ms) — loading in browser")
             try:
-                driver.execute_script("return 1")
-            except Exception as e:
-                if is_disconnect_error(e):
-                    raise
-                evt(f"[driver] Non-fatal script error: {e}")
+                with LATENCY.span("refresh_view"):
+                    navigate(driver, None, "view", kind="refresh_watch", timings=NAV_TIMINGS)
+            except Exception:
+                evt("[driver] Refresh failed (driver may be gone); retrying later")
+            st["browser_armed"] = True
+            # Re-apply popup suppression after navigation
+            try:
+                inject_same_tab_policy(driver)
+            except Exception:
+                pass
 
-            apply_el = find_apply_element(driver)
-            if apply_el:
-                evt("[state] '신청' detected — attempting to click")
+        def tick_job() -> None:
+            if not st["browser_armed"]:
+                # Lightweight keepalive to detect silent disconnects early
                 try:
-                    pre_handles = driver.window_handles[:]
-                except Exception:
-                    evt("[driver] Could not read window handles before click; continuing without switch aid")
-                    pre_handles = []
+                    driver.execute_script("return 1")
+                except Exception as e:
+                    if is_disconnect_error(e):
+                        raise
+                    evt(f"[driver] Non-fatal script error: {e}")
+                return
+            # One in-page wait until the next other timer is due (also serves as keepalive)
+            with LATENCY.span("detection"):
+                apply_el, watcher_ok = wait_apply_element(driver, min(1.0, sched.next_due_s(exclude="tick") or 0.0))
+                if not watcher_ok:
+                    apply_el = find_apply_element(driver)
+            if not apply_el:
+                return
+            # Browser watch: the first detection is the flip
+            LATENCY.mark("flip")
+            evt("[state] '신청' detected — attempting to click")
+            try:
+                pre_handles = driver.window_handles[:]
+            except Exception:
+                evt("[driver] Could not read window handles before click; continuing without switch aid")
+                pre_handles = []
+            # Mark the view document so the form predicate below cannot match its search form
+            try:
+                driver.execute_script(MARK_JS)
+            except Exception:
+                pass
+            t_click = time.perf_counter()
+            with LATENCY.span("safe_click"):
                 safe_click(driver, apply_el)
+            with LATENCY.span("alert") as sp:
                 msg = wait_alert_and_accept(driver, timeout=1)
-                if msg:
-                    evt(f"[alert] {msg}")
-                    if is_rate_limited_message(msg):
-                        evt(f"[backoff] Rate-limited, sleeping {rate_backoff}s")
-                        time.sleep(rate_backoff)
-                        rate_backoff = min(rate_backoff * 2, 60)
-                        continue
+                sp["alert"] = bool(msg)
+            if msg:
+                evt(f"[alert] {msg}")
+                if is_rate_limited_message(msg):
+                    backoff("Rate-limited")
+                    return
+            with LATENCY.span("switch_to_new_window_if_any"):
                 switch_to_new_window_if_any(driver, pre_handles, timeout=2)
+            # With pageLoadStrategy none/eager nothing has waited for the page the click opened
+            with LATENCY.span("wait_form_page") as sp:
+                try:
+                    sp["ready"] = wait_ready(driver, "form", timeout=5)
+                except Exception as e:
+                    sp["ready"] = f"error: {e}"
+            NAV_TIMINGS.record("apply_click", (time.perf_counter() - t_click) * 1000, ok=sp["ready"] == "ready")
+            if sp["ready"] == "alert":
+                msg = wait_alert_and_accept(driver, timeout=1)
+                evt(f"[alert] {msg}")
+            elif sp["ready"] != "ready":
+                evt(f"[nav] Form page after click not ready ({sp['ready']}); continuing")
+            with LATENCY.span("maybe_switch_iframe"):
                 maybe_switch_iframe(driver)
-                # CAPTCHA detection
-                if detect_captcha(driver):
-                    evt("[captcha] Detected. Saving snapshot and backing off 30s")
-                    try:
-                        with open("logs/captcha_page.html", "w", encoding="utf-8") as f:
-                            f.write(driver.page_source)
-                    except Exception:
-                        pass
-                    try:
-                        driver.save_screenshot("logs/captcha_page.png")
-                    except Exception:
-                        pass
-                    time.sleep(30)
-                    continue
-                break
+            # CAPTCHA detection
+            with LATENCY.span("detect_captcha"):
+                captcha = detect_captcha(driver)
+            if captcha:
+                evt("[captcha] Detected. Saving snapshot and backing off 30s")
+                if st["lean"]:
+                    # Captcha images are blocked on the lean profile
+                    restore_full_profile(driver, "captcha")
+                    st["lean"] = False
+                try:
+                    with open("logs/captcha_page.html", "w", encoding="utf-8") as f:
+                        f.write(driver.page_source)
+                except Exception:
+                    pass
+                try:
+                    driver.save_screenshot("logs/captcha_page.png")
+                except Exception:
+                    pass
+                time.sleep(30)
+                return
+            sched.stop("clicked")
 
-            # Once actual start time has passed, also probe direct apply flags every ~5s
-            if start_at_dt and datetime.now() >= start_at_dt and (time.time() - last_flag_try > (5.0 + random.uniform(-1.0, 1.0))):
-                last_flag_try = time.time()
-                if try_direct_apply(driver):
-                    break
+        def direct_apply_job() -> None:
+            with LATENCY.span("try_direct_apply") as sp:
+                sp["ok_apply"] = try_direct_apply(driver)
+            if sp["ok_apply"]:
+                sched.stop("direct_apply")
 
-            # very small backoff
-            time.sleep(0.2)
+        def open_job() -> None:
+            wake_err_ms = (clock.server_now() + open_lead() - start_at_dt.timestamp()) * 1000
+            evt(f"[clock] Open time reached: wake error {wake_err_ms:+.0f}ms ({clock.describe()})", wake_err_ms=wake_err_ms)
+            # Once actual start time has passed, also probe direct apply flags every ~5s
+            sched.every("direct_apply", 5.0, direct_apply_job, jitter_s=1.0, first_in_s=0)
+
+        sched.every("poll", 5.0, poll_job, jitter_s=1.0, first_in_s=0)
+        sched.every("tick", 0.2, tick_job, first_in_s=0.1)
+        if pool is not None:
+            sched.every("standby", 30.0, pool.keepalive)
+        # Drain Chrome's bounded performance-log buffer while idle between jobs
+        sched.every("perf", 5.0, lambda: perf.drain(driver))
+        if start_at_dt:
+            sched.at("open", _deadline_ns(start_at_dt, clock, open_lead()), open_job)
+            sched.at("end", _deadline_ns(start_at_dt + timedelta(minutes=5), clock), lambda: sched.stop("timeout"))
         else:
+            sched.after("end", 30 * 60, lambda: sched.stop("timeout"))
+        outcome = sched.run()
+        evt(f"[sched] {outcome}; jitter {sched.describe_stats()}")
+        if outcome == "timeout":
             evt("[timeout] '신청' state did not appear in time")
             return
+        if st["lean"]:
+            restore_full_profile(driver, "before form interaction")
 
         # At this point, either a confirmation flow or a form is expected
         evt("[followup] Handling follow-up flow")
 
-        # If redirected to a form page, fill heuristically
-        for _ in range(3):
+        # Compiled plan first: fill known fields and call the known submit function
+        with LATENCY.span("plan_fill_and_submit") as sp:
+            submitted = plan_fill_and_submit(driver)
+            sp["submitted"] = submitted
+        # Otherwise, if redirected to a form page, fill heuristically
+        for _ in range(3 if submitted is None else 0):
             try:
                 forms = driver.find_elements(By.TAG_NAME, "form")
                 if forms:
                     evt(f"[form] Found {len(forms)} form(s) — filling heuristically")
-                    heuristic_fill_form(driver, forms[0], USER_DATA)
-                    agree_all(driver)
+                    with LATENCY.span("heuristic_fill_form"):
+                        heuristic_fill_form(driver, forms[0], USER_DATA)
+                    with LATENCY.span("agree_all"):
+                        agree_all(driver)
                     break
                 # Wait a moment for dynamic content
                 WebDriverWait(driver, 2).until(EC.presence_of_element_located((By.XPATH, "//form | //a[contains(@href,'checkIt')]")))
@@ -897,25 +1393,35 @@ def bot_session(headless: bool = True) -> None:
             time.sleep(0.5)
 
         # Try to submit
-        submitted = submit_current_form(driver)
+        if submitted is None:
+            with LATENCY.span("submit_current_form"):
+                submitted = submit_current_form(driver)
         if submitted:
             evt("[submit] Submission attempted — waiting for result")
             # Wait for an alert/redirect indicating success or failure
-            msg = wait_alert_and_accept(driver, timeout=3)
+            with LATENCY.span("result_alert") as sp:
+                msg = wait_alert_and_accept(driver, timeout=3)
+                sp["alert"] = bool(msg)
+            LATENCY.mark("result")
             if msg:
                 evt(f"[result] {msg}")
                 if is_rate_limited_message(msg):
                     evt("[backoff] Rate-limited on submit, sleeping 12s")
                     time.sleep(12)
             # Verify on MyPage
-            verify_success_on_mypage(driver)
+            with LATENCY.span("verify_success_on_mypage"):
+                verify_success_on_mypage(driver)
             # Give time for redirect if any
             time.sleep(1)
         else:
             evt("[submit] Could not find a submit control — trying direct apply flags.")
-            if try_direct_apply(driver):
+            with LATENCY.span("try_direct_apply") as sp:
+                sp["ok_apply"] = try_direct_apply(driver)
+            if sp["ok_apply"]:
+                LATENCY.mark("result")
                 evt("[submit] Completed via apply flags.")
-                verify_success_on_mypage(driver)
+                with LATENCY.span("verify_success_on_mypage"):
+                    verify_success_on_mypage(driver)
             else:
                 evt("[submit] No form via flags — manual review may be needed.")
 
@@ -927,17 +1433,17 @@ def bot_session(headless: bool = True) -> None:
         except Exception:
             pass
 
-        # Dump performance logs for postmortem (HAR-like)
+    finally:
+        # Last drain of the performance log (HAR-convertible JSONL)
         try:
-            perf_file = dump_performance_logs(driver, label_prefix="har")
-            if perf_file:
-                evt(f"[har] Wrote {perf_file}")
+            perf.drain(driver)
+            files = perf.close()
+            if files:
+                evt(f"[har] Wrote {', '.join(files)} ({perf.describe()})")
             else:
                 evt("[har] No performance logs available")
         except Exception:
             pass
-
-    finally:
         try:
             driver.quit()
         except Exception:
@@ -945,41 +1451,121 @@ def bot_session(headless: bool = True) -> None:
 
 
 
+def write_nav_timings() -> None:
+    if not NAV_TIMINGS.samples:
+        return
+    evt(f"[nav] {PAGE_LOAD_STRATEGY} timings: {NAV_TIMINGS.describe()}")
+    try:
+        import json as _json
+        os.makedirs("logs", exist_ok=True)
+        out_file = os.path.join("logs", f"nav_timings_{int(time.time())}.json")
+        with open(out_file, "w", encoding="utf-8") as f:
+            _json.dump({"page_load_strategy": PAGE_LOAD_STRATEGY, "navigations": NAV_TIMINGS.stats()},
+                       f, ensure_ascii=False, indent=2)
+        evt(f"[nav] Wrote {out_file}")
+    except Exception:
+        pass
+
+
+def write_latency() -> None:
+    path = LATENCY.write()
+    if path:
+        evt(f"[latency] {LATENCY.describe()}")
+        evt(f"[latency] Wrote {path} (percentiles across runs: python3 latency.py)")
+
+
+def write_webdriver_profile() -> None:
+    profiler = command_profiler.active()
+    if profiler is None:
+        return
+    path = profiler.write()
+    if path:
+        for line in profiler.describe():
+            evt(f"[webdriver] {line}")
+        evt(f"[webdriver] Wrote {path}")
+
+
 def main():
     import argparse
-    global START_AT, TARGET_URL
+    global START_AT, TARGET_URL, PAGE_LOAD_STRATEGY, FORM_CACHE, PLAN_PATH, BASE_URL, LOGIN_URL, COOKIE_PATH
     parser = argparse.ArgumentParser()
     parser.add_argument("--no-headless", action="store_true", help="Run browser with UI visible")
     parser.add_argument("--start-at", default=None, help="Start time ISO (KST)")
     parser.add_argument("--target-url", default=None, help="Override target URL")
+    parser.add_argument("--base-url", default=None,
+                        help="Run against another host (e.g. fixture_server.py); rebases login/target/MyPage URLs")
     parser.add_argument("--max-restarts", type=int, default=2, help="Max driver restarts on disconnect")
+    parser.add_argument("--standby", type=int, default=0,
+                        help="Warm standby drivers kept logged in on the target page for failover (default 0: none)")
+    parser.add_argument("--watch-mode", choices=["http", "browser"], default="http",
+                        help="Phase-2 polling: fetch view HTML over HTTP (default) or refresh the browser")
+    parser.add_argument("--page-load", choices=["none", "eager", "normal"], default="none",
+                        help="pageLoadStrategy; none/eager wait on per-page readiness predicates instead of the load event")
+    parser.add_argument("--plan", default=PLAN_FILE,
+                        help="Submission plan from plan_compiler.py (ignored if missing or for another sn)")
+    parser.add_argument("--no-form-cache", action="store_true",
+                        help="Always classify form fields live instead of reusing cached fill plans")
+    parser.add_argument("--profile", choices=["lean", "full"], default="lean",
+                        help="Watch-phase Chrome profile: lean blocks images/fonts/media/off-site hosts")
+    parser.add_argument("--webdriver-profile", action="store_true",
+                        help="Count every WebDriver command per calling function (also: WEBDRIVER_PROFILE=1)")
     args = parser.parse_args()
 
     if args.start_at:
         START_AT = args.start_at
+    if args.base_url:
+        from urllib.parse import urlparse
+        BASE_URL = args.base_url.rstrip("/")
+        LOGIN_URL = f"{BASE_URL}/member/login.asp"
+        if not args.target_url:
+            u = urlparse(TARGET_URL)
+            TARGET_URL = BASE_URL + u.path + ("?" + u.query if u.query else "")
+        COOKIE_PATH = os.path.join(".session", f"cookies_{urlparse(BASE_URL).netloc.replace(':', '_')}.json")
     if args.target_url:
         TARGET_URL = args.target_url
+    PAGE_LOAD_STRATEGY = args.page_load
+    FORM_CACHE = not args.no_form_cache
+    PLAN_PATH = args.plan
+    if args.webdriver_profile:
+        command_profiler.enable()
 
     _init_event_log()
     headless = not args.no_headless
 
+    lean = args.profile == "lean"
+    pool = StandbyPool(args.standby, headless=headless, lean=lean) if args.standby > 0 else None
+    failover_t0: Optional[float] = None
     max_restarts = max(0, int(args.max_restarts))
-    for attempt in range(max_restarts + 1):
-        try:
-            bot_session(headless=headless)
-            break
-        except WebDriverException as e:
-            if is_disconnect_error(e) and attempt < max_restarts:
-                evt(f"[recover] Driver disconnected: {e}. Restarting session ({attempt+1}/{max_restarts})")
-                time.sleep(1)
-                continue
-            raise
-        except Exception as e:
-            if is_disconnect_error(e) and attempt < max_restarts:
-                evt(f"[recover] Connection issue: {e}. Restarting session ({attempt+1}/{max_restarts})")
-                time.sleep(1)
-                continue
-            raise
+    try:
+        for attempt in range(max_restarts + 1):
+            try:
+                bot_session(
+                    headless=headless, watch_mode=args.watch_mode, pool=pool, failover_t0=failover_t0, lean=lean
+                )
+                break
+            except WebDriverException as e:
+                if is_disconnect_error(e) and attempt < max_restarts:
+                    evt(f"[recover] Driver disconnected: {e}. Restarting session ({attempt+1}/{max_restarts})")
+                    failover_t0 = time.monotonic()
+                    if not (pool and pool.drivers):
+                        time.sleep(1)
+                    continue
+                raise
+            except Exception as e:
+                if is_disconnect_error(e) and attempt < max_restarts:
+                    evt(f"[recover] Connection issue: {e}. Restarting session ({attempt+1}/{max_restarts})")
+                    failover_t0 = time.monotonic()
+                    if not (pool and pool.drivers):
+                        time.sleep(1)
+                    continue
+                raise
+    finally:
+        if pool is not None:
+            pool.close()
+        write_nav_timings()
+        write_latency()
+        write_webdriver_profile()
+        EVENT_LOG.close()
 
 
 if __name__ == "__main__":
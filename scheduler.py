@@ -0,0 +1,157 @@
+import time
+import random
+from typing import Any, Callable, Dict, List, Optional
+
+
+NS = 1_000_000_000
+
+
+class SystemClock:
+    """time.monotonic_ns with coarse sleep; swap for FakeClock to run offline."""
+
+    def now_ns(self) -> int:
+        return time.monotonic_ns()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class FakeClock:
+    """Deterministic clock for offline benchmarks: sleep() advances time instantly,
+    optionally oversleeping like a real OS timer (oversleep_s mean, uniform jitter)."""
+
+    def __init__(self, start_ns: int = 0, oversleep_s: float = 0.0, seed: int = 0):
+        self.t = start_ns
+        self.oversleep_s = oversleep_s
+        self._rng = random.Random(seed)
+        self.spins = 0
+
+    def now_ns(self) -> int:
+        # Each read during a spin costs a little time, like a real busy-wait
+        self.spins += 1
+        self.t += 1_000
+        return self.t
+
+    def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        extra = self._rng.uniform(0, 2 * self.oversleep_s) if self.oversleep_s else 0.0
+        self.t += int((seconds + extra) * NS)
+
+
+class _Timer:
+    __slots__ = ("name", "due_ns", "interval_ns", "jitter_ns", "fn")
+
+    def __init__(self, name: str, due_ns: int, interval_ns: int, jitter_ns: int, fn: Callable[[], Any]):
+        self.name = name
+        self.due_ns = due_ns
+        self.interval_ns = interval_ns
+        self.jitter_ns = jitter_ns
+        self.fn = fn
+
+
+class Scheduler:
+    """Single monotonic timer shared by every periodic/one-shot job of a loop.
+
+    Sleeps coarsely until `spin_s` before the next deadline, then spins on
+    monotonic_ns for the rest. Every fire is recorded (intended vs actual) so the
+    scheduling jitter can be summarised with stats().
+    Jobs run in the caller's thread; a job may call stop(result) to end run().
+    """
+
+    def __init__(self, clock: Optional[Any] = None, spin_s: float = 0.002, coarse_max_s: float = 60.0):
+        self.clock = clock or SystemClock()
+        self.spin_ns = int(spin_s * NS)
+        self.coarse_max_ns = int(coarse_max_s * NS)
+        self.timers: Dict[str, _Timer] = {}
+        self.fires: List[Dict[str, Any]] = []
+        self._stopped = False
+        self.result: Any = None
+
+    def now_ns(self) -> int:
+        return self.clock.now_ns()
+
+    def _jittered(self, t: _Timer) -> int:
+        if not t.jitter_ns:
+            return t.interval_ns
+        return t.interval_ns + random.randint(-t.jitter_ns, t.jitter_ns)
+
+    def every(self, name: str, interval_s: float, fn: Callable[[], Any], jitter_s: float = 0.0,
+              first_in_s: Optional[float] = None) -> None:
+        """Run fn every interval_s (± jitter_s). Re-registering a name replaces it."""
+        t = _Timer(name, 0, int(interval_s * NS), int(jitter_s * NS), fn)
+        t.due_ns = self.now_ns() + (int(first_in_s * NS) if first_in_s is not None else self._jittered(t))
+        self.timers[name] = t
+
+    def at(self, name: str, deadline_ns: int, fn: Callable[[], Any]) -> None:
+        """Run fn once at a monotonic_ns deadline. Re-registering a name moves it."""
+        self.timers[name] = _Timer(name, deadline_ns, 0, 0, fn)
+
+    def after(self, name: str, delay_s: float, fn: Callable[[], Any]) -> None:
+        self.at(name, self.now_ns() + int(delay_s * NS), fn)
+
+    def cancel(self, name: str) -> None:
+        self.timers.pop(name, None)
+
+    def stop(self, result: Any = None) -> None:
+        self._stopped = True
+        self.result = result
+
+    def remaining_s(self, name: str) -> Optional[float]:
+        t = self.timers.get(name)
+        return None if t is None else (t.due_ns - self.now_ns()) / NS
+
+    def next_due_s(self, exclude: Optional[str] = None) -> Optional[float]:
+        """Seconds until the earliest timer (other than `exclude`) is due, or None."""
+        due = [t.due_ns for t in self.timers.values() if t.name != exclude]
+        return None if not due else max(0.0, (min(due) - self.now_ns()) / NS)
+
+    def wait_until_ns(self, deadline_ns: int) -> int:
+        """Coarse sleep, then spin. Returns the actual monotonic_ns on wake."""
+        while True:
+            now = self.now_ns()
+            remaining = deadline_ns - now
+            if remaining <= 0:
+                return now
+            if remaining > self.spin_ns:
+                self.clock.sleep(min(remaining - self.spin_ns, self.coarse_max_ns) / NS)
+
+    def run(self) -> Any:
+        """Fire timers in deadline order until a job calls stop() or no timers remain."""
+        self._stopped = False
+        while not self._stopped and self.timers:
+            t = min(self.timers.values(), key=lambda x: x.due_ns)
+            intended = t.due_ns
+            actual = self.wait_until_ns(intended)
+            self.fires.append({"name": t.name, "intended_ns": intended, "actual_ns": actual})
+            if t.interval_ns:
+                # Fixed rate, but never try to catch up on missed periods
+                t.due_ns = max(intended + self._jittered(t), actual + t.interval_ns // 2)
+            else:
+                self.timers.pop(t.name, None)
+            t.fn()
+        return self.result
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Lateness per timer name in ms: count/mean/p50/p95/max."""
+        by_name: Dict[str, List[float]] = {}
+        for f in self.fires:
+            by_name.setdefault(f["name"], []).append((f["actual_ns"] - f["intended_ns"]) / 1e6)
+        out: Dict[str, Dict[str, float]] = {}
+        for name, lat in by_name.items():
+            lat.sort()
+            out[name] = {
+                "count": len(lat),
+                "mean_ms": round(sum(lat) / len(lat), 3),
+                "p50_ms": round(lat[len(lat) // 2], 3),
+                "p95_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))], 3),
+                "max_ms": round(lat[-1], 3),
+            }
+        return out
+
+    def describe_stats(self) -> str:
+        return "; ".join(
+            f"{n}: n={s['count']} p50={s['p50_ms']}ms p95={s['p95_ms']}ms max={s['max_ms']}ms"
+            for n, s in sorted(self.stats().items())
+        )
@@ -0,0 +1,128 @@
+import os
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+
+# Logged-in cookies shared by every entry point so a full Selenium login only
+# happens when the saved session has gone stale.
+COOKIE_FILE = os.path.join(".session", "cookies.json")
+# Members-only page used to validate saved cookies with one request
+CHECK_PATH = "/mypage/Appchild.asp"
+
+
+def load_cookies(path: str = COOKIE_FILE) -> List[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return []
+    cookies = data.get("cookies") or []
+    now = time.time()
+    # Drop cookies the browser would already have expired
+    return [c for c in cookies if not c.get("expiry") or c["expiry"] > now]
+
+
+def save_cookies(cookies: List[Dict[str, Any]], path: str = COOKIE_FILE) -> None:
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": int(time.time()), "cookies": cookies}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        try:
+            os.chmod(path, 0o600)
+        except Exception:
+            pass
+    except Exception:
+        pass
+
+
+def session_from_cookies(cookies: List[Dict[str, Any]], sess: Optional[requests.Session] = None) -> requests.Session:
+    sess = sess or requests.Session()
+    for c in cookies:
+        sess.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+    return sess
+
+
+def cookies_valid(cookies: List[Dict[str, Any]], base: str, timeout: float = 10) -> bool:
+    """One HTTP request: logged in if the members page renders with a logout link."""
+    if not cookies:
+        return False
+    try:
+        r = session_from_cookies(cookies).get(base + CHECK_PATH, allow_redirects=True, timeout=timeout)
+    except Exception:
+        return False
+    if r.status_code != 200 or "login.asp" in (r.url or "").lower():
+        return False
+    return "logout.asp" in (r.text or "")
+
+
+def inject_into_driver(driver, cookies: List[Dict[str, Any]], base: str) -> None:
+    """Selenium only accepts cookies for the current document's domain, so land on a
+    cheap same-site URL first."""
+    driver.get(base + "/robots.txt")
+    # With pageLoadStrategy "none" get() returns before the URL commits; cookies need the site's domain
+    end = time.monotonic() + 10
+    while time.monotonic() < end:
+        try:
+            if (driver.current_url or "").startswith(base):
+                break
+        except Exception:
+            pass
+        time.sleep(0.05)
+    for c in cookies:
+        ck = {k: c[k] for k in ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite") if k in c}
+        try:
+            driver.add_cookie(ck)
+        except Exception:
+            # Host-only cookies are rejected when a leading-dot domain is given; retry without it
+            ck.pop("domain", None)
+            try:
+                driver.add_cookie(ck)
+            except Exception:
+                pass
+
+
+def login_with_store(
+    driver,
+    login: Callable[[], None],
+    base: str,
+    path: str = COOKIE_FILE,
+    log: Callable[[str], None] = print,
+) -> str:
+    """Reuse saved cookies when they still validate, else run `login` and save the new ones.
+    Returns "reused" or "fresh"."""
+    t0 = time.monotonic()
+    cookies = load_cookies(path)
+    if cookies and cookies_valid(cookies, base):
+        inject_into_driver(driver, cookies, base)
+        log(f"[login] Reused saved session ({(time.monotonic() - t0) * 1000:.0f}ms)")
+        return "reused"
+    login()
+    try:
+        save_cookies(driver.get_cookies(), path)
+    except Exception:
+        pass
+    log(f"[login] Fresh browser login ({(time.monotonic() - t0) * 1000:.0f}ms), session saved")
+    return "fresh"
+
+
+def http_session_with_store(
+    login_cookies: Callable[[], List[Dict[str, Any]]],
+    base: str,
+    path: str = COOKIE_FILE,
+    log: Callable[[str], None] = print,
+) -> requests.Session:
+    """requests.Session from saved cookies; falls back to `login_cookies()` (e.g. a Selenium
+    login that returns driver.get_cookies()) only when they are stale."""
+    cookies = load_cookies(path)
+    if cookies and cookies_valid(cookies, base):
+        log("[login] Reused saved session (no browser)")
+        return session_from_cookies(cookies)
+    cookies = login_cookies()
+    save_cookies(cookies, path)
+    log("[login] Fresh browser login, session saved")
+    return session_from_cookies(cookies)